@@ -5,7 +5,7 @@ Answer Generator - Generate answers using LLM with retrieved context
 import logging
 import re
 import json
-from typing import List, Dict, Any, Optional, Tuple, Callable
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union
 import os
 from openai import OpenAI
 from anthropic import Anthropic
@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 from .llm_utils import openai_chat_completion
 from .utils import count_tokens, truncate_to_tokens
+from .query_processor import ProcessedQuery
 
 
 class AnswerGenerator:
@@ -69,7 +70,7 @@ class AnswerGenerator:
             return None
     
     def generate(self, query: str, retrieved_elements: List[Dict[str, Any]], 
-                 query_info: Optional[Dict[str, Any]] = None,
+                 query_info: Optional[Union[ProcessedQuery, Dict[str, Any]]] = None,
                  dialogue_history: Optional[List[Dict[str, Any]]] = None,
                  prompt_builder: Optional[Callable[[str, str, Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]], str]] = None) -> Dict[str, Any]:
         """
@@ -78,7 +79,7 @@ class AnswerGenerator:
         Args:
             query: User query
             retrieved_elements: List of retrieved code elements
-            query_info: Additional query processing info
+            query_info: Additional query processing info (ProcessedQuery or dict)
             dialogue_history: Previous dialogue turns for multi-turn mode
             prompt_builder: Optional callable that returns a prompt given
                 (query, prepared_context, query_info, dialogue_history)
@@ -91,6 +92,10 @@ class AnswerGenerator:
         # Prepare context
         context = self._prepare_context(retrieved_elements)
 
+        # Custom prompt builders receive query_info as a plain dict
+        if prompt_builder and isinstance(query_info, ProcessedQuery):
+            query_info = query_info.to_dict()
+
         # Build prompt (with dialogue history if in multi-turn mode)
         if prompt_builder:
             prompt = prompt_builder(query, context, query_info, dialogue_history)
@@ -194,7 +199,7 @@ class AnswerGenerator:
             }
 
     def generate_stream(self, query: str, retrieved_elements: List[Dict[str, Any]],
-                       query_info: Optional[Dict[str, Any]] = None,
+                       query_info: Optional[Union[ProcessedQuery, Dict[str, Any]]] = None,
                        dialogue_history: Optional[List[Dict[str, Any]]] = None,
                        prompt_builder: Optional[Callable[[str, str, Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]], str]] = None):
         """
@@ -203,7 +208,7 @@ class AnswerGenerator:
         Args:
             query: User query
             retrieved_elements: List of retrieved code elements
-            query_info: Additional query processing info
+            query_info: Additional query processing info (ProcessedQuery or dict)
             dialogue_history: Previous dialogue turns for multi-turn mode
             prompt_builder: Optional callable for custom prompt building
 
@@ -218,6 +223,10 @@ class AnswerGenerator:
         # Prepare context
         context = self._prepare_context(retrieved_elements)
 
+        # Custom prompt builders receive query_info as a plain dict
+        if prompt_builder and isinstance(query_info, ProcessedQuery):
+            query_info = query_info.to_dict()
+
         # Build prompt (with dialogue history if in multi-turn mode)
         if prompt_builder:
             prompt = prompt_builder(query, context, query_info, dialogue_history)
@@ -515,7 +524,7 @@ class AnswerGenerator:
         return "\n\n---\n\n".join(context_parts)
     
     def _build_prompt(self, query: str, context: str, 
-                     query_info: Optional[Dict[str, Any]] = None,
+                     query_info: Optional[Union[ProcessedQuery, Dict[str, Any]]] = None,
                      dialogue_history: Optional[List[Dict[str, Any]]] = None) -> str:
         """Build complete prompt for LLM"""
         
@@ -855,7 +864,8 @@ Symbol Mappings:
                 "name": elem.get("name", ""),
                 "type": elem.get("type", ""),
                 "lines": f"{elem.get('start_line', 0)}-{elem.get('end_line', 0)}",
-                "score": elem_data.get("total_score", 0),
+                # Plain float so sources stay JSON-native (scores may be numpy floats)
+                "score": float(elem_data.get("total_score", 0)),
             })
         
         return sources
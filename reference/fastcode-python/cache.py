@@ -8,8 +8,9 @@ import hashlib
 import logging
 import json
 import time
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 from pathlib import Path
+import numpy as np
 from diskcache import Cache as DiskCache
 
 
@@ -335,21 +336,32 @@ class CacheManager:
         
         try:
             history = self.get_dialogue_history(session_id, max_turns=num_rounds)
-            
-            summaries = []
-            for turn in history:
-                summaries.append({
-                    "turn_number": turn.get("turn_number"),
-                    "query": turn.get("query"),
-                    "summary": turn.get("summary"),
-                })
-            
-            return summaries
+            return self.summarize_turns(history)
             
         except Exception as e:
             self.logger.error(f"Failed to get recent summaries: {e}")
             return []
     
+    @staticmethod
+    def summarize_turns(history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Reduce dialogue turns to the summary fields used as query context
+        
+        Args:
+            history: List of turn data dictionaries
+        
+        Returns:
+            List of summary data with turn_number, query, and summary
+        """
+        return [
+            {
+                "turn_number": turn.get("turn_number"),
+                "query": turn.get("query"),
+                "summary": turn.get("summary"),
+            }
+            for turn in history
+        ]
+    
     def _update_session_index(self, session_id: str, turn_number: int,
                               multi_turn: Optional[bool] = None) -> bool:
         """Update session index with new turn"""
@@ -462,3 +474,90 @@ class CacheManager:
             self.logger.error(f"Failed to list sessions: {e}")
             return []
 
+
+class SemanticQueryCache:
+    """
+    In-memory query result cache keyed on query embedding similarity
+
+    Entries live in a fixed-size ring buffer; lookups are a single inner
+    product against all stored (normalized) query embeddings.
+    """
+
+    def __init__(self, config: dict, dimension: Optional[int] = None):
+        cache_config = config.get("cache", {})
+        self.logger = logging.getLogger(__name__)
+
+        self.capacity = cache_config.get("semantic_cache_size", 512)
+        self.threshold = cache_config.get("semantic_cache_threshold", 0.97)
+
+        # Allocated on first put when no dimension is given up front
+        self.embeddings = (
+            np.zeros((self.capacity, dimension), dtype=np.float32) if dimension else None
+        )
+        self.entries: List[Optional[Tuple[Any, Dict[str, Any]]]] = [None] * self.capacity
+        self.size = 0
+        self.next_slot = 0
+
+    def _normalize(self, embedding: np.ndarray) -> Optional[np.ndarray]:
+        """Return the embedding as a unit-length float32 vector"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def get(self, embedding: np.ndarray, scope: Any) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result for a semantically similar query
+
+        Args:
+            embedding: Query embedding
+            scope: Hashable key that must match exactly (repo hash, filters, ...)
+
+        Returns:
+            Copy of the cached result or None
+        """
+        if self.size == 0:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        similarities = self.embeddings[:self.size] @ query
+        candidates = np.flatnonzero(similarities >= self.threshold)
+        for slot in candidates[np.argsort(-similarities[candidates])]:
+            entry_scope, result = self.entries[slot]
+            if entry_scope == scope:
+                self.logger.debug(f"Semantic cache hit (similarity {similarities[slot]:.3f})")
+                return dict(result)
+
+        return None
+
+    def put(self, embedding: np.ndarray, scope: Any, result: Dict[str, Any]):
+        """
+        Store a query result, overwriting the oldest entry when full
+
+        Args:
+            embedding: Query embedding
+            scope: Hashable key that must match on lookup
+            result: Query result dictionary
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self.embeddings is None:
+            self.embeddings = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+        slot = self.next_slot
+        self.embeddings[slot] = vector
+        self.entries[slot] = (scope, dict(result))
+        self.next_slot = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def clear(self):
+        """Drop all cached entries"""
+        self.entries = [None] * self.capacity
+        self.size = 0
+        self.next_slot = 0
@@ -2,12 +2,12 @@
 Code Embedder - Generate embeddings for code snippets
 """
 
+import os
+import hashlib
 import logging
 import platform
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import torch
 
 
 class CodeEmbedder:
@@ -20,21 +20,51 @@ class CodeEmbedder:
         
         self.model_name = self.embedding_config.get("model", "sentence-transformers/all-MiniLM-L6-v2")
         self.device = self.embedding_config.get("device", "auto")
-        self.batch_size = self.embedding_config.get("batch_size", 32)
+        # None picks a device-dependent default once the model is loaded
+        self.batch_size = self.embedding_config.get("batch_size")
         self.max_seq_length = self.embedding_config.get("max_seq_length", 512)
         self.normalize = self.embedding_config.get("normalize_embeddings", True)
         
+        # Reuse embeddings of element texts that were already embedded
+        # (text digest -> vector); persisted next to the vector store
+        self.reuse_embeddings = self.embedding_config.get("reuse_embeddings", True)
+        self._reuse_cache: Dict[bytes, np.ndarray] = {}
+        
+        # torch/sentence-transformers and the model weights are loaded on
+        # first use, so constructing FastCode stays cheap
+        self._model = None
+        self._embedding_dim = None
+    
+    @property
+    def model(self):
+        """Sentence transformer model (loaded on first access)"""
+        if self._model is None:
+            self.logger.info(f"Loading embedding model: {self.model_name}")
+            self._model = self._load_model()
+            self._embedding_dim = self._model.get_sentence_embedding_dimension()
+            self.logger.info(f"Embedding dimension: {self._embedding_dim}")
+        return self._model
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Dimension of the embedding vectors (loads the model if needed)"""
+        if self._embedding_dim is None:
+            self.model
+        return self._embedding_dim
+    
+    def _load_model(self):
+        """Load sentence transformer model"""
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
         # Auto-detect best available device: CUDA > MPS > CPU
         if self.device != "cpu":
             self.device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
         
-        self.logger.info(f"Loading embedding model: {self.model_name}")
-        self.model = self._load_model()
-        self.embedding_dim = self.model.get_sentence_embedding_dimension()
-        self.logger.info(f"Embedding dimension: {self.embedding_dim}")
-    
-    def _load_model(self) -> SentenceTransformer:
-        """Load sentence transformer model"""
+        # Larger batches amortize kernel launches on accelerators
+        if self.batch_size is None:
+            self.batch_size = 32 if self.device == "cpu" else 64
+        
         model = SentenceTransformer(self.model_name, device=self.device)
         model.max_seq_length = self.max_seq_length
         return model
@@ -64,6 +94,9 @@ class CodeEmbedder:
         if not texts:
             return np.array([])
         
+        # Load the model first: it resolves self.device
+        model = self.model
+        
         encode_kwargs = {
             'batch_size': self.batch_size,
             'show_progress_bar': len(texts) > 100,
@@ -76,7 +109,7 @@ class CodeEmbedder:
         if platform.system() == 'Darwin':
             encode_kwargs['pool'] = None
         
-        embeddings = self.model.encode(texts, **encode_kwargs)
+        embeddings = model.encode(texts, **encode_kwargs)
         
         return embeddings
     
@@ -93,20 +126,133 @@ class CodeEmbedder:
         if not elements:
             return []
         
+        embeddings, texts = self.embed_code_matrix(elements)
+        
+        # Add embeddings to elements
+        for elem, embedding, text in zip(elements, embeddings, texts):
+            elem["embedding"] = embedding
+            elem["embedding_text"] = text
+        
+        return elements
+    
+    def embed_code_matrix(self, elements: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Generate embeddings for code elements as a single contiguous matrix
+        
+        Args:
+            elements: List of code element dictionaries
+        
+        Returns:
+            Tuple of (float32 array of shape N x embedding_dim, embedding texts)
+        """
+        if not elements:
+            return np.empty((0, self.embedding_dim), dtype=np.float32), []
+        
         # Prepare texts for embedding
         texts = [self._prepare_code_text(elem) for elem in elements]
         
         # Generate embeddings
         self.logger.info(f"Generating embeddings for {len(texts)} code elements")
-        embeddings = self.embed_batch(texts)
+        if self.reuse_embeddings:
+            embeddings = self._embed_with_reuse(texts)
+        else:
+            embeddings = np.ascontiguousarray(self.embed_batch(texts), dtype=np.float32)
         self.logger.info(f"✓ Successfully generated embeddings for {len(embeddings)} code elements")
         
-        # Add embeddings to elements
-        for elem, embedding in zip(elements, embeddings):
-            elem["embedding"] = embedding
-            elem["embedding_text"] = texts[elements.index(elem)]
+        return embeddings, texts
+    
+    def _embed_with_reuse(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, reusing cached vectors for texts embedded before
         
-        return elements
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            float32 array of shape N x embedding_dim
+        """
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+        
+        # Work on a local dict so concurrent callers never see a partial cache
+        cache = self._reuse_cache
+        vectors = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in cache:
+                vectors[key] = cache[key]
+            elif key not in missing:
+                missing[key] = text
+        
+        reused = len(texts) - len(missing)
+        if reused:
+            self.logger.info(f"Reusing {reused} cached embeddings, embedding {len(missing)} new texts")
+        
+        if missing:
+            new_embeddings = np.asarray(self.embed_batch(list(missing.values())), dtype=np.float32)
+            vectors.update(zip(missing.keys(), new_embeddings))
+        
+        # Keep only the current texts so the cache tracks the latest index
+        self._reuse_cache = vectors
+        
+        # Nothing reused and no duplicate texts: the model output is already
+        # the N x D result, in order
+        if len(missing) == len(keys):
+            return np.ascontiguousarray(new_embeddings)
+        
+        # Otherwise fill one preallocated matrix instead of stacking a row list
+        embeddings = np.empty((len(keys), len(next(iter(vectors.values())))), dtype=np.float32)
+        for row, key in enumerate(keys):
+            embeddings[row] = vectors[key]
+        return embeddings
+    
+    def load_reuse_cache(self, path: str) -> int:
+        """
+        Load previously computed element embeddings for reuse
+        
+        Args:
+            path: Path to the .npz file written by save_reuse_cache
+        
+        Returns:
+            Number of embeddings loaded
+        """
+        self._reuse_cache = {}
+        if not self.reuse_embeddings or not os.path.exists(path):
+            return 0
+        
+        try:
+            with np.load(path) as data:
+                # Vectors from a different model or embedding settings are
+                # not comparable; caches saved without the settings are dropped
+                if (str(data["model"]) != self.model_name
+                        or "normalize" not in data.files
+                        or bool(data["normalize"]) != bool(self.normalize)
+                        or str(data["max_seq_length"]) != str(self.max_seq_length)):
+                    return 0
+                self._reuse_cache = dict(zip(data["keys"].tolist(), data["vectors"]))
+        except Exception as e:
+            self.logger.warning(f"Failed to load embedding reuse cache: {e}")
+            return 0
+        
+        return len(self._reuse_cache)
+    
+    def save_reuse_cache(self, path: str):
+        """
+        Persist the embeddings in the reuse cache
+        
+        Args:
+            path: Destination .npz file
+        """
+        if not self.reuse_embeddings or not self._reuse_cache:
+            return
+        
+        np.savez(
+            path,
+            keys=np.array(list(self._reuse_cache.keys()), dtype="S16"),
+            vectors=np.stack(list(self._reuse_cache.values())),
+            model=np.array(self.model_name),
+            normalize=np.array(bool(self.normalize)),
+            max_seq_length=np.array(str(self.max_seq_length)),
+        )
     
     def _prepare_code_text(self, element: Dict[str, Any]) -> str:
         """
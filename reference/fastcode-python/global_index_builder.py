@@ -6,6 +6,7 @@ Creates lookup tables to resolve "who在哪" (who is where) problems.
 """
 
 import logging
+import sys
 from typing import Dict, List, Optional, Any
 import os
 
@@ -37,6 +38,11 @@ class GlobalIndexBuilder:
         self.file_map: Dict[str, str] = {}      # abs_path -> file_id
         self.module_map: Dict[str, str] = {}    # dotted.module.path -> file_id
         self.export_map: Dict[str, Dict[str, str]] = {}  # module_path -> {symbol_name: node_id}
+        self.parent_of: Dict[str, str] = {}     # dotted.module.path -> parent package path ('' at top level)
+
+        # Bumped whenever the maps are rebuilt or cleared, so resolvers can
+        # tell when their cached lookups are stale
+        self.maps_version = 0
 
         # Statistics
         self.stats = {
@@ -61,6 +67,7 @@ class GlobalIndexBuilder:
         self.file_map.clear()
         self.module_map.clear()
         self.export_map.clear()
+        self.parent_of.clear()
         self.stats = {"files_processed": 0, "modules_created": 0, "symbols_exported": 0, "errors": 0}
 
         # Normalize repo root
@@ -82,6 +89,9 @@ class GlobalIndexBuilder:
             f"{len(self.module_map)} module paths"
         )
 
+        # Precompute parent packages for relative import resolution
+        self._build_parent_table()
+
         # Build export symbol map from class and function elements
         self._build_export_symbol_map(elements)
 
@@ -94,6 +104,8 @@ class GlobalIndexBuilder:
         if self.stats["errors"] > 0:
             self.logger.warning(f"Encountered {self.stats['errors']} errors during processing")
 
+        self.maps_version += 1
+
     def _process_file_element(self, element: CodeElement, repo_root: str) -> None:
         """
         Process a single file element and add to maps
@@ -110,12 +122,28 @@ class GlobalIndexBuilder:
         module_path = file_path_to_module_path(element.file_path, repo_root)
 
         if module_path:
+            # Interned so lookups with the same path object compare by identity
+            module_path = sys.intern(module_path)
             self.module_map[module_path] = element.id
             self.stats["modules_created"] += 1
             self.logger.debug(f"Mapped module '{module_path}' -> {element.id}")
         else:
             self.logger.debug(f"Could not create module path for {element.file_path}")
 
+    def _build_parent_table(self) -> None:
+        """
+        Build parent_of for every module path and each of its ancestor packages
+
+        Relative import resolution then walks up one level per dict lookup
+        instead of re-deriving the parent path from the string on every call.
+        """
+        for module_path in self.module_map:
+            # Stop at the first ancestor that is already mapped
+            while module_path and module_path not in self.parent_of:
+                parent_path = sys.intern(module_path.rpartition('.')[0])
+                self.parent_of[module_path] = parent_path
+                module_path = parent_path
+
     def get_file_id_by_path(self, abs_path: str) -> Optional[str]:
         """
         Get file_id from absolute file path
@@ -322,4 +350,6 @@ class GlobalIndexBuilder:
         self.file_map.clear()
         self.module_map.clear()
         self.export_map.clear()
-        self.stats = {"files_processed": 0, "modules_created": 0, "symbols_exported": 0, "errors": 0}
\ No newline at end of file
+        self.parent_of.clear()
+        self.stats = {"files_processed": 0, "modules_created": 0, "symbols_exported": 0, "errors": 0}
+        self.maps_version += 1
\ No newline at end of file
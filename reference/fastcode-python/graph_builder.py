@@ -146,14 +146,19 @@ class CodeGraphBuilder:
             if elem.type == "file":
                 imports = elem.metadata.get("imports", [])
 
-                # Get current file's module path
-                current_module_path = self._get_module_path_from_file_id(elem.id, elements, repo_root)
+                # Get current file's module path (elem is the file element itself, so
+                # there is no need to search the element list for it)
+                current_module_path = file_path_to_module_path(elem.file_path, repo_root)
                 if not current_module_path:
                     continue
 
                 # --- NEW: Check if this is a package file ---
                 is_package = elem.file_path.endswith("__init__.py")
                 
+                # (target_module, level) for every import of this file, resolved
+                # together so parent packages are derived once per file
+                import_specs = []
+                
                 for imp in imports:
                     module = imp.get("module", "")
                     names = imp.get("names", [])
@@ -176,37 +181,7 @@ class CodeGraphBuilder:
 
                     # Use ModuleResolver for precise resolution if available
                     if module_resolver:
-                        for target_module in modules_to_resolve:
-                            # --- UPDATE THE CALL HERE ---
-                            target_file_id = module_resolver.resolve_import(
-                                current_module_path=current_module_path,
-                                import_name=target_module,
-                                level=level,
-                                is_package=is_package  # Pass the flag
-                            )
-
-
-                            # Add edge if resolution succeeded and it's not a third-party library
-                            if target_file_id:
-                                if target_file_id == elem.id:
-                                    continue
-                                # [FIX] Ensure target file belongs to the same repo (Multi-Repo Collision Fix)
-                                target_elem = self.element_by_id.get(target_file_id)
-                                if target_elem and target_elem.repo_name != elem.repo_name:
-                                    self.logger.debug(
-                                        f"Skipping cross-repo dependency: {elem.id} -> {target_file_id} "
-                                        f"(Repos: {elem.repo_name} vs {target_elem.repo_name})"
-                                    )
-                                    continue
-
-                                self.dependency_graph.add_edge(
-                                    elem.id,
-                                    target_file_id,
-                                    type="imports",  # Use "imports" for consistency
-                                    module=target_module,  # Use the actual resolved module name
-                                    level=level,
-                                    resolution_method="AST ModuleResolver"
-                                )
+                        import_specs.extend((target_module, level) for target_module in modules_to_resolve)
                     else:
                         # Fallback to original logic (for backward compatibility)
                         # NOTE: This is the flawed string matching approach
@@ -233,6 +208,36 @@ class CodeGraphBuilder:
                                         level=level,
                                         resolution_method="fallback_string_matching"
                                     )
+
+                if not import_specs:
+                    continue
+
+                target_file_ids = module_resolver.resolve_imports_bulk(
+                    current_module_path, import_specs, is_package=is_package
+                )
+
+                for (target_module, level), target_file_id in zip(import_specs, target_file_ids):
+                    # Add edge if resolution succeeded and it's not a third-party library
+                    if target_file_id:
+                        if target_file_id == elem.id:
+                            continue
+                        # [FIX] Ensure target file belongs to the same repo (Multi-Repo Collision Fix)
+                        target_elem = self.element_by_id.get(target_file_id)
+                        if target_elem and target_elem.repo_name != elem.repo_name:
+                            self.logger.debug(
+                                f"Skipping cross-repo dependency: {elem.id} -> {target_file_id} "
+                                f"(Repos: {elem.repo_name} vs {target_elem.repo_name})"
+                            )
+                            continue
+
+                        self.dependency_graph.add_edge(
+                            elem.id,
+                            target_file_id,
+                            type="imports",  # Use "imports" for consistency
+                            module=target_module,  # Use the actual resolved module name
+                            level=level,
+                            resolution_method="AST ModuleResolver"
+                        )
     
     def _build_inheritance_graph(self, elements: List[CodeElement], symbol_resolver: Optional[SymbolResolver] = None):
         """
@@ -482,26 +487,6 @@ class CodeGraphBuilder:
         
         return related
 
-    def _get_module_path_from_file_id(self, file_id: str, elements: List[CodeElement], repo_root: str) -> Optional[str]:
-        """
-        Get module path from file ID by looking up the corresponding CodeElement.
-
-        Args:
-            file_id: File element ID
-            elements: List of all code elements for lookup
-            repo_root: Repository root path for module path conversion
-
-        Returns:
-            Module path (e.g., "app.services.auth") or None if not found
-        """
-        # Find the file element by ID
-        for elem in elements:
-            if elem.id == file_id and elem.type == "file":
-                # Use the element's file_path to generate module path
-                return file_path_to_module_path(elem.file_path, repo_root)
-
-        return None
-
     def get_dependencies(self, element_id: str) -> List[str]:
         """Get direct dependencies of an element"""
         if element_id in self.dependency_graph:
@@ -4,8 +4,10 @@ Code Indexer - Multi-level indexing of code repositories
 
 import hashlib
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+import operator
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, fields
+import numpy as np
 from tqdm import tqdm
 
 from .loader import RepositoryLoader
@@ -15,7 +17,7 @@ from .repo_overview import RepositoryOverviewGenerator
 from .utils import count_tokens, normalize_path
 from .vector_store import VectorStore
 
-@dataclass
+@dataclass(slots=True)
 class CodeElement:
     """Unified code element for indexing"""
     id: str
@@ -35,7 +37,52 @@ class CodeElement:
     repo_url: Optional[str] = None   # Repository URL (if available)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Field-wise copy instead of asdict(), which deep-copies every nested value;
+        # a single C-level attrgetter call reads all fields at once
+        data = dict(zip(CODE_ELEMENT_FIELDS, _get_element_fields(self)))
+        data["metadata"] = dict(self.metadata)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CodeElement":
+        """Rebuild an element from a to_dict() mapping, defaulting missing fields"""
+        values = {name: data.get(name, default) for name, default in CODE_ELEMENT_DEFAULTS}
+        values["metadata"] = data.get("metadata", {})
+        return cls(**values)
+    
+    @staticmethod
+    def to_columns(elements: List["CodeElement"]) -> Dict[str, List[Any]]:
+        """Convert elements to a column-oriented dict (one list per field)"""
+        rows = [_get_element_fields(elem) for elem in elements]
+        return {name: [row[i] for row in rows] for i, name in enumerate(CODE_ELEMENT_FIELDS)}
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> List["CodeElement"]:
+        """Rebuild elements from a to_columns() dict using positional construction"""
+        return [cls(*row) for row in zip(*(columns[name] for name in CODE_ELEMENT_FIELDS))]
+
+
+CODE_ELEMENT_FIELDS = tuple(f.name for f in fields(CodeElement))
+_get_element_fields = operator.attrgetter(*CODE_ELEMENT_FIELDS)
+
+# Values used by CodeElement.from_dict for fields missing from stored metadata
+# ("metadata" is handled separately so each element gets its own dict)
+CODE_ELEMENT_DEFAULTS = (
+    ("id", ""),
+    ("type", ""),
+    ("name", ""),
+    ("file_path", ""),
+    ("relative_path", ""),
+    ("language", ""),
+    ("start_line", 0),
+    ("end_line", 0),
+    ("code", ""),
+    ("signature", None),
+    ("docstring", None),
+    ("summary", None),
+    ("repo_name", None),
+    ("repo_url", None),
+)
 
 
 class CodeIndexer:
@@ -56,8 +103,13 @@ class CodeIndexer:
         self.include_imports = self.indexing_config.get("include_imports", True)
         self.include_class_context = self.indexing_config.get("include_class_context", True)
         self.generate_repo_overview = self.indexing_config.get("generate_repo_overview", True)
+        # Files read and handed to the parser together, so parsing can be
+        # spread over the parser's worker processes
+        self.parse_batch_size = max(1, self.indexing_config.get("parse_batch_size", 64))
         
         self.elements: List[CodeElement] = []
+        # Embeddings for self.elements, row i belongs to self.elements[i]
+        self.embeddings: Optional[np.ndarray] = None
         
         # Repository identification
         self.current_repo_name: Optional[str] = None
@@ -66,7 +118,8 @@ class CodeIndexer:
         # Repository overview generator
         self.overview_generator = RepositoryOverviewGenerator(config) if self.generate_repo_overview else None
     
-    def index_repository(self, repo_name: Optional[str] = None, repo_url: Optional[str] = None) -> List[CodeElement]:
+    def index_repository(self, repo_name: Optional[str] = None,
+                         repo_url: Optional[str] = None) -> Tuple[List[CodeElement], np.ndarray]:
         """
         Index entire repository at multiple levels
         
@@ -75,7 +128,8 @@ class CodeIndexer:
             repo_url: Optional repository URL for identification
         
         Returns:
-            List of indexed code elements
+            Tuple of (indexed code elements, float32 embedding matrix with one
+            row per element)
         """
         self.logger.info("Starting repository indexing")
         
@@ -106,38 +160,44 @@ class CodeIndexer:
             except Exception as e:
                 self.logger.warning(f"Failed to generate repository overview: {e}")
         
-        # Process each file
-        for file_info in tqdm(files, desc="Indexing files"):
-            file_path = file_info["path"]
-            
-            # Read content
-            content = self.loader.read_file_content(file_path)
-            if content is None:
-                continue
-            
-            # Parse file
-            parse_result = self.parser.parse_file(file_path, content)
-            if parse_result is None:
-                continue
-            
-            # Index at different levels
-            self._index_file(file_info, content, parse_result)
+        # Process files in batches
+        with tqdm(total=len(files), desc="Indexing files") as progress:
+            for batch_start in range(0, len(files), self.parse_batch_size):
+                batch_files = files[batch_start:batch_start + self.parse_batch_size]
+                
+                # Read content
+                batch = []
+                for file_info in batch_files:
+                    content = self.loader.read_file_content(file_info["path"])
+                    if content is not None:
+                        batch.append((file_info, content))
+                
+                # Parse files
+                parse_results = self.parser.parse_files(
+                    [(file_info["path"], content) for file_info, content in batch]
+                )
+                
+                # Index at different levels
+                for (file_info, content), parse_result in zip(batch, parse_results):
+                    if parse_result is not None:
+                        self._index_file(file_info, content, parse_result)
+                
+                progress.update(len(batch_files))
         
         self.logger.info(f"Indexed {len(self.elements)} code elements for {repo_name or 'Unknown'}")
         
-        # Generate embeddings
+        # Generate embeddings as one contiguous matrix kept alongside the
+        # elements, instead of storing a vector inside every metadata dict
         self.logger.info("Generating embeddings for code elements")
         element_dicts = [elem.to_dict() for elem in self.elements]
-        elements_with_embeddings = self.embedder.embed_code_elements(element_dicts)
+        self.embeddings, embedding_texts = self.embedder.embed_code_matrix(element_dicts)
         
-        # Update elements with embeddings
-        for elem, elem_dict in zip(self.elements, elements_with_embeddings):
-            elem.metadata["embedding"] = elem_dict.get("embedding")
-            elem.metadata["embedding_text"] = elem_dict.get("embedding_text")
+        for elem, text in zip(self.elements, embedding_texts):
+            elem.metadata["embedding_text"] = text
         
         self.logger.info(f"✓ Repository indexing completed for {repo_name or 'Unknown'}: {len(self.elements)} elements indexed with embeddings")
         
-        return self.elements
+        return self.elements, self.embeddings
     
     def _index_file(self, file_info: Dict[str, Any], content: str, 
                     parse_result: FileParseResult):
@@ -4,12 +4,12 @@ Repository Loader - Handle git cloning, local repository loading, and ZIP file e
 
 import os
 import shutil
+import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
-from git import Repo, GitCommandError
 
 from .utils import (
     is_supported_file,
@@ -36,6 +36,10 @@ class RepositoryLoader:
         self.temp_dir = None
         self.repo_path = None
         self.repo_name = None
+
+        # In-memory ZIP mode: archive handle and root prefix inside the archive
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._zip_root = ""
     
     def load_from_url(self, url: str, target_dir: Optional[str] = None) -> str:
         """
@@ -60,6 +64,7 @@ class RepositoryLoader:
         else:
             ensure_dir(target_dir)
         
+        self._close_zip()
         self.repo_path = os.path.join(target_dir, self.repo_name)
         
         # Remove if already exists
@@ -67,24 +72,55 @@ class RepositoryLoader:
             self.logger.warning(f"Repository path {self.repo_path} already exists, removing...")
             shutil.rmtree(self.repo_path)
         
+        # Clone with shallow depth for faster cloning
+        clone_args = ["clone"]
+        if self.clone_depth > 0:
+            clone_args += ["--depth", str(self.clone_depth), "--single-branch"]
+        clone_args += [url, self.repo_path]
+        
         try:
-            # Clone with shallow depth for faster cloning
-            if self.clone_depth > 0:
-                Repo.clone_from(
-                    url,
-                    self.repo_path,
-                    depth=self.clone_depth,
-                    single_branch=True
-                )
-            else:
-                Repo.clone_from(url, self.repo_path)
+            self._run_git(clone_args)
             
             self.logger.info(f"Successfully cloned to {self.repo_path}")
             return self.repo_path
             
-        except GitCommandError as e:
-            self.logger.error(f"Failed to clone repository: {e}")
-            raise RuntimeError(f"Failed to clone repository: {e}")
+        except (subprocess.CalledProcessError, OSError) as e:
+            stderr = getattr(e, "stderr", None)
+            detail = stderr.strip() if stderr else str(e)
+            self.logger.error(f"Failed to clone repository: {detail}")
+            raise RuntimeError(f"Failed to clone repository: {detail}")
+    
+    def _run_git(self, args: List[str], cwd: Optional[str] = None, search_parents: bool = True) -> str:
+        """
+        Run a git command and return its stripped stdout
+        
+        Args:
+            args: Arguments passed to the git executable
+            cwd: Working directory for the command
+            search_parents: Let git look for a repository in the parent
+                directories of cwd; otherwise cwd must be the repository root
+        
+        Returns:
+            Command output
+        
+        Raises:
+            subprocess.CalledProcessError: If git exits with a non-zero status
+            OSError: If the git executable cannot be run
+        """
+        env = None
+        if not search_parents and cwd:
+            # Stop discovery at cwd so a plain directory inside another
+            # checkout is not reported as part of it
+            env = {**os.environ, "GIT_CEILING_DIRECTORIES": os.path.dirname(os.path.realpath(cwd))}
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.strip()
     
     def load_from_path(self, path: str) -> str:
         """
@@ -102,22 +138,27 @@ class RepositoryLoader:
         if not os.path.isdir(path):
             raise ValueError(f"Path is not a directory: {path}")
         
+        self._close_zip()
         self.repo_path = os.path.abspath(path)
         self.repo_name = os.path.basename(self.repo_path)
         
         self.logger.info(f"Loaded repository from {self.repo_path}")
         return self.repo_path
     
-    def load_from_zip(self, zip_path: str, target_dir: Optional[str] = None) -> str:
+    def load_from_zip(self, zip_path: str, target_dir: Optional[str] = None,
+                      in_memory: bool = False) -> str:
         """
         Extract and load repository from ZIP file
         
         Args:
             zip_path: Path to ZIP file
             target_dir: Target directory for extraction (optional, creates temp dir if None)
+            in_memory: Keep the archive open and serve file content from it
+                instead of extracting to disk. Use extraction (the default) when
+                callers need a real filesystem path.
         
         Returns:
-            Path to extracted repository
+            Path to extracted repository (a virtual path when in_memory=True)
         """
         if not os.path.exists(zip_path):
             raise ValueError(f"ZIP file does not exist: {zip_path}")
@@ -131,6 +172,10 @@ class RepositoryLoader:
         zip_basename = os.path.basename(zip_path)
         self.repo_name = os.path.splitext(zip_basename)[0]
         
+        self._close_zip()
+        if in_memory:
+            return self._open_zip_in_memory(zip_path)
+        
         # Create target directory
         if target_dir is None:
             self.temp_dir = tempfile.mkdtemp(prefix=f"fastcode_{self.repo_name}_")
@@ -178,6 +223,56 @@ class RepositoryLoader:
             self.logger.error(f"Failed to extract ZIP file: {e}")
             raise RuntimeError(f"Failed to extract ZIP file: {e}")
     
+    def _open_zip_in_memory(self, zip_path: str) -> str:
+        """
+        Open ZIP archive for in-memory access without extracting it
+
+        Args:
+            zip_path: Path to ZIP file
+
+        Returns:
+            Virtual repository path used as prefix for file paths
+        """
+        try:
+            zip_ref = zipfile.ZipFile(zip_path, 'r')
+        except zipfile.BadZipFile as e:
+            self.logger.error(f"Invalid ZIP file: {e}")
+            raise RuntimeError(f"Invalid ZIP file: {e}")
+
+        # Detect single root directory, same as extraction mode
+        names = zip_ref.namelist()
+        top_levels = {name.split('/', 1)[0] for name in names}
+        root = ""
+        if len(top_levels) == 1:
+            top = next(iter(top_levels))
+            if any(name.startswith(top + '/') for name in names):
+                root = top + '/'
+                self.logger.info(f"Detected single root directory: {top}")
+
+        self._zip = zip_ref
+        self._zip_root = root
+        self.repo_path = normalize_path(os.path.join(os.path.abspath(zip_path), root))
+
+        file_count = sum(1 for info in zip_ref.infolist() if not info.is_dir())
+        self.logger.info(f"Opened ZIP in memory with {file_count} files: {zip_path}")
+
+        return self.repo_path
+
+    def _zip_member_name(self, file_path: str) -> Optional[str]:
+        """Map a virtual file path to its member name in the open ZIP archive"""
+        prefix = self.repo_path.rstrip('/') + '/'
+        file_path = normalize_path(file_path)
+        if not file_path.startswith(prefix):
+            return None
+        return self._zip_root + file_path[len(prefix):]
+
+    def _close_zip(self):
+        """Close the in-memory ZIP archive if open"""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+            self._zip_root = ""
+
     def _load_gitignore_patterns(self) -> List[str]:
         """
         Load .gitignore patterns from the repository root.
@@ -188,18 +283,27 @@ class RepositoryLoader:
         if not self.repo_path:
             return []
 
-        gitignore_path = os.path.join(self.repo_path, ".gitignore")
-        if not os.path.isfile(gitignore_path):
-            return []
+        if self._zip is not None:
+            member = self._zip_root + ".gitignore"
+            if member not in self._zip.NameToInfo:
+                return []
+        else:
+            gitignore_path = os.path.join(self.repo_path, ".gitignore")
+            if not os.path.isfile(gitignore_path):
+                return []
 
         patterns = []
         try:
-            with open(gitignore_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
+            if self._zip is not None:
+                lines = self._zip.read(member).decode("utf-8").splitlines()
+            else:
+                with open(gitignore_path, "r", encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            for line in lines:
+                line = line.strip()
+                # Skip empty lines and comments
+                if line and not line.startswith("#"):
+                    patterns.append(line)
             self.logger.info(f"Loaded {len(patterns)} patterns from .gitignore")
         except Exception as e:
             self.logger.warning(f"Failed to read .gitignore: {e}")
@@ -229,6 +333,14 @@ class RepositoryLoader:
         total_size = 0
         max_file_size_bytes = self.max_file_size_mb * 1024 * 1024
         
+        if self._zip is not None:
+            files, total_size = self._scan_zip_files(effective_ignore, max_file_size_bytes)
+            self.logger.info(
+                f"Found {len(files)} supported files "
+                f"({total_size / 1024 / 1024:.2f} MB total)"
+            )
+            return files
+        
         for root, dirs, filenames in os.walk(self.repo_path):
             # Filter out ignored directories
             dirs[:] = [d for d in dirs if not should_ignore_path(
@@ -277,6 +389,46 @@ class RepositoryLoader:
         
         return files
     
+    def _scan_zip_files(self, effective_ignore: List[str],
+                        max_file_size_bytes: int) -> tuple:
+        """
+        Collect file metadata from the in-memory ZIP archive
+
+        Returns:
+            Tuple of (list of file metadata dictionaries, total size in bytes)
+        """
+        files = []
+        total_size = 0
+        root_len = len(self._zip_root)
+
+        for info in self._zip.infolist():
+            if info.is_dir() or not info.filename.startswith(self._zip_root):
+                continue
+
+            relative_path = info.filename[root_len:]
+            if should_ignore_path(relative_path, effective_ignore):
+                continue
+
+            if not is_supported_file(relative_path, self.supported_extensions):
+                continue
+
+            if info.file_size > max_file_size_bytes:
+                self.logger.warning(
+                    f"Skipping large file: {relative_path} "
+                    f"({info.file_size / 1024 / 1024:.2f} MB)"
+                )
+                continue
+
+            files.append({
+                "path": normalize_path(os.path.join(self.repo_path, relative_path)),
+                "relative_path": normalize_path(relative_path),
+                "size": info.file_size,
+                "extension": Path(relative_path).suffix,
+            })
+            total_size += info.file_size
+
+        return files, total_size
+
     def read_file_content(self, file_path: str) -> Optional[str]:
         """
         Read file content with error handling
@@ -287,6 +439,19 @@ class RepositoryLoader:
         Returns:
             File content or None if error
         """
+        if self._zip is not None:
+            member = self._zip_member_name(file_path)
+            if member is not None:
+                try:
+                    data = self._zip.read(member)
+                except Exception as e:
+                    self.logger.error(f"Failed to read {file_path}: {e}")
+                    return None
+                try:
+                    return data.decode('utf-8')
+                except UnicodeDecodeError:
+                    return data.decode('latin-1')
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read()
@@ -319,11 +484,18 @@ class RepositoryLoader:
         
         # Try to get git info
         try:
-            repo = Repo(self.repo_path)
+            branch = self._run_git(["symbolic-ref", "--short", "HEAD"], cwd=self.repo_path, search_parents=False)
+            commit = self._run_git(["rev-parse", "--short=8", "HEAD"], cwd=self.repo_path, search_parents=False)
+            try:
+                remote_url = self._run_git(
+                    ["config", "--get", "remote.origin.url"], cwd=self.repo_path, search_parents=False
+                ) or None
+            except subprocess.CalledProcessError:
+                remote_url = None
             info.update({
-                "branch": repo.active_branch.name,
-                "commit": repo.head.commit.hexsha[:8],
-                "remote_url": repo.remotes.origin.url if repo.remotes else None,
+                "branch": branch,
+                "commit": commit,
+                "remote_url": remote_url,
             })
         except Exception:
             self.logger.debug("Not a git repository or git info unavailable")
@@ -339,6 +511,7 @@ class RepositoryLoader:
     
     def cleanup(self):
         """Clean up temporary directories"""
+        self._close_zip()
         if self.temp_dir and os.path.exists(self.temp_dir):
             self.logger.info(f"Cleaning up temporary directory: {self.temp_dir}")
             shutil.rmtree(self.temp_dir)
@@ -2,14 +2,16 @@
 Main FastCode Class - Orchestrate all components
 """
 
+import io
 import os
-import pickle
+import copy
 import logging
-from typing import Optional, Dict, Any, List, Callable
-import numpy as np
-from rank_bm25 import BM25Okapi
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple
+import orjson
 
-from .utils import load_config, setup_logging, compute_file_hash, ensure_dir
+from .utils import load_config, setup_logging, compute_file_hash, ensure_dir, get_dir_size
 from .loader import RepositoryLoader
 from .parser import CodeParser
 from .embedder import CodeEmbedder
@@ -19,10 +21,131 @@ from .graph_builder import CodeGraphBuilder
 from .symbol_resolver import SymbolResolver
 from .module_resolver import ModuleResolver
 from .global_index_builder import GlobalIndexBuilder
-from .retriever import HybridRetriever
+from .retriever import (
+    HybridRetriever, bm25_file_path, build_bm25_index, read_bm25_file, write_bm25_file,
+)
 from .query_processor import QueryProcessor
 from .answer_generator import AnswerGenerator
-from .cache import CacheManager
+from .cache import CacheManager, SemanticQueryCache
+
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+# Strict check: only plain JSON types pass; dataclasses, datetimes and
+# str/int/dict subclasses raise instead of being serialized natively
+_ORJSON_STRICT_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+)
+
+
+def _to_jsonable(value: Any) -> Any:
+    """
+    Return a value that only holds JSON types
+
+    Values that already do are returned as-is after a single validating
+    dumps; anything else is round-tripped with unknown types stringified.
+    """
+    try:
+        orjson.dumps(value, option=_ORJSON_STRICT_OPTIONS)
+        return value
+    except TypeError:
+        return orjson.loads(orjson.dumps(value, default=str, option=_ORJSON_OPTIONS))
+
+
+_DEFAULT_CONFIG_PATHS = (
+    "config/config.yaml",
+    "../config/config.yaml",
+    os.path.join(os.path.dirname(__file__), "../config/config.yaml"),
+)
+
+# Configuration used when no config file is found
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "repository": {
+        "clone_depth": 1,
+        "max_file_size_mb": 5,
+        "ignore_patterns": ["*.pyc", "__pycache__", "node_modules", ".git"],
+        "supported_extensions": [".py", ".js", ".ts", ".java", ".go"],
+    },
+    "parser": {
+        "extract_docstrings": True,
+        "extract_comments": True,
+        "extract_imports": True,
+    },
+    "embedding": {
+        "model": "sentence-transformers/all-MiniLM-L6-v2",
+        "device": "cpu",
+        "batch_size": 32,
+    },
+    "indexing": {
+        "levels": ["file", "class", "function", "documentation"],
+    },
+    "vector_store": {
+        "persist_directory": "./data/vector_store",
+        "distance_metric": "cosine",
+        "index_type": "Flat",
+        "quantize": "none",
+        "mmap_load": True,
+    },
+    "retrieval": {
+        "semantic_weight": 0.6,
+        "keyword_weight": 0.3,
+        "graph_weight": 0.1,
+        "max_results": 5,
+    },
+    "generation": {
+        "provider": "openai",
+        "model": "gpt-4-turbo-preview",
+        "temperature": 0.1,
+        "max_tokens": 2000,
+    },
+    "evaluation": {
+        "enabled": False,
+        "in_memory_index": False,
+        "disable_cache": False,
+        "disable_persistence": False,
+        "force_reindex": False,
+    },
+    "multi_repo": {
+        "parallel_workers": 1,
+    },
+    "cache": {
+        "enabled": True,
+        "backend": "disk",
+        "cache_directory": "./data/cache",
+        "cache_queries": False,
+        "semantic_query_cache": False,
+        "semantic_cache_size": 512,
+        "semantic_cache_threshold": 0.97,
+    },
+    "logging": {
+        "level": "INFO",
+        "console": True,
+    },
+}
+
+
+# Directories already created/verified by this process
+_ensured_dirs = set()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_default_config_path() -> Optional[str]:
+    """Return the first existing default config path (resolved once per process)"""
+    for path in _DEFAULT_CONFIG_PATHS:
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        return path
+    return None
+
+
+def _ensure_dir_once(path: str):
+    """Create a directory unless this process has already ensured it"""
+    if path not in _ensured_dirs:
+        ensure_dir(path)
+        _ensured_dirs.add(path)
 
 
 class FastCode:
@@ -38,15 +161,7 @@ class FastCode:
         # Load configuration
         if config_path is None:
             # Try to find config in standard locations
-            possible_paths = [
-                "config/config.yaml",
-                "../config/config.yaml",
-                os.path.join(os.path.dirname(__file__), "../config/config.yaml"),
-            ]
-            for path in possible_paths:
-                if os.path.exists(path):
-                    config_path = path
-                    break
+            config_path = _find_default_config_path()
         
         if config_path and os.path.exists(config_path):
             self.config = load_config(config_path)
@@ -85,10 +200,16 @@ class FastCode:
         self.indexer = CodeIndexer(self.config, self.loader, self.parser, self.embedder, self.vector_store)
         self.graph_builder = CodeGraphBuilder(self.config)
         
+        # Persistence/cache decisions depend only on the config above
+        self._refresh_mode_flags()
+        
+        # Background writer for per-repository index files (multi-repo loading)
+        self._save_pool = ThreadPoolExecutor(max_workers=2)
+        
         # Get repo_root from config if available
         config_repo_root = self.config.get("repo_root")
         config_repo_root = os.path.abspath(config_repo_root)
-        ensure_dir(config_repo_root)
+        _ensure_dir_once(config_repo_root)
         self.logger.info(f"Configured repo_root: {config_repo_root}")
         
         self.retriever = HybridRetriever(self.config, self.vector_store, 
@@ -98,6 +219,13 @@ class FastCode:
         self.answer_generator = AnswerGenerator(self.config)
         self.cache_manager = CacheManager(self.config)
         
+        # Optional semantic cache for stateless query results
+        self.semantic_cache = None
+        if self.cache_manager.enabled and self.config.get("cache", {}).get("semantic_query_cache", False):
+            # Dimension is taken from the first stored query so the embedding
+            # model is not loaded just to size the cache
+            self.semantic_cache = SemanticQueryCache(self.config)
+        
         # State
         self.repo_loaded = False
         self.repo_indexed = False
@@ -163,10 +291,15 @@ class FastCode:
         
         repo_name = self.repo_info.get("name", "default")
         
+        # Cached answers refer to the previous index
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+        
         # Check cache
         if not force and self._should_use_cache():
             loaded = self._try_load_from_cache()
             if loaded:
+                self.retriever.warmup_bm25()
                 self.repo_indexed = True
                 return
         
@@ -174,26 +307,28 @@ class FastCode:
             # Get repository name for indexing
             repo_url = self.repo_info.get("url")
             
+            # Seed the embedder with this repository's previous embeddings so
+            # unchanged elements are not embedded again
+            if self._should_persist_indexes():
+                reused = self.embedder.load_reuse_cache(self._embedding_cache_path(repo_name))
+                if reused:
+                    self.logger.info(f"Loaded {reused} reusable embeddings for {repo_name}")
+            
             # Index code elements with repository information
-            elements = self.indexer.index_repository(repo_name=repo_name, repo_url=repo_url)
+            elements, embeddings = self.indexer.index_repository(repo_name=repo_name, repo_url=repo_url)
             
             # Initialize vector store if not already done
             if self.vector_store.dimension is None:
                 self.vector_store.initialize(self.embedder.embedding_dim)
             
-            # Add embeddings to vector store
-            vectors = []
-            metadata = []
-            
-            for elem in elements:
-                embedding = elem.metadata.get("embedding")
-                if embedding is not None:
-                    vectors.append(embedding)
-                    metadata.append(elem.to_dict())
+            # Add embeddings to vector store (row i of the matrix belongs to elements[i])
+            if len(embeddings):
+                self.vector_store.add_vectors(embeddings, [elem.to_dict() for elem in elements])
             
-            if vectors:
-                vectors_array = np.array(vectors)
-                self.vector_store.add_vectors(vectors_array, metadata)
+            # Build the BM25 index in the background; it only reads `elements`
+            # and is independent of resolver construction and graph building
+            bm25_executor = ThreadPoolExecutor(max_workers=1)
+            bm25_future = bm25_executor.submit(self.retriever.index_for_bm25, elements)
             
             # Initialize resolvers for complete graph building
             # This fixes the "0 edges" issue by providing the necessary context for resolution
@@ -233,10 +368,11 @@ class FastCode:
 
             # Build code graphs with resolvers
             # This will now use the initialized resolvers to build precise graphs
-            self.graph_builder.build_graphs(elements, self.module_resolver, self.symbol_resolver)
-            
-            # Index for BM25
-            self.retriever.index_for_bm25(elements)
+            try:
+                self.graph_builder.build_graphs(elements, self.module_resolver, self.symbol_resolver)
+            finally:
+                bm25_executor.shutdown(wait=True)
+            bm25_future.result()  # Re-raise any error from the BM25 build
             
             # Build separate BM25 index for repository overviews
             self.retriever.build_repo_overview_bm25()
@@ -252,6 +388,9 @@ class FastCode:
             else:
                 self.logger.info("Skipping on-disk persistence (ephemeral/evaluation mode)")
 
+            # Compile the JIT BM25 scorer before the first user query
+            self.retriever.warmup_bm25()
+            
             self.repo_indexed = True
             self.logger.info(f"Repository indexing complete for {repo_name}")
             
@@ -297,35 +436,40 @@ class FastCode:
         else:
             self.logger.info(f"Processing query: {question}")
         
-        # Get dialogue history if in multi-turn mode
-        dialogue_history = []
-        if enable_multi_turn and session_id:
-            # Get recent summaries from cache (last 10 turns for iterative agent)
-            history_summary_rounds = self.config.get("query", {}).get("history_summary_rounds", 10)
-            dialogue_history = self.cache_manager.get_recent_summaries(session_id, history_summary_rounds)
-
-            if dialogue_history:
-                self.logger.info(f"Retrieved {len(dialogue_history)} previous dialogue summaries")
-        
-        # NOTE: Query result caching is disabled to ensure full iterative_agent flow
-        # Original cache logic (disabled):
-        # use_cache = (not enable_multi_turn or not session_id) and self._should_use_cache()
-        # cached_result = None
-        # cache_key = None
-        # repo_hash = None
-        # if use_cache:
-        #     repo_hash = self._get_repo_hash()
-        #     cache_key = f"{question}_{','.join(sorted(repo_filter)) if repo_filter else 'all'}"
-        #     cached_result = self.cache_manager.get_query_result(cache_key, repo_hash)
-        #     if cached_result:
-        #         self.logger.info("Returning cached result")
-        # result = cached_result
-
-        result = None  # Always process through full flow
+        # Get dialogue history if in multi-turn mode (summaries for retrieval,
+        # full turns for answer generation; read from cache once)
+        dialogue_history, full_dialogue_history = self._get_dialogue_context(session_id, enable_multi_turn)
+        if dialogue_history:
+            self.logger.info(f"Retrieved {len(dialogue_history)} previous dialogue summaries")
+        
+        # NOTE: Exact-string query result caching is disabled to ensure full iterative_agent flow.
+        # The opt-in semantic cache (cache.semantic_query_cache) reuses answers for
+        # near-identical questions in stateless flows only.
+        result = None
         processed_query = None
         retrieved: List[CodeElement] = []
+        semantic_scope = None
+        query_embedding = None
 
         try:
+            use_semantic_cache = (
+                self.semantic_cache is not None
+                and prompt_builder is None
+                and (not enable_multi_turn or not session_id)
+            )
+            if use_semantic_cache:
+                semantic_scope = (
+                    self._get_repo_hash(),
+                    tuple(sorted(repo_filter)) if repo_filter else None,
+                    repr(sorted(filters.items())) if filters else None,
+                    use_agency_mode,
+                )
+                query_embedding = self.embedder.embed_text(question)
+                result = self.semantic_cache.get(query_embedding, semantic_scope)
+                if result is not None:
+                    self.logger.info("Returning semantically cached result")
+                    semantic_scope = None  # Already cached, do not store again
+
             if result is None:
                 # Determine if iterative enhancement should be used
                 use_iterative_enhancement = (
@@ -375,8 +519,8 @@ class FastCode:
                 result = self.answer_generator.generate(
                     question,
                     retrieved,
-                    query_info=processed_query.to_dict(),
-                    dialogue_history=self._get_full_dialogue_history(session_id, enable_multi_turn),
+                    query_info=processed_query,
+                    dialogue_history=full_dialogue_history,
                     prompt_builder=prompt_builder
                 )
             
@@ -394,14 +538,9 @@ class FastCode:
                 # Ensure sources are fully JSON-serializable
                 serializable_sources = self._ensure_jsonable_sources(sources)
 
-                # Ensure metadata is JSON-serializable
-                metadata = {
-                    "intent": getattr(processed_query, "intent", None),
-                    "keywords": getattr(processed_query, "keywords", None),
-                    "repo_filter": repo_filter,
-                    "multi_turn": enable_multi_turn,
-                }
-                serializable_metadata = self._ensure_jsonable_metadata(metadata)
+                serializable_metadata = self._dialogue_turn_metadata(
+                    processed_query, repo_filter, enable_multi_turn
+                )
 
                 self.cache_manager.save_dialogue_turn(
                     session_id=session_id,
@@ -416,9 +555,8 @@ class FastCode:
                 self.logger.info(f"Saved dialogue turn {turn_number} for session {session_id}")
             
             # Cache result for stateless flows (including single-turn sessions)
-            # NOTE: Query result caching is disabled to ensure full iterative_agent flow
-            # if use_cache and result is not None and cache_key and repo_hash:
-            #     self.cache_manager.set_query_result(cache_key, repo_hash, result)
+            if semantic_scope is not None and "error" not in result:
+                self.semantic_cache.put(query_embedding, semantic_scope, result)
             
             return result
             
@@ -468,13 +606,10 @@ class FastCode:
         else:
             self.logger.info(f"Processing streaming query: {question}")
 
-        # Get dialogue history if in multi-turn mode
-        dialogue_history = []
-        if enable_multi_turn and session_id:
-            history_summary_rounds = self.config.get("query", {}).get("history_summary_rounds", 10)
-            dialogue_history = self.cache_manager.get_recent_summaries(session_id, history_summary_rounds)
-            if dialogue_history:
-                self.logger.info(f"Retrieved {len(dialogue_history)} previous dialogue summaries")
+        # Get dialogue history if in multi-turn mode (read from cache once)
+        dialogue_history, full_dialogue_history = self._get_dialogue_context(session_id, enable_multi_turn)
+        if dialogue_history:
+            self.logger.info(f"Retrieved {len(dialogue_history)} previous dialogue summaries")
 
         try:
             # Notify start of retrieval
@@ -522,24 +657,24 @@ class FastCode:
             yield None, {"status": "generating", "retrieved_count": len(retrieved)}
 
             # Stream answer generation
-            full_answer_parts = []
+            answer_buffer = io.StringIO()
             answer_metadata = {}
 
             for chunk, metadata in self.answer_generator.generate_stream(
                 question,
                 retrieved,
-                query_info=processed_query.to_dict(),
-                dialogue_history=self._get_full_dialogue_history(session_id, enable_multi_turn),
+                query_info=processed_query,
+                dialogue_history=full_dialogue_history,
                 prompt_builder=prompt_builder
             ):
                 if chunk:
-                    full_answer_parts.append(chunk)
+                    answer_buffer.write(chunk)
                     yield chunk, None
                 if metadata:
                     answer_metadata.update(metadata)
 
             # Build complete result
-            full_answer = "".join(full_answer_parts)
+            full_answer = answer_buffer.getvalue()
             summary = answer_metadata.get("summary")
 
             result = {
@@ -560,12 +695,9 @@ class FastCode:
             if session_id:
                 turn_number = self._get_next_turn_number(session_id)
                 serializable_sources = self._ensure_jsonable_sources(result.get("sources", []))
-                serializable_metadata = self._ensure_jsonable_metadata({
-                    "intent": getattr(processed_query, "intent", None),
-                    "keywords": getattr(processed_query, "keywords", None),
-                    "repo_filter": repo_filter,
-                    "multi_turn": enable_multi_turn,
-                })
+                serializable_metadata = self._dialogue_turn_metadata(
+                    processed_query, repo_filter, enable_multi_turn
+                )
 
                 self.cache_manager.save_dialogue_turn(
                     session_id=session_id,
@@ -689,10 +821,36 @@ class FastCode:
             if cache_name is None:
                 cache_name = self._get_cache_name()
             self.vector_store.save(cache_name)
+            self.embedder.save_reuse_cache(self._embedding_cache_path(cache_name))
             self.logger.info(f"Saved index to cache: {cache_name}")
         except Exception as e:
             self.logger.warning(f"Failed to save to cache: {e}")
     
+    def _embedding_cache_path(self, cache_name: str) -> str:
+        """Get the path of the reusable element embeddings for a cache name"""
+        return os.path.join(self.vector_store.persist_dir, f"{cache_name}_embeddings.npz")
+    
+    def _repo_info_path(self, repo_name: str) -> str:
+        """Get the path of the saved repository info (file count, size, git info)"""
+        return os.path.join(self.vector_store.persist_dir, f"{repo_name}_info.json")
+    
+    def _save_repo_info(self, repo_name: str):
+        """Save a loaded repository's info so cache loads can report its stats"""
+        with open(self._repo_info_path(repo_name), 'wb') as f:
+            f.write(orjson.dumps(self.loaded_repositories[repo_name], default=str,
+                                 option=_ORJSON_OPTIONS))
+    
+    def _load_repo_info(self, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Load saved repository info, or None if it is missing or unreadable"""
+        try:
+            with open(self._repo_info_path(repo_name), 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to load repository info for {repo_name}: {e}")
+            return None
+    
     def _get_cache_name(self) -> str:
         """Get cache name for current repository"""
         return self.repo_info.get("name", "default")
@@ -701,43 +859,33 @@ class FastCode:
         """Get hash of repository for cache key"""
         return self.repo_info.get("commit", self.repo_info.get("name", "default"))
     
-    def _reconstruct_elements_from_metadata(self) -> List[CodeElement]:
+    def _reconstruct_elements_from_metadata(self, repo_names: Optional[Set[str]] = None) -> List[CodeElement]:
         """
         Reconstruct CodeElement objects from vector store metadata
         Excludes repository_overview elements (they're in separate storage)
         
+        Args:
+            repo_names: Only reconstruct elements of these repositories (default: all)
+        
         Returns:
             List of CodeElement objects
         """
-        elements = []
-        for meta in self.vector_store.metadata:
-            try:
-                # Skip repository_overview elements
-                if meta.get("type") == "repository_overview":
-                    continue
-                
-                # Reconstruct CodeElement from metadata dictionary
-                element = CodeElement(
-                    id=meta.get("id", ""),
-                    type=meta.get("type", ""),
-                    name=meta.get("name", ""),
-                    file_path=meta.get("file_path", ""),
-                    relative_path=meta.get("relative_path", ""),
-                    language=meta.get("language", ""),
-                    start_line=meta.get("start_line", 0),
-                    end_line=meta.get("end_line", 0),
-                    code=meta.get("code", ""),
-                    signature=meta.get("signature"),
-                    docstring=meta.get("docstring"),
-                    summary=meta.get("summary"),
-                    metadata=meta.get("metadata", {}),
-                    repo_name=meta.get("repo_name"),
-                    repo_url=meta.get("repo_url"),
-                )
-                elements.append(element)
-            except Exception as e:
-                self.logger.warning(f"Failed to reconstruct element: {e}")
-                continue
+        metadata = [
+            meta for meta in self.vector_store.metadata
+            if meta.get("type") != "repository_overview"
+            and (repo_names is None or meta.get("repo_name") in repo_names)
+        ]
+        
+        try:
+            elements = [CodeElement.from_dict(meta) for meta in metadata]
+        except Exception:
+            # Rebuild row by row so a single malformed entry only drops itself
+            elements = []
+            for meta in metadata:
+                try:
+                    elements.append(CodeElement.from_dict(meta))
+                except Exception as e:
+                    self.logger.warning(f"Failed to reconstruct element: {e}")
         
         self.logger.info(f"Reconstructed {len(elements)} elements from metadata (excluding repository_overview)")
         return elements
@@ -751,21 +899,27 @@ class FastCode:
         
         self.logger.info(f"Statistics: {stats}")
     
+    def _refresh_mode_flags(self):
+        """
+        Recompute the cached ephemeral/cache/persistence flags
+
+        Call again after changing eval_config, in_memory_index or the vector store.
+        """
+        self._ephemeral = bool(self.in_memory_index or getattr(self.vector_store, "in_memory", False))
+        self._use_cache = not (self._ephemeral or self.eval_config.get("disable_cache", False))
+        self._persist = not (self._ephemeral or self.eval_config.get("disable_persistence", False))
+
     def _is_ephemeral_mode(self) -> bool:
         """Return True when running in evaluation/in-memory mode."""
-        return self.in_memory_index or getattr(self.vector_store, "in_memory", False)
+        return self._ephemeral
 
     def _should_use_cache(self) -> bool:
         """Determine whether cache/index reuse is allowed."""
-        if self.eval_config.get("disable_cache", False):
-            return False
-        return not self._is_ephemeral_mode()
+        return self._use_cache
 
     def _should_persist_indexes(self) -> bool:
         """Determine whether indexes should be persisted to disk."""
-        if self.eval_config.get("disable_persistence", False):
-            return False
-        return not self._is_ephemeral_mode()
+        return self._persist
     
     def _serialize_retrieved_elements(self, elements: List[Any]) -> List[Dict[str, Any]]:
         """Safely serialize retrieved elements for caching/session history"""
@@ -784,6 +938,16 @@ class FastCode:
     
     def _ensure_jsonable_sources(self, sources: List[Any]) -> List[Dict[str, Any]]:
         """Ensure sources are JSON-serializable, converting any complex objects"""
+        sources = sources or []
+        try:
+            # Fast path: C-level validation/conversion; unknown types become str
+            return [
+                source if isinstance(source, dict) else {"repr": str(original)}
+                for source, original in zip(_to_jsonable(sources), sources)
+            ]
+        except Exception as e:
+            self.logger.debug(f"orjson conversion of sources failed, using per-field fallback: {e}")
+        
         jsonable_sources = []
         for source in sources or []:
             try:
@@ -806,86 +970,26 @@ class FastCode:
                 self.logger.warning(f"Failed to serialize source: {e}")
         return jsonable_sources
 
-    def _ensure_jsonable_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Ensure metadata is JSON-serializable, converting any complex objects"""
-        jsonable_metadata = {}
-        for key, value in (metadata or {}).items():
-            try:
-                if isinstance(value, (str, int, float, bool, type(None))):
-                    jsonable_metadata[key] = value
-                elif isinstance(value, (list, tuple)):
-                    # Recursively ensure list items are serializable
-                    jsonable_metadata[key] = [
-                        v if isinstance(v, (str, int, float, bool, type(None))) else str(v)
-                        for v in value
-                    ]
-                elif isinstance(value, dict):
-                    # Recursively ensure dict values are serializable
-                    jsonable_metadata[key] = self._ensure_jsonable_metadata(value)
-                else:
-                    # Convert complex objects to string
-                    jsonable_metadata[key] = str(value)
-            except Exception as e:
-                self.logger.warning(f"Failed to serialize metadata key '{key}': {e}")
-                jsonable_metadata[key] = str(value)
-        return jsonable_metadata
+    def _dialogue_turn_metadata(self, processed_query: Any, repo_filter: Optional[List[str]],
+                                enable_multi_turn: Optional[bool]) -> Dict[str, Any]:
+        """
+        Build the metadata stored with a dialogue turn
 
-    def _get_default_config(self) -> Dict[str, Any]:
-        """Get default configuration"""
+        Every value is converted to a JSON type here, so the dict needs no
+        further sanitizing before it is saved.
+        """
+        intent = getattr(processed_query, "intent", None)
+        keywords = getattr(processed_query, "keywords", None)
         return {
-            "repository": {
-                "clone_depth": 1,
-                "max_file_size_mb": 5,
-                "ignore_patterns": ["*.pyc", "__pycache__", "node_modules", ".git"],
-                "supported_extensions": [".py", ".js", ".ts", ".java", ".go"],
-            },
-            "parser": {
-                "extract_docstrings": True,
-                "extract_comments": True,
-                "extract_imports": True,
-            },
-            "embedding": {
-                "model": "sentence-transformers/all-MiniLM-L6-v2",
-                "device": "cpu",
-                "batch_size": 32,
-            },
-            "indexing": {
-                "levels": ["file", "class", "function", "documentation"],
-            },
-            "vector_store": {
-                "persist_directory": "./data/vector_store",
-                "distance_metric": "cosine",
-            },
-            "retrieval": {
-                "semantic_weight": 0.6,
-                "keyword_weight": 0.3,
-                "graph_weight": 0.1,
-                "max_results": 5,
-            },
-            "generation": {
-                "provider": "openai",
-                "model": "gpt-4-turbo-preview",
-                "temperature": 0.1,
-                "max_tokens": 2000,
-            },
-            "evaluation": {
-                "enabled": False,
-                "in_memory_index": False,
-                "disable_cache": False,
-                "disable_persistence": False,
-                "force_reindex": False,
-            },
-            "cache": {
-                "enabled": True,
-                "backend": "disk",
-                "cache_directory": "./data/cache",
-                "cache_queries": False,
-            },
-            "logging": {
-                "level": "INFO",
-                "console": True,
-            },
+            "intent": str(intent) if intent is not None else None,
+            "keywords": [str(keyword) for keyword in keywords] if keywords is not None else None,
+            "repo_filter": [str(repo) for repo in repo_filter] if repo_filter is not None else None,
+            "multi_turn": bool(enable_multi_turn) if enable_multi_turn is not None else None,
         }
+
+    def _get_default_config(self) -> Dict[str, Any]:
+        """Get default configuration (a private copy; callers mutate it)"""
+        return copy.deepcopy(_DEFAULT_CONFIG)
     
     def load_multiple_repositories(self, sources: List[Dict[str, Any]]):
         """
@@ -900,115 +1004,51 @@ class FastCode:
         self.logger.info(f"Loading {len(sources)} repositories")
         self.multi_repo_mode = True
         
-        successfully_indexed = []
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
         
-        for i, source_info in enumerate(sources):
-            source = source_info.get('source')
-            is_url = source_info.get('is_url', True)
-            is_zip = source_info.get('is_zip', False)
-            
+        # Indexing several repositories at once overlaps clone/parse I/O with
+        # embedding; each worker gets its own loader, parser and config copy
+        workers = max(1, min(self.config.get("multi_repo", {}).get("parallel_workers", 1), len(sources)))
+        
+        # (repo_name, future) for index files written in the background
+        save_futures = []
+        
+        if workers == 1:
+            results = [
+                self._index_single_repository(i, len(sources), source_info,
+                                              self.loader, self.parser, self.config,
+                                              save_futures)
+                for i, source_info in enumerate(sources)
+            ]
+        else:
+            self.logger.info(f"Indexing repositories with {workers} parallel workers")
+            # Load the embedding model once before the workers share it
+            _ = self.embedder.embedding_dim
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                for i, source_info in enumerate(sources):
+                    repo_config = dict(self.config)
+                    futures.append(executor.submit(
+                        self._index_repository_in_worker, i, len(sources), source_info,
+                        repo_config, save_futures,
+                    ))
+                # Keep results in source order
+                results = [future.result() for future in futures]
+        
+        # Repositories are only merged once all of their files are on disk
+        failed_saves = set()
+        for repo_name, future in save_futures:
             try:
-                self.logger.info(f"[{i+1}/{len(sources)}] Loading repository: {source}")
-                
-                # Load repository
-                if is_zip:
-                    self.loader.load_from_zip(source)
-                elif is_url:
-                    self.loader.load_from_url(source)
-                else:
-                    self.loader.load_from_path(source)
-                
-                repo_info = self.loader.get_repository_info()
-                repo_name = repo_info.get('name')
-                repo_url = repo_info.get('url', source)
-                
-                # Update config with repo_root for each repo (Critical for graph building)
-                if self.loader.repo_path:
-                    self.config["repo_root"] = self.loader.repo_path
-                
-                # Store repository info
-                self.loaded_repositories[repo_name] = repo_info
-                
-                self.logger.info(f"Indexing repository: {repo_name}")
-                
-                # Create a fresh vector store for this repository
-                temp_vector_store = VectorStore(self.config)
-                temp_vector_store.initialize(self.embedder.embedding_dim)
-                
-                # Create a temporary indexer with the temp vector store for this repo
-                temp_indexer = CodeIndexer(self.config, self.loader, self.parser, 
-                                          self.embedder, temp_vector_store)
-                
-                # Index with repository information
-                elements = temp_indexer.index_repository(repo_name=repo_name, repo_url=repo_url)
-                
-                # Add to temporary vector store
-                vectors = []
-                metadata = []
-                
-                for elem in elements:
-                    embedding = elem.metadata.get("embedding")
-                    if embedding is not None:
-                        vectors.append(embedding)
-                        metadata.append(elem.to_dict())
-                
-                if vectors:
-                    vectors_array = np.array(vectors)
-                    temp_vector_store.add_vectors(vectors_array, metadata)
-                    
-                    # Save this repository's vector index separately
-                    temp_vector_store.save(repo_name)
-                    
-                    # Build and save BM25 index for this repository
-                    temp_retriever = HybridRetriever(self.config, temp_vector_store, 
-                                                     self.embedder, self.graph_builder,
-                                                     repo_root=self.loader.repo_path)
-                    temp_retriever.index_for_bm25(elements)
-                    temp_retriever.save_bm25(repo_name)
-                    self.logger.info(f"Saved BM25 index for {repo_name}")
-                    
-                    # Build separate BM25 index for repository overviews
-                    temp_retriever.build_repo_overview_bm25()
-                    self.logger.info(f"Built repo overview BM25 index")
-                    
-                    # Build and save graph for this repository (Using temporary graph builder)
-                    # We need a fresh graph builder to avoid mixing graphs between repos during this loop
-                    # unless we want to support cross-repo graphs immediately
-                    temp_graph_builder = CodeGraphBuilder(self.config)
-                    
-                    # Initialize resolvers for precise graph building
-                    repo_root = self.loader.repo_path
-                    temp_module_resolver = None
-                    temp_symbol_resolver = None
-                    
-                    try:
-                        self.logger.info(f"Initializing resolvers for {repo_name}...")
-                        temp_global_index = GlobalIndexBuilder(self.config)
-                        temp_global_index.build_maps(elements, repo_root)
-                        temp_module_resolver = ModuleResolver(temp_global_index)
-                        temp_symbol_resolver = SymbolResolver(temp_global_index, temp_module_resolver)
-                        self.logger.info(f"Resolvers initialized for {repo_name}")
-                    except Exception as e:
-                        self.logger.warning(f"Failed to initialize resolvers for {repo_name}: {e}")
-                        temp_module_resolver = None
-                        temp_symbol_resolver = None
-
-                    temp_graph_builder.build_graphs(elements, temp_module_resolver, temp_symbol_resolver)
-                    temp_graph_builder.save(repo_name)
-                    self.logger.info(f"Saved graph data for {repo_name}")
-                    
-                    successfully_indexed.append(repo_name)
-                    
-                    self.logger.info(f"Successfully indexed and saved {repo_name}: {len(elements)} elements")
-                else:
-                    self.logger.warning(f"No vectors generated for {repo_name}")
-                
+                future.result()
             except Exception as e:
-                self.logger.error(f"Failed to load repository {source}: {e}")
-                import traceback
-                self.logger.error(traceback.format_exc())
-                # Continue with next repository
-                continue
+                self.logger.error(f"Failed to save index files for {repo_name}: {e}")
+                failed_saves.add(repo_name)
+        
+        successfully_indexed = [
+            repo_name for repo_name in results
+            if repo_name and repo_name not in failed_saves
+        ]
         
         if successfully_indexed:
             self.logger.info(f"Successfully indexed {len(successfully_indexed)} repositories:")
@@ -1020,8 +1060,9 @@ class FastCode:
             if self.vector_store.dimension is None:
                 self.vector_store.initialize(self.embedder.embedding_dim)
             
+            merged = self.vector_store.merge_many(successfully_indexed)
             for repo_name in successfully_indexed:
-                if self.vector_store.merge_from_index(repo_name):
+                if repo_name in merged:
                     self.logger.info(f"Merged {repo_name} into main store")
                 else:
                     self.logger.warning(f"Failed to merge {repo_name}")
@@ -1033,6 +1074,144 @@ class FastCode:
         
         self.logger.info(f"Indexing complete. Each repository saved separately.")
     
+    def _index_repository_in_worker(self, i: int, total: int, source_info: Dict[str, Any],
+                                    config: Dict[str, Any],
+                                    save_futures: List[Tuple[str, Any]]) -> Optional[str]:
+        """Index one repository with its own loader and parser, stopping the parser's workers after"""
+        parser = CodeParser(config)
+        try:
+            return self._index_single_repository(i, total, source_info, RepositoryLoader(config),
+                                                 parser, config, save_futures)
+        finally:
+            parser.shutdown_workers()
+    
+    def _index_single_repository(self, i: int, total: int, source_info: Dict[str, Any],
+                                 loader: RepositoryLoader, parser: CodeParser,
+                                 config: Dict[str, Any],
+                                 save_futures: Optional[List[Tuple[str, Any]]] = None) -> Optional[str]:
+        """
+        Load, index and save one repository for load_multiple_repositories
+        
+        Args:
+            i: Position of the repository in the source list
+            total: Number of repositories being loaded
+            source_info: Source description ('source', 'is_url', 'is_zip')
+            loader: Repository loader to use (not shared between parallel workers)
+            parser: Code parser to use (not shared between parallel workers)
+            config: Configuration whose repo_root is set for this repository
+            save_futures: If given, index files are written on the background
+                save pool and (repo_name, future) pairs are appended here;
+                the caller must wait on them before reading the files
+        
+        Returns:
+            Repository name if it was indexed and saved, None otherwise
+        """
+        source = source_info.get('source')
+        is_url = source_info.get('is_url', True)
+        is_zip = source_info.get('is_zip', False)
+        
+        try:
+            self.logger.info(f"[{i+1}/{total}] Loading repository: {source}")
+            
+            # Load repository
+            if is_zip:
+                loader.load_from_zip(source)
+            elif is_url:
+                loader.load_from_url(source)
+            else:
+                loader.load_from_path(source)
+            
+            repo_info = loader.get_repository_info()
+            repo_name = repo_info.get('name')
+            repo_url = repo_info.get('url', source)
+            
+            # Update config with repo_root for each repo (Critical for graph building)
+            if loader.repo_path:
+                config["repo_root"] = loader.repo_path
+            
+            # Store repository info
+            self.loaded_repositories[repo_name] = repo_info
+            
+            self.logger.info(f"Indexing repository: {repo_name}")
+            
+            # Create a fresh vector store for this repository
+            temp_vector_store = VectorStore(config)
+            temp_vector_store.initialize(self.embedder.embedding_dim)
+            
+            # Create a temporary indexer with the temp vector store for this repo
+            temp_indexer = CodeIndexer(config, loader, parser, 
+                                      self.embedder, temp_vector_store)
+            
+            # Index with repository information
+            elements, embeddings = temp_indexer.index_repository(repo_name=repo_name, repo_url=repo_url)
+            
+            # Add to temporary vector store
+            if len(embeddings):
+                temp_vector_store.add_vectors(embeddings, [elem.to_dict() for elem in elements])
+                
+                # Save this repository's vector index separately
+                self._save_repo_artifact(save_futures, repo_name, temp_vector_store.save)
+                
+                # Save BM25 data for this repository. Only the tokenized corpus
+                # is persisted, so no per-repo retriever (LLM selector, agents)
+                # or scored BM25 index is built here
+                bm25_corpus = self.retriever.tokenize_corpus(elements)
+                bm25_dir = self.retriever.persist_dir
+                self._save_repo_artifact(
+                    save_futures, repo_name,
+                    lambda name: write_bm25_file(bm25_dir, name, bm25_corpus, elements),
+                )
+                self.logger.info(f"Saving BM25 index for {repo_name}")
+                
+                # Build and save graph for this repository (Using temporary graph builder)
+                # We need a fresh graph builder to avoid mixing graphs between repos during this loop
+                # unless we want to support cross-repo graphs immediately
+                temp_graph_builder = CodeGraphBuilder(config)
+                
+                # Initialize resolvers for precise graph building
+                repo_root = loader.repo_path
+                temp_module_resolver = None
+                temp_symbol_resolver = None
+                
+                try:
+                    self.logger.info(f"Initializing resolvers for {repo_name}...")
+                    temp_global_index = GlobalIndexBuilder(config)
+                    temp_global_index.build_maps(elements, repo_root)
+                    temp_module_resolver = ModuleResolver(temp_global_index)
+                    temp_symbol_resolver = SymbolResolver(temp_global_index, temp_module_resolver)
+                    self.logger.info(f"Resolvers initialized for {repo_name}")
+                except Exception as e:
+                    self.logger.warning(f"Failed to initialize resolvers for {repo_name}: {e}")
+                    temp_module_resolver = None
+                    temp_symbol_resolver = None
+
+                temp_graph_builder.build_graphs(elements, temp_module_resolver, temp_symbol_resolver)
+                self._save_repo_artifact(save_futures, repo_name, temp_graph_builder.save)
+                self.logger.info(f"Saving graph data for {repo_name}")
+                
+                if self._should_persist_indexes():
+                    self._save_repo_artifact(save_futures, repo_name, self._save_repo_info)
+                
+                self.logger.info(f"Successfully indexed {repo_name}: {len(elements)} elements")
+                return repo_name
+            
+            self.logger.warning(f"No vectors generated for {repo_name}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load repository {source}: {e}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+        
+        return None
+    
+    def _save_repo_artifact(self, save_futures: Optional[List[Tuple[str, Any]]],
+                            repo_name: str, save_fn: Callable[[str], Any]):
+        """Run save_fn(repo_name) now, or on the save pool when collecting futures"""
+        if save_futures is None:
+            save_fn(repo_name)
+        else:
+            save_futures.append((repo_name, self._save_pool.submit(save_fn, repo_name)))
+    
     def list_repositories(self) -> List[Dict[str, Any]]:
         """
         List all indexed repositories
@@ -1096,16 +1275,7 @@ class FastCode:
         """
         try:
             # Discover available repository indexes
-            persist_dir = self.vector_store.persist_dir
-            available_repos = []
-            
-            if os.path.exists(persist_dir):
-                for file in os.listdir(persist_dir):
-                    if file.endswith('.faiss'):
-                        repo_name = file.replace('.faiss', '')
-                        metadata_file = os.path.join(persist_dir, f"{repo_name}_metadata.pkl")
-                        if os.path.exists(metadata_file):
-                            available_repos.append(repo_name)
+            available_repos = self.vector_store.get_available_repos()
             
             if not available_repos:
                 self.logger.error("No repository indexes found")
@@ -1126,32 +1296,27 @@ class FastCode:
             if self.vector_store.dimension is None:
                 self.vector_store.initialize(self.embedder.embedding_dim)
             
-            # Load each repository index and merge them
+            # Load all repository indexes and merge them in one batch
+            self.logger.info(f"Loading indexes for {len(repos_to_load)} repositories...")
+            merged = self.vector_store.merge_many(repos_to_load)
             for repo_name in repos_to_load:
-                self.logger.info(f"Loading index for {repo_name}...")
-                try:
-                    # Merge this repository's index into the main vector store
-                    if self.vector_store.merge_from_index(repo_name):
-                        self.logger.info(f"Successfully merged {repo_name}")
-                    else:
-                        self.logger.warning(f"Failed to merge index for {repo_name}")
-                        
-                except Exception as e:
-                    self.logger.error(f"Error loading {repo_name}: {e}")
-                    continue
+                if repo_name in merged:
+                    self.logger.info(f"Successfully merged {repo_name}")
+                else:
+                    self.logger.warning(f"Failed to merge index for {repo_name}")
             
             # Check if we successfully loaded any repositories
             if self.vector_store.get_count() == 0:
                 self.logger.error("Failed to load any repository indexes")
                 return False
             
-            # Register loaded repositories
+            # Register loaded repositories, restoring the info saved at index time
             # We know which repos were successfully loaded from repos_to_load
             for repo_name in repos_to_load:
                 if repo_name not in self.loaded_repositories:
-                    self.loaded_repositories[repo_name] = {
+                    self.loaded_repositories[repo_name] = self._load_repo_info(repo_name) or {
                         "name": repo_name,
-                        "file_count": 0,  # Will be updated if needed
+                        "file_count": 0,  # Unknown for caches saved without repository info
                         "total_size_mb": 0,
                     }
             
@@ -1163,54 +1328,81 @@ class FastCode:
             all_bm25_corpus = []
             graphs_loaded = False
             
-            for repo_name in repos_to_load:
-                # Try loading BM25 for each repo
-                bm25_path = os.path.join(self.retriever.persist_dir, f"{repo_name}_bm25.pkl")
-                if os.path.exists(bm25_path):
+            # A merged BM25 index saved for this exact set of repositories
+            # replaces reading and re-scoring every per-repository corpus
+            merged_bm25_loaded = self.retriever.load_merged_bm25(repos_to_load)
+            
+            # Repositories without readable BM25 data; only these get re-tokenized
+            missing_bm25_repos = set()
+            
+            # Read the per-repo BM25 files in the background while the graphs are
+            # loaded below; the graph builder is only touched from this thread
+            bm25_executor = ThreadPoolExecutor(max_workers=min(4, len(repos_to_load)))
+            try:
+                bm25_futures = {} if merged_bm25_loaded else {
+                    repo_name: bm25_executor.submit(
+                        read_bm25_file, bm25_file_path(self.retriever.persist_dir, repo_name)
+                    )
+                    for repo_name in repos_to_load
+                }
+                
+                for repo_name in repos_to_load:
+                    # Load graph data (merge into main graph)
+                    if not graphs_loaded:
+                        # Load the first repository's graph as base
+                        if self.graph_builder.load(repo_name):
+                            graphs_loaded = True
+                            self.logger.info(f"Loaded graph data from {repo_name} as base")
+                    else:
+                        # Merge additional repository graphs
+                        if self.graph_builder.merge_from_file(repo_name):
+                            self.logger.info(f"Merged graph data from {repo_name}")
+                        else:
+                            self.logger.warning(f"Failed to merge graph data from {repo_name}")
+                
+                # Collect BM25 data in repository order
+                for repo_name, bm25_future in bm25_futures.items():
                     try:
-                        with open(bm25_path, 'rb') as f:
-                            data = pickle.load(f)
-                            all_bm25_corpus.extend(data["bm25_corpus"])
-                            
-                            # Reconstruct CodeElement objects
-                            for elem_dict in data["bm25_elements"]:
-                                all_bm25_elements.append(CodeElement(**elem_dict))
+                        corpus, elements = bm25_future.result()
+                        all_bm25_corpus.extend(corpus)
+                        all_bm25_elements.extend(elements)
                         
                         self.logger.info(f"Loaded BM25 data for {repo_name}")
+                    except FileNotFoundError:
+                        missing_bm25_repos.add(repo_name)
                     except Exception as e:
                         self.logger.warning(f"Failed to load BM25 data for {repo_name}: {e}")
-                
-                # Load graph data (merge into main graph)
-                if not graphs_loaded:
-                    # Load the first repository's graph as base
-                    if self.graph_builder.load(repo_name):
-                        graphs_loaded = True
-                        self.logger.info(f"Loaded graph data from {repo_name} as base")
-                else:
-                    # Merge additional repository graphs
-                    if self.graph_builder.merge_from_file(repo_name):
-                        self.logger.info(f"Merged graph data from {repo_name}")
-                    else:
-                        self.logger.warning(f"Failed to merge graph data from {repo_name}")
-                    # TODO: Merge additional repository graphs if needed
+                        missing_bm25_repos.add(repo_name)
+            finally:
+                bm25_executor.shutdown(wait=True)
+            
             # Rebuild FULL BM25 index with merged data (for repository selection)
-            if all_bm25_elements and all_bm25_corpus:
-                self.retriever.full_bm25_elements = all_bm25_elements
-                self.retriever.full_bm25_corpus = all_bm25_corpus
-                self.retriever.full_bm25 = BM25Okapi(all_bm25_corpus)
-                self.logger.info(f"Rebuilt full BM25 index with {len(all_bm25_elements)} merged elements")
+            if merged_bm25_loaded:
+                self.logger.info("Using saved merged BM25 index")
             else:
-                # Fallback: reconstruct from metadata
-                self.logger.info("No BM25 data found, reconstructing from metadata...")
-                elements = self._reconstruct_elements_from_metadata()
-                
-                if elements:
-                    self.retriever.index_for_bm25(elements)
-                    self.logger.info(f"Rebuilt BM25 index with {len(elements)} elements")
+                if missing_bm25_repos:
+                    # Fallback: reconstruct and tokenize only the repositories without
+                    # BM25 data; the others reuse the corpus tokens saved with them
+                    self.logger.info(
+                        f"No BM25 data for {', '.join(sorted(missing_bm25_repos))}, "
+                        f"reconstructing from metadata..."
+                    )
+                    elements = self._reconstruct_elements_from_metadata(missing_bm25_repos)
+                    all_bm25_corpus.extend(self.retriever.tokenize_corpus(elements))
+                    all_bm25_elements.extend(elements)
                     
-                    if not graphs_loaded:
-                        self.graph_builder.build_graphs(elements)
+                    if all_bm25_elements and not graphs_loaded:
+                        self.graph_builder.build_graphs(all_bm25_elements)
                         self.logger.info("Rebuilt code graph")
+                
+                if all_bm25_elements and all_bm25_corpus:
+                    self.retriever.full_bm25_elements = all_bm25_elements
+                    self.retriever.full_bm25_corpus = all_bm25_corpus
+                    self.retriever.full_bm25 = build_bm25_index(all_bm25_corpus)
+                    self.logger.info(f"Rebuilt full BM25 index with {len(all_bm25_elements)} merged elements")
+                    
+                    if self._should_persist_indexes():
+                        self.retriever.save_merged_bm25(repos_to_load)
                 else:
                     self.logger.warning("No elements reconstructed from metadata")
             
@@ -1233,27 +1425,41 @@ class FastCode:
     
     def cleanup(self):
         """Cleanup resources"""
+        # Flush pending background index saves and join their threads
+        self._save_pool.shutdown(wait=True)
+        # Stop parse worker processes (parse_workers > 1)
+        self.parser.shutdown_workers()
         self.loader.cleanup()
         self.logger.info("Cleanup complete")
     
-    def _get_full_dialogue_history(self, session_id: Optional[str], enable_multi_turn: bool) -> Optional[List[Dict[str, Any]]]:
+    def _get_dialogue_context(self, session_id: Optional[str],
+                              enable_multi_turn: bool) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
         """
-        Get full dialogue history for answer generation
+        Fetch dialogue history once and derive both views a query needs
         
         Args:
             session_id: Session ID
             enable_multi_turn: Whether multi-turn is enabled
         
         Returns:
-            List of dialogue turns or None
+            Tuple of (recent turn summaries for retrieval,
+            full dialogue turns for answer generation or None)
         """
         if not enable_multi_turn or not session_id:
-            return None
-
+            return [], None
+        
+        history_summary_rounds = self.config.get("query", {}).get("history_summary_rounds", 10)
         context_rounds = self.config.get("generation", {}).get("context_rounds", 10)
-        history = self.cache_manager.get_dialogue_history(session_id, max_turns=context_rounds)
-
-        return history if history else None
+        history = self.cache_manager.get_dialogue_history(
+            session_id, max_turns=max(history_summary_rounds, context_rounds)
+        )
+        
+        summaries = []
+        if history_summary_rounds > 0:
+            summaries = self.cache_manager.summarize_turns(history[-history_summary_rounds:])
+        full_history = history[-context_rounds:] if context_rounds > 0 else []
+        
+        return summaries, (full_history or None)
     
     def _get_next_turn_number(self, session_id: str) -> int:
         """
@@ -1316,19 +1522,25 @@ class FastCode:
         # Files to delete from vector_store directory
         file_patterns = [
             f"{repo_name}.faiss",
+            f"{repo_name}_metadata.msgpack",
             f"{repo_name}_metadata.pkl",
+            f"{repo_name}_embeddings.npz",
+            f"{repo_name}_bm25.msgpack",
             f"{repo_name}_bm25.pkl",
             f"{repo_name}_graphs.pkl",
+            f"{repo_name}_info.json",
         ]
 
         for fname in file_patterns:
             fpath = os.path.join(persist_dir, fname)
-            if os.path.exists(fpath):
-                size = os.path.getsize(fpath)
-                os.remove(fpath)
-                deleted_files.append(fname)
-                freed_bytes += size
-                self.logger.info(f"Deleted {fpath} ({size / (1024*1024):.2f} MB)")
+            try:
+                size = os.stat(fpath).st_size
+            except FileNotFoundError:
+                continue
+            os.remove(fpath)
+            deleted_files.append(fname)
+            freed_bytes += size
+            self.logger.info(f"Deleted {fpath} ({size / (1024*1024):.2f} MB)")
 
         # Remove overview entry from repo_overviews.pkl
         if self.vector_store.delete_repo_overview(repo_name):
@@ -1340,11 +1552,7 @@ class FastCode:
             repo_root = self.config.get("repo_root", "./repos")
             repo_dir = os.path.join(repo_root, repo_name)
             if os.path.isdir(repo_dir):
-                dir_size = sum(
-                    os.path.getsize(os.path.join(dp, f))
-                    for dp, _, fns in os.walk(repo_dir)
-                    for f in fns
-                )
+                dir_size = get_dir_size(repo_dir)
                 shutil.rmtree(repo_dir)
                 deleted_files.append(f"repos/{repo_name}/")
                 freed_bytes += dir_size
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from fastcode.global_index_builder import GlobalIndexBuilder
 
 
@@ -20,6 +20,28 @@ class ModuleResolver:
         """
         self.index = index
 
+        # GlobalIndexBuilder clears and refills its maps in place, so holding
+        # direct references saves an attribute hop per lookup
+        self._module_map = index.module_map
+        self._parent_of = index.parent_of
+
+        # (current_module_path, import_name, level, is_package) -> file ID for
+        # relative imports; the same import is resolved from many call sites, so
+        # results are memoized until the index rebuilds its maps
+        self._resolve_cache: Dict[Tuple[str, str, int, bool], Optional[str]] = {}
+        self._cache_version = index.maps_version
+
+        # Bound once here so resolve_import does not rebuild a bound method per call
+        self._resolve_relative = self._resolve_relative_import
+        self._resolve_absolute = self._resolve_absolute_import
+
+    def clear_cache(self) -> None:
+        """Drop all memoized import resolutions"""
+        self._resolve_cache.clear()
+        self._cache_version = self.index.maps_version
+        self._module_map = self.index.module_map
+        self._parent_of = self.index.parent_of
+
     def resolve_import(self, current_module_path: str, import_name: str, level: int, is_package: bool = False) -> Optional[str]:
         """
         Resolve import to target file ID.
@@ -31,57 +53,130 @@ class ModuleResolver:
             is_package: Boolean indicating if the source file is an __init__.py (package root).
                         If True, relative imports starting with '.' stay in the current directory.
         """
-        if level > 0:
-            # Pass the is_package flag to the relative import handler
-            result = self._resolve_relative_import(current_module_path, import_name, level, is_package)
-            return result
-        else:
-            result = self._resolve_absolute_import(import_name)
-            return result
-
-    def _resolve_relative_import(self, current_module_path: str, import_name: str, level: int, is_package: bool = False) -> Optional[str]:
+        if level <= 0:
+            # Absolute imports are a single module_map lookup. Memoizing them per
+            # source module would only fill the cache with duplicate entries,
+            # mostly None for the same third-party packages
+            return self._resolve_absolute(import_name)
+
+        if self._cache_version != self.index.maps_version:
+            self.clear_cache()
+
+        key = (current_module_path, import_name, level, is_package)
+        if key in self._resolve_cache:
+            return self._resolve_cache[key]
+
+        # Pass the is_package flag to the relative import handler
+        result = self._resolve_relative(current_module_path, import_name, level, is_package)
+        self._resolve_cache[key] = result
+        return result
+
+    def resolve_imports_bulk(self, current_module_path: str, specs: List[Tuple[str, int]],
+                             is_package: bool = False) -> List[Optional[str]]:
         """
-        Resolve relative import by navigating up the module hierarchy.
+        Resolve all imports of one source module in a single call.
+
+        Parent packages are derived once per strip level and shared by every
+        relative import of the module, instead of once per import.
+
+        Args:
+            current_module_path: Dotted module path of the importing file
+            specs: (import_name, level) pairs, as passed to resolve_import
+            is_package: Boolean indicating if the source file is an __init__.py (package root).
+
+        Returns:
+            Target file IDs in spec order (None for unresolved or third-party imports)
         """
+        module_map = self._module_map
+        parent_paths: Dict[int, Optional[str]] = {}  # strip_count -> parent path
+        results = []
+
+        for import_name, level in specs:
+            if level <= 0:
+                results.append(module_map.get(import_name) if import_name else None)
+                continue
 
-        # Split current module path into components
-        current_parts = current_module_path.split('.')
+            strip_count = self._strip_count(level, is_package)
+            if strip_count not in parent_paths:
+                parent_paths[strip_count] = self._parent_path(current_module_path, strip_count)
 
-        # Determine how many levels to strip
+            results.append(self._lookup_relative(parent_paths[strip_count], import_name))
+
+        return results
+
+    @staticmethod
+    def _strip_count(level: int, is_package: bool) -> int:
+        """Number of trailing module path components a relative import strips."""
         if is_package:
             # If we are in __init__.py:
             # level=1 (from .) means "current package" -> strip 0
             # level=2 (from ..) means "parent package" -> strip 1
-            strip_count = level - 1
-        else:
-            # If we are in a regular .py file:
-            # level=1 (from .) means "parent package" -> strip 1
-            strip_count = level
+            return level - 1
+        # If we are in a regular .py file:
+        # level=1 (from .) means "parent package" -> strip 1
+        return level
 
-        # Check bounds
-        if strip_count > len(current_parts):
+    def _parent_path(self, current_module_path: str, strip_count: int) -> Optional[str]:
+        """
+        Strip trailing components from a module path.
+
+        Returns '' when every component is stripped and None when more
+        components are stripped than the path has.
+        """
+        if strip_count == 0:
+            # "from . import x" inside a package __init__: the package is the
+            # current module itself (an unknown, empty module has no package)
+            return current_module_path or None
+
+        parent_of = self._parent_of
+        if current_module_path in parent_of:
+            # Walk the precomputed parent table: one dict lookup per level
+            parent_path = current_module_path
+            for _ in range(strip_count):
+                # Check bounds: nothing is left above the top-level package
+                if not parent_path:
+                    return None
+                parent_path = parent_of[parent_path]
+            return parent_path
+
+        if strip_count == 1:
+            # Module not in the index, most common level ("from . import x" in a
+            # module): rpartition drops the last component in one scan, and gives
+            # '' for a top-level module
+            return current_module_path.rpartition('.')[0]
+
+        # Module not in the index; derive the parent from the path string
+        # Check bounds (count scans the path without building a list)
+        depth = current_module_path.count('.') + 1
+        if strip_count > depth:
             return None
 
-        # Perform the strip
-        if strip_count > 0:
-            parent_parts = current_parts[:-strip_count]
-        else:
-            parent_parts = current_parts
+        # Perform the strip; rsplit stops after the last strip_count dots, so
+        # the parent path is its first element and nothing needs rejoining
+        if strip_count == depth:
+            return ''
+        return current_module_path.rsplit('.', strip_count)[0]
 
+    def _lookup_relative(self, parent_path: Optional[str], import_name: str) -> Optional[str]:
+        """Look up import_name relative to a parent path from _parent_path."""
+        if parent_path is None:
+            return None
 
         # Build target module path
         if import_name:
-            target_parts = parent_parts + [import_name]
-            target_module_path = '.'.join(target_parts)
+            target_module_path = f"{parent_path}.{import_name}" if parent_path else import_name
         else:
-            target_module_path = '.'.join(parent_parts) if parent_parts else None
+            target_module_path = parent_path or None
 
-        # Lookup in module_map
-        if target_module_path and target_module_path in self.index.module_map:
-            result = self.index.module_map[target_module_path]
-            return result
+        # Lookup in module_map (None on a miss)
+        return self._module_map.get(target_module_path) if target_module_path else None
 
-        return None
+    def _resolve_relative_import(self, current_module_path: str, import_name: str, level: int, is_package: bool = False) -> Optional[str]:
+        """
+        Resolve relative import by navigating up the module hierarchy.
+        """
+        parent_path = self._parent_path(current_module_path, self._strip_count(level, is_package))
+        return self._lookup_relative(parent_path, import_name)
 
     def _resolve_absolute_import(self, import_name: str) -> Optional[str]:
         """
@@ -92,9 +187,5 @@ class ModuleResolver:
         if not import_name:
             return None
 
-        # Direct lookup in module_map
-        if import_name in self.index.module_map:
-            return self.index.module_map[import_name]
-
-        # If not found, this is likely a third-party library
-        return None
\ No newline at end of file
+        # Direct lookup in module_map; a miss is likely a third-party library
+        return self._module_map.get(import_name)
\ No newline at end of file
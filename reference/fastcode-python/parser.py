@@ -3,10 +3,21 @@ Code Parser - AST-based code parsing for multiple languages
 """
 
 import ast
+import hashlib
+import importlib.util
+import inspect
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-import libcst as cst
+import multiprocessing
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, replace
 
 from .utils import (
     get_language_from_extension,
@@ -16,7 +27,324 @@ from .utils import (
 )
 
 
-@dataclass
+# Duplicate 'as' clause in except statements: except SomeException as var as var:
+_EXCEPT_DUPLICATE_AS_RE = re.compile(r'except\s+(\w+)\s+as\s+(\w+)\s+as\s+\2\s*:')
+
+# AST node types that each add one decision point to cyclomatic complexity
+# (matched on exact type; the ast node classes are never subclassed)
+_PYTHON_BRANCH_NODE_TYPES = frozenset({
+    ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.And, ast.Or,
+})
+
+# Fields holding nested statements, in the order ast.iter_child_nodes yields
+# them for every node type that has them (Try: body, handlers, orelse,
+# finalbody; Match: cases). Imports are statements, so they are only ever
+# found by following these fields.
+_PYTHON_STATEMENT_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+
+# How _parse_python treats each statement type found while collecting definitions
+_PYTHON_CLASS, _PYTHON_FUNCTION, _PYTHON_BLOCK = 0, 1, 2
+_PYTHON_STATEMENT_KINDS = {
+    ast.ClassDef: _PYTHON_CLASS,
+    ast.FunctionDef: _PYTHON_FUNCTION,
+    ast.AsyncFunctionDef: _PYTHON_FUNCTION,
+    # Blocks whose bodies may hide definitions (e.g. try/except ImportError)
+    ast.If: _PYTHON_BLOCK,
+    ast.Try: _PYTHON_BLOCK,
+    ast.With: _PYTHON_BLOCK,
+    ast.AsyncWith: _PYTHON_BLOCK,
+    ast.For: _PYTHON_BLOCK,
+    ast.While: _PYTHON_BLOCK,
+}
+
+# Compiled tree-sitter queries keyed on (language name, query name); None
+# marks a query that does not compile for that grammar
+_TS_QUERY_CACHE: Dict[Tuple[str, str], Any] = {}
+
+
+def _collect_ts_nodes(root_node, node_types, descend_into_matches: bool = False) -> List[Any]:
+    """
+    Collect tree-sitter nodes of the given types in source order
+
+    Walks with an explicit stack (children pushed in reverse so they pop in
+    pre-order) instead of recursing through a Python frame per node.
+
+    Args:
+        root_node: Node to search (included)
+        node_types: Container of the node types to collect (a dict keyed on
+            type is fine)
+        descend_into_matches: Also search inside collected nodes; otherwise
+            only the outermost matches are returned
+
+    Returns:
+        Matching nodes in pre-order
+    """
+    found = []
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+        if node.type in node_types:
+            found.append(node)
+            if not descend_into_matches:
+                continue
+        stack.extend(reversed(node.children))
+    return found
+
+
+def _js_is_async(node) -> bool:
+    """
+    Whether a JavaScript/TypeScript function, arrow function or method is async
+
+    The anonymous 'async' keyword comes before the name and parameters, after
+    any decorators and modifiers ('static', 'public', 'override', ...), so
+    only the tokens ahead of those are checked.
+    """
+    head = (node.child_by_field_name('name') or node.child_by_field_name('parameters')
+            or node.child_by_field_name('parameter'))
+    end = head.start_byte if head is not None else node.end_byte
+    for child in node.children:
+        if child.start_byte >= end:
+            break
+        if child.type == 'async':
+            return True
+    return False
+
+
+def _node_types_query_source(node_types: Tuple[str, ...], language) -> str:
+    """Query source capturing every node of the given types"""
+    # Grammars differ (e.g. C has no 'class_specifier', and 'function' became
+    # 'function_expression'), and a query naming an unknown type fails to compile
+    kinds = [kind for kind in node_types if language.id_for_node_kind(kind, True)]
+    return "[" + " ".join(f"({kind})" for kind in kinds) + "] @node"
+
+
+def _outermost_ts_nodes(nodes: List[Any]) -> List[Any]:
+    """Drop nodes nested in an earlier one from a document-order node list"""
+    # Nodes come outer-first in document order, so anything starting before
+    # the last kept node ends is nested in it
+    outermost = []
+    last_end = -1
+    for node in nodes:
+        if node.start_byte < last_end:
+            continue
+        outermost.append(node)
+        last_end = node.end_byte
+    return outermost
+
+
+# Comment opener -> (start, end) slice of the comment body. Openers with an end
+# slice only match comments closed by '*/'; three-character openers win over
+# their two-character prefix.
+_LEADING_COMMENT_MARKERS = {'//': (2, None), '/*': (2, -2)}
+_JSDOC_MARKERS = {'/**': (3, -2), '/*': (2, -2), '//': (2, None)}
+_DOXYGEN_MARKERS = {'/**': (3, -2), '/*': (2, -2), '///': (3, None), '//': (2, None)}
+_RUST_MODULE_DOC_MARKERS = {'//!': (3, None), '///': (3, None), '/*': (2, -2)}
+_RUST_DOC_MARKERS = {'///': (3, None), '//!': (3, None), '/*': (2, -2), '//': (2, None)}
+_CSHARP_DOC_MARKERS = {'///': (3, None), '//': (2, None), '/*': (2, -2)}
+
+
+def _strip_comment_markers(comment_text: str, markers: Dict[str, Tuple[int, Optional[int]]]) -> Optional[str]:
+    """
+    Strip the markers of a C-style comment with one table lookup
+
+    Args:
+        comment_text: Comment source text
+        markers: One of the *_MARKERS tables above
+
+    Returns:
+        The stripped comment body, or None if no opener in the table matches
+    """
+    spec = markers.get(comment_text[:3]) or markers.get(comment_text[:2])
+    if spec is None:
+        return None
+    start, end = spec
+    if end is not None and not comment_text.endswith('*/'):
+        return None
+    return comment_text[start:end].strip()
+
+
+# Files at least this large have their line statistics computed by the numba
+# kernel below, when numba is installed
+_LINE_STATS_JIT_MIN_CHARS = 64 * 1024
+
+# Comment prefixes of the C-style languages (after leading whitespace)
+_C_STYLE_COMMENT_PREFIXES = ("//", "/*", "*")
+
+# numba-compiled _scan_line_stats; None until first needed, False without numba
+_line_stats_kernel: Any = None
+
+
+def _scan_line_stats(buf, c_style: bool) -> Tuple[int, int]:
+    """
+    Count (code, comment) lines in ASCII source bytes
+
+    Same rules as the str-based counting in _line_stats: lines are split on
+    '\n', leading bytes that str.strip() treats as whitespace are skipped, and
+    a line is a comment if what follows starts with '#' (or //, /*, * when
+    c_style). Written for numba's nopython mode.
+    """
+    code = 0
+    comment = 0
+    n = len(buf)
+    i = 0
+    while i < n:
+        # Skip leading whitespace: \t \v \f \r, \x1c-\x1f and space (not \n)
+        while i < n and buf[i] != 10 and (9 <= buf[i] <= 13 or 28 <= buf[i] <= 32):
+            i += 1
+        if i < n and buf[i] != 10:
+            first = buf[i]
+            if c_style:
+                is_comment = first == 42 or (first == 47 and i + 1 < n and (buf[i + 1] == 47 or buf[i + 1] == 42))
+            else:
+                is_comment = first == 35
+            if is_comment:
+                comment += 1
+            else:
+                code += 1
+        # Move past the end of the line
+        while i < n and buf[i] != 10:
+            i += 1
+        i += 1
+    return code, comment
+
+
+def _get_line_stats_kernel():
+    """Compile _scan_line_stats with numba on first use; None without numba"""
+    global _line_stats_kernel
+    if _line_stats_kernel is None:
+        _line_stats_kernel = False
+        if importlib.util.find_spec("numba") is not None:
+            try:
+                import numba
+                _line_stats_kernel = numba.njit(cache=True)(_scan_line_stats)
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"numba line counter unavailable: {e}")
+    return _line_stats_kernel or None
+
+
+def _line_stats(content: str, c_style: bool = False) -> Tuple[int, int, int]:
+    """
+    Count total, code and comment lines
+    
+    Args:
+        content: File content
+        c_style: Treat //, /* and * as comment markers instead of #
+    
+    Returns:
+        Tuple of (total_lines, code_lines, comment_lines)
+    """
+    total_lines = content.count("\n") + 1
+    
+    # Non-ASCII text may hold whitespace (e.g. U+00A0) that a byte scan would
+    # not recognize, so only ASCII files take the compiled path
+    if len(content) >= _LINE_STATS_JIT_MIN_CHARS and content.isascii():
+        kernel = _get_line_stats_kernel()
+        if kernel is not None:
+            import numpy as np
+            code_lines, comment_lines = kernel(np.frombuffer(content.encode("ascii"), dtype=np.uint8), c_style)
+            return total_lines, int(code_lines), int(comment_lines)
+    
+    # Single pass, one lstrip per line
+    code_lines = 0
+    comment_lines = 0
+    if c_style:
+        for line in content.split("\n"):
+            stripped = line.lstrip()
+            if not stripped:
+                continue
+            if stripped.startswith(_C_STYLE_COMMENT_PREFIXES):
+                comment_lines += 1
+            else:
+                code_lines += 1
+    else:
+        for line in content.split("\n"):
+            stripped = line.lstrip()
+            if not stripped:
+                continue
+            if stripped[0] == "#":
+                comment_lines += 1
+            else:
+                code_lines += 1
+    return total_lines, code_lines, comment_lines
+
+
+def _python_docstring(node: ast.AST) -> Optional[str]:
+    """
+    Equivalent of ast.get_docstring(node) with the type checks inlined
+
+    The text is still cleaned with inspect.cleandoc like get_docstring does:
+    clean_docstring alone would keep continuation lines indented, because the
+    unindented first line sets its common margin to zero.
+    """
+    body = node.body
+    if not body:
+        return None
+    first = body[0]
+    if type(first) is not ast.Expr:
+        return None
+    value = first.value
+    if type(value) is not ast.Constant or type(value.value) is not str:
+        return None
+    text = value.value
+    if "\n" not in text:
+        # inspect.cleandoc of a single line
+        return text.expandtabs().lstrip()
+    return inspect.cleandoc(text)
+
+
+def _python_decorator_names(decorator_list: List[ast.expr]) -> List[str]:
+    """Names of plain (@name) and called (@name(...)) decorators"""
+    decorators = []
+    for dec in decorator_list:
+        dec_type = type(dec)
+        if dec_type is ast.Name:
+            decorators.append(dec.id)
+        elif dec_type is ast.Call and type(dec.func) is ast.Name:
+            decorators.append(dec.func.id)
+    return decorators
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Render a Name or a chain of Attributes on a Name (a.b.c), else None"""
+    parts = []
+    while type(node) is ast.Attribute:
+        parts.append(node.attr)
+        node = node.value
+    if type(node) is not ast.Name:
+        return None
+    parts.append(node.id)
+    parts.reverse()
+    return ".".join(parts)
+
+
+def _annotation_to_str(node: ast.AST) -> str:
+    """
+    Render a type annotation as source text
+
+    Plain names (int), dotted names (np.ndarray) and simple string forward
+    references are rendered directly; anything else goes through ast.unparse,
+    which builds a whole unparser per call.
+    """
+    node_type = type(node)
+    if node_type is ast.Name:
+        return node.id
+    
+    if node_type is ast.Attribute:
+        dotted = _dotted_name(node)
+        if dotted is not None:
+            return dotted
+    
+    elif node_type is ast.Constant:
+        value = node.value
+        # repr() matches ast.unparse unless quote choice or escaping comes into play
+        if (type(value) is str and "'" not in value and '"' not in value
+                and "\\" not in value and value.isprintable()):
+            return repr(value)
+    
+    return ast.unparse(node)
+
+
+@dataclass(slots=True)
 class FunctionInfo:
     """Function/method information"""
     name: str
@@ -32,10 +360,23 @@ class FunctionInfo:
     complexity: int
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Built by hand: asdict() deep-copies every field recursively
+        return {
+            "name": self.name,
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "docstring": self.docstring,
+            "parameters": list(self.parameters),
+            "return_type": self.return_type,
+            "is_async": self.is_async,
+            "is_method": self.is_method,
+            "class_name": self.class_name,
+            "decorators": list(self.decorators),
+            "complexity": self.complexity,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     """Class information"""
     name: str
@@ -47,10 +388,18 @@ class ClassInfo:
     decorators: List[str]
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "name": self.name,
+            "start_line": self.start_line,
+            "end_line": self.end_line,
+            "docstring": self.docstring,
+            "bases": list(self.bases),
+            "methods": [m.to_dict() for m in self.methods],
+            "decorators": list(self.decorators),
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportInfo:
     """Import statement information"""
     module: str
@@ -60,10 +409,16 @@ class ImportInfo:
     level: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "module": self.module,
+            "names": list(self.names),
+            "is_from": self.is_from,
+            "line": self.line,
+            "level": self.level,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class FileParseResult:
     """Result of parsing a file"""
     file_path: str
@@ -90,6 +445,63 @@ class FileParseResult:
         }
 
 
+def _intern_function_strings(func: FunctionInfo):
+    intern = sys.intern
+    func.name = intern(func.name)
+    func.parameters = [intern(param) for param in func.parameters]
+    func.decorators = [intern(decorator) for decorator in func.decorators]
+    if func.return_type is not None:
+        func.return_type = intern(func.return_type)
+    if func.class_name is not None:
+        func.class_name = intern(func.class_name)
+
+
+def _intern_parse_result(result: FileParseResult) -> FileParseResult:
+    """
+    Intern the strings that repeat across parse results, in place
+
+    Parameters ("self", "ctx: Context"), decorators, bases, return types,
+    imported modules and definition names ("__init__", "new", "Dispose")
+    recur across thousands of definitions. AST identifiers
+    are interned by CPython already, but tree-sitter text and results
+    unpickled from parse workers are separate copies.
+    """
+    intern = sys.intern
+    result.language = intern(result.language)
+    for imp in result.imports:
+        imp.module = intern(imp.module)
+        imp.names = [intern(name) for name in imp.names]
+    for func in result.functions:
+        _intern_function_strings(func)
+    for cls in result.classes:
+        cls.name = intern(cls.name)
+        cls.bases = [intern(base) for base in cls.bases]
+        cls.decorators = [intern(decorator) for decorator in cls.decorators]
+        for method in cls.methods:
+            _intern_function_strings(method)
+    return result
+
+
+# Marks a parse cache miss (None is a valid cached result)
+_CACHE_MISS = object()
+
+# Parser owned by each parse_files() worker process
+_WORKER_PARSER: Optional["CodeParser"] = None
+
+
+def _init_parse_worker(config: Dict[str, Any]):
+    """Create the worker's parser; it parses serially and does not cache"""
+    global _WORKER_PARSER
+    worker_config = dict(config)
+    worker_config["parser"] = {**config.get("parser", {}), "parse_workers": 1, "parse_cache_size": 0}
+    _WORKER_PARSER = CodeParser(worker_config)
+
+
+def _parse_in_worker(item: Tuple[str, str]) -> Optional["FileParseResult"]:
+    file_path, content = item
+    return _WORKER_PARSER.parse_file(file_path, content)
+
+
 class CodeParser:
     """Parse code files and extract structured information"""
     
@@ -104,6 +516,75 @@ class CodeParser:
         self.compute_complexity = self.parser_config.get("compute_complexity", True)
         self.max_function_lines = self.parser_config.get("max_function_lines", 1000)
         
+        # LRU cache of parse results keyed on (language, content digest), so
+        # unchanged files are not re-parsed on repeated indexing runs
+        self.parse_cache_size = self.parser_config.get("parse_cache_size", 10000)
+        self._parse_cache: "OrderedDict[Tuple[str, bytes], Optional[FileParseResult]]" = OrderedDict()
+        
+        # Worker processes used by parse_files (1 parses in-process, 0 uses
+        # every CPU); the pool is started on first use and then reused
+        parse_workers = self.parser_config.get("parse_workers", 1)
+        self.parse_workers = parse_workers if parse_workers and parse_workers > 0 else (os.cpu_count() or 1)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        
+        # TSParser per tree-sitter language, reused across files; kept per
+        # thread since a tree-sitter parser must not parse two files at once
+        self._ts_parsers = threading.local()
+        
+        # Language -> parser taking (file_path, content); anything else goes
+        # to _parse_generic
+        self._language_parsers: Dict[str, Callable[[str, str], Optional[FileParseResult]]] = {
+            "python": self._parse_python,
+            "javascript": partial(self._parse_javascript, language="javascript"),
+            "typescript": partial(self._parse_typescript, language="typescript"),
+            "c": partial(self._parse_c_cpp, language="c"),
+            "cpp": partial(self._parse_c_cpp, language="cpp"),
+            "rust": self._parse_rust,
+            "csharp": self._parse_csharp,
+        }
+        
+        # Per tree-sitter language: definition node type -> (extractor taking
+        # (node, content, code_bytes), whether it yields a ClassInfo). Only the
+        # outermost definitions are dispatched; the class extractors collect
+        # their own members, so no enclosing class is passed along.
+        self._definition_handlers: Dict[str, Dict[str, Tuple[Callable, bool]]] = {
+            "javascript": {
+                "class_declaration": (self._extract_js_class, True),
+                "function_declaration": (self._extract_js_function, False),
+                "arrow_function": (self._extract_js_function, False),
+                "function": (self._extract_js_function, False),
+                # Methods of class expressions
+                "method_definition": (partial(self._extract_js_method, class_name=None), False),
+            },
+            "typescript": {
+                "class_declaration": (self._extract_ts_class, True),
+                "interface_declaration": (self._extract_ts_class, True),
+                "function_declaration": (self._extract_js_function, False),
+                "arrow_function": (self._extract_js_function, False),
+                "function": (self._extract_js_function, False),
+                "method_definition": (partial(self._extract_js_method, class_name=None), False),
+                "method_signature": (partial(self._extract_js_method, class_name=None), False),
+            },
+            "rust": {
+                "struct_item": (self._extract_rust_type, True),
+                "trait_item": (self._extract_rust_type, True),
+                "impl_item": (self._extract_rust_type, True),
+                "function_item": (self._extract_rust_function, False),
+            },
+            "csharp": {
+                "class_declaration": (self._extract_csharp_class, True),
+                "interface_declaration": (self._extract_csharp_class, True),
+                "struct_declaration": (self._extract_csharp_class, True),
+                "method_declaration": (self._extract_csharp_method, False),
+            },
+        }
+        for c_language in ("c", "cpp"):
+            self._definition_handlers[c_language] = {
+                "class_specifier": (partial(self._extract_c_class, language=c_language), True),
+                "struct_specifier": (partial(self._extract_c_class, language=c_language), True),
+                "function_definition": (self._extract_c_function, False),
+            }
+        
         # self._skipped_node_log_count = 0
     
     def parse_file(self, file_path: str, content: str) -> Optional[FileParseResult]:
@@ -120,22 +601,152 @@ class CodeParser:
         ext = get_file_extension(file_path)
         language = get_language_from_extension(ext)
 
-        # Route to appropriate parser
-        if language == "python":
-            return self._parse_python(file_path, content)
-        elif language == "javascript":
-            return self._parse_javascript(file_path, content, language)
-        elif language == "typescript":
-            return self._parse_typescript(file_path, content, language)
-        elif language in ["c", "cpp"]:
-            return self._parse_c_cpp(file_path, content, language)
-        elif language == "rust":
-            return self._parse_rust(file_path, content)
-        elif language == "csharp":
-            return self._parse_csharp(file_path, content)
-        else:
+        if self.parse_cache_size <= 0:
+            return self._parse_content(file_path, content, language)
+        
+        key = self._parse_cache_key(language, content)
+        cached = self._get_cached_parse(key, file_path)
+        if cached is not _CACHE_MISS:
+            return cached
+        
+        result = self._parse_content(file_path, content, language)
+        self._store_parse(key, result)
+        return result
+    
+    def parse_files(self, items: List[Tuple[str, str]]) -> List[Optional[FileParseResult]]:
+        """
+        Parse several code files, in worker processes when parse_workers > 1
+        
+        Args:
+            items: (file_path, content) pairs
+        
+        Returns:
+            FileParseResult (or None if parsing failed) for each item, in order
+        """
+        if self.parse_workers <= 1 or len(items) < 2:
+            return [self.parse_file(file_path, content) for file_path, content in items]
+        
+        results: List[Optional[FileParseResult]] = [None] * len(items)
+        # (index, cache key, file_path, content) of files not in the cache
+        misses = []
+        for index, (file_path, content) in enumerate(items):
+            key = None
+            if self.parse_cache_size > 0:
+                language = get_language_from_extension(get_file_extension(file_path))
+                key = self._parse_cache_key(language, content)
+                cached = self._get_cached_parse(key, file_path)
+                if cached is not _CACHE_MISS:
+                    results[index] = cached
+                    continue
+            misses.append((index, key, file_path, content))
+        
+        if not misses:
+            return results
+        
+        work = [(file_path, content) for _, _, file_path, content in misses]
+        try:
+            parsed = list(self._get_parse_pool().map(_parse_in_worker, work, chunksize=16))
+        except BrokenProcessPool as e:
+            self.logger.warning(f"Parse worker pool failed, parsing in-process instead: {e}")
+            self.shutdown_workers()
+            parsed = [self.parse_file(file_path, content) for file_path, content in work]
+        
+        for (index, key, _, _), result in zip(misses, parsed):
+            # Unpickled results carry their own copy of every string
+            if result is not None:
+                _intern_parse_result(result)
+            results[index] = result
+            if key is not None:
+                self._store_parse(key, result)
+        return results
+    
+    def shutdown_workers(self):
+        """Stop the parse_files worker processes, if any were started"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+    
+    def clear_parse_cache(self):
+        """Drop all cached parse results"""
+        self._parse_cache.clear()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The worker pool cannot be pickled and the cache is not worth copying
+        state = self.__dict__.copy()
+        state["_parse_pool"] = None
+        state["_parse_cache"] = OrderedDict()
+        state["_ts_parsers"] = None
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._ts_parsers = threading.local()
+    
+    def _get_ts_parser(self, language: str):
+        """
+        Return this thread's TSParser for a tree-sitter language
+        
+        Loading the grammar and allocating parser state is done once per
+        language and thread instead of once per file.
+        
+        Args:
+            language: tree-sitter language name ('javascript', 'tsx', 'cpp', ...)
+        
+        Returns:
+            TSParser for the language
+        """
+        parsers = getattr(self._ts_parsers, "parsers", None)
+        if parsers is None:
+            parsers = self._ts_parsers.parsers = {}
+        ts_parser = parsers.get(language)
+        if ts_parser is None:
+            from .tree_sitter_parser import TSParser
+            ts_parser = parsers[language] = TSParser(language=language)
+        return ts_parser
+    
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Start the parse_files worker pool on first use"""
+        if self._parse_pool is None:
+            # spawn rather than fork: the process already runs background threads
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_parse_worker,
+                initargs=(self.config,),
+            )
+        return self._parse_pool
+    
+    @staticmethod
+    def _parse_cache_key(language: str, content: str) -> Tuple[str, bytes]:
+        # The parsers only depend on the language and the content; the path
+        # is just recorded on the result
+        return (language, hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+    
+    def _get_cached_parse(self, key: Tuple[str, bytes], file_path: str) -> Any:
+        """Return the cached result for key re-labelled with file_path, or _CACHE_MISS"""
+        cache = self._parse_cache
+        if key not in cache:
+            return _CACHE_MISS
+        cache.move_to_end(key)
+        cached = cache[key]
+        if cached is None or cached.file_path == file_path:
+            return cached
+        return replace(cached, file_path=file_path)
+    
+    def _store_parse(self, key: Tuple[str, bytes], result: Optional[FileParseResult]):
+        cache = self._parse_cache
+        cache[key] = result
+        if len(cache) > self.parse_cache_size:
+            cache.popitem(last=False)
+    
+    def _parse_content(self, file_path: str, content: str, language: str) -> Optional[FileParseResult]:
+        """Route content to the parser for its language"""
+        parse = self._language_parsers.get(language)
+        if parse is None:
             # For unsupported languages, return basic info
             return self._parse_generic(file_path, content, language)
+        result = parse(file_path, content)
+        return _intern_parse_result(result) if result is not None else None
     
     def _fix_common_syntax_errors(self, content: str) -> str:
         """
@@ -150,15 +761,10 @@ class CodeParser:
         Returns:
             Content with common syntax errors fixed
         """
-        import re
-        
-        # Fix duplicate 'as' clause in except statements
-        # Pattern: except SomeException as var as var:
-        content = re.sub(
-            r'except\s+(\w+)\s+as\s+(\w+)\s+as\s+\2\s*:',
-            r'except \1 as \2:',
-            content
-        )
+        # Fix duplicate 'as' clause in except statements; files without any
+        # 'except' cannot match, so skip the regex scan for them
+        if "except" in content:
+            content = _EXCEPT_DUPLICATE_AS_RE.sub(r'except \1 as \2:', content)
         
         return content
     
@@ -175,22 +781,26 @@ class CodeParser:
         Returns:
             Content with markdown fences removed
         """
-        lines = content.split('\n')
+        # Work on slices instead of splitting the whole file into lines: only
+        # the first line and the trailing lines are ever inspected
         
         # Check if first line is a markdown code fence (e.g., ```python, ```javascript)
-        if lines and lines[0].strip().startswith('```'):
-            lines = lines[1:]
+        first_end = content.find('\n')
+        first_line = content if first_end == -1 else content[:first_end]
+        if first_line.strip().startswith('```'):
+            content = '' if first_end == -1 else content[first_end + 1:]
         
         # Remove trailing lines that are markdown fences or empty
         # Work backwards from the end to handle cases where ``` is not the last line
-        while lines:
-            last_line = lines[-1].strip()
+        while content:
+            last_start = content.rfind('\n') + 1
+            last_line = content[last_start:].strip()
             if last_line == '```' or last_line == '':
-                lines = lines[:-1]
+                content = content[:last_start - 1] if last_start else ''
             else:
                 break
         
-        return '\n'.join(lines)
+        return content
 
     
     def _parse_python(self, file_path: str, content: str) -> Optional[FileParseResult]:
@@ -213,11 +823,12 @@ class CodeParser:
         classes = []
         functions = []
         imports = []
-        module_docstring = ast.get_docstring(tree)
+        module_docstring = _python_docstring(tree)
         
-        # Extract imports
-        if self.extract_imports:
-            imports = self._extract_python_imports(tree)
+        # Imports and per-function complexity come from one traversal of the tree
+        complexities = None
+        if self.extract_imports or self.compute_complexity:
+            imports, complexities = self._scan_python_tree(tree)
         
         # Extract classes and functions
         # for node in tree.body:
@@ -268,18 +879,23 @@ class CodeParser:
             but capturing Function/Class definitions.
             """
             for node in node_list:
+                # One exact-type dict lookup instead of a chain of isinstance checks
+                kind = _PYTHON_STATEMENT_KINDS.get(type(node))
+                if kind is None:
+                    continue
+                
                 # 1. Capture Class Definitions
-                if isinstance(node, ast.ClassDef):
-                    class_info = self._extract_python_class(node)
+                if kind == _PYTHON_CLASS:
+                    class_info = self._extract_python_class(node, complexities)
                     if class_info:
                         classes.append(class_info)
                     # We do NOT drill into classes here because _extract_python_class 
                     # already handles its internal methods.
                 
                 # 2. Capture Function Definitions
-                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                elif kind == _PYTHON_FUNCTION:
                     # Option: Pass 'parent_scope' if you want to track nesting
-                    func_info = self._extract_python_function(node)
+                    func_info = self._extract_python_function(node, complexities=complexities)
                     if func_info:
                         functions.append(func_info)
                     # We do NOT drill into functions (avoiding nested functions)
@@ -287,7 +903,7 @@ class CodeParser:
                     # Current logic: Top-level definitions only (including those in If/Try).
                 
                 # 3. Smart Drill-down (The Fix for compatibility.py)
-                elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith, ast.For, ast.While)):
+                else:
                     # Drill down into the body of these blocks
                     _visit_nodes(node.body, parent_scope)
                     
@@ -304,10 +920,7 @@ class CodeParser:
         # ------------------------------------------
 
         # Count lines
-        lines = content.split("\n")
-        total_lines = len(lines)
-        code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith("#"))
-        comment_lines = sum(1 for line in lines if line.strip().startswith("#"))
+        total_lines, code_lines, comment_lines = _line_stats(content)
         
         return FileParseResult(
             file_path=file_path,
@@ -321,46 +934,118 @@ class CodeParser:
             comment_lines=comment_lines,
         )
     
-    def _extract_python_imports(self, tree: ast.AST) -> List[ImportInfo]:
-        """Extract import statements from Python AST"""
-        imports = []
+    def _scan_python_tree(self, tree: ast.AST) -> Tuple[List[ImportInfo], Dict[ast.AST, int]]:
+        """
+        Collect imports and function complexities in a single traversal
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(ImportInfo(
-                        module=alias.name,
-                        names=[alias.asname if alias.asname else alias.name],
-                        is_from=False,
-                        level=0,  # ast.Import always uses absolute imports
-                        line=node.lineno,
-                    ))
+        Replaces separate ast.walk passes for imports and for every function's
+        complexity. The tree is visited breadth-first like ast.walk, so imports
+        keep the same order; each node's decision-point count is then folded
+        into its parent in reverse order, which gives every function the count
+        of its whole subtree.
 
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                names = [alias.name for alias in node.names]
+        Returns:
+            Tuple of (imports, {function node: cyclomatic complexity})
+        """
+        collect_imports = self.extract_imports
+        collect_complexity = self.compute_complexity
+        if not collect_complexity:
+            return self._scan_python_imports(tree), {}
+        
+        iter_child_nodes = ast.iter_child_nodes
+        
+        imports = []
+        nodes = [tree]
+        parents = [-1]  # Index in `nodes` of each node's parent
+        function_indices = []
+        
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            node_type = type(node)
+            
+            if node_type is ast.Import or node_type is ast.ImportFrom:
+                if collect_imports:
+                    self._append_python_imports(node, imports)
+            elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                function_indices.append(i)
+            
+            for child in iter_child_nodes(node):
+                nodes.append(child)
+                parents.append(i)
+            i += 1
+        
+        complexities = {}
+        if collect_complexity and function_indices:
+            counts = [1 if type(node) in _PYTHON_BRANCH_NODE_TYPES else 0 for node in nodes]
+            for j in range(len(nodes) - 1, 0, -1):
+                if counts[j]:
+                    counts[parents[j]] += counts[j]
+            for j in function_indices:
+                complexities[nodes[j]] = 1 + counts[j]
+        
+        return imports, complexities
+    
+    def _scan_python_imports(self, tree: ast.AST) -> List[ImportInfo]:
+        """
+        Collect imports by walking statement lists only
+        
+        Used when complexity is not needed: expressions can never contain
+        imports, so they are skipped. Statements are visited breadth-first in
+        the same relative order as ast.walk, keeping the import order.
+        """
+        imports = []
+        nodes = [tree]
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            node_type = type(node)
+            if node_type is ast.Import or node_type is ast.ImportFrom:
+                self._append_python_imports(node, imports)
+            else:
+                for field in _PYTHON_STATEMENT_FIELDS:
+                    children = getattr(node, field, None)
+                    if children:
+                        nodes.extend(children)
+            i += 1
+        return imports
+    
+    def _append_python_imports(self, node: ast.AST, imports: List[ImportInfo]):
+        """Append the ImportInfo entries of an Import/ImportFrom node"""
+        if type(node) is ast.Import:
+            for alias in node.names:
                 imports.append(ImportInfo(
-                    module=module,
-                    names=names,
-                    is_from=True,
-                    level=node.level,  # Key fix: capture relative import level
+                    module=alias.name,
+                    names=[alias.asname if alias.asname else alias.name],
+                    is_from=False,
+                    level=0,  # ast.Import always uses absolute imports
                     line=node.lineno,
                 ))
-
-        return imports
+        else:
+            imports.append(ImportInfo(
+                module=node.module or "",
+                names=[alias.name for alias in node.names],
+                is_from=True,
+                level=node.level,  # Key fix: capture relative import level
+                line=node.lineno,
+            ))
     
-    def _extract_python_class(self, node: ast.ClassDef) -> Optional[ClassInfo]:
+    def _extract_python_class(self, node: ast.ClassDef,
+                              complexities: Optional[Dict[ast.AST, int]] = None) -> Optional[ClassInfo]:
         """Extract class information from Python AST node"""
         try:
-            docstring = ast.get_docstring(node)
+            docstring = _python_docstring(node)
             
             # Extract base classes
             bases = []
-            for base in node.bases:
-                if isinstance(base, ast.Name):
-                    bases.append(base.id)
-                elif isinstance(base, ast.Attribute):
-                    bases.append(f"{base.value.id}.{base.attr}" if hasattr(base.value, 'id') else base.attr)
+            if node.bases:
+                for base in node.bases:
+                    dotted = _dotted_name(base)
+                    if dotted is not None:
+                        bases.append(dotted)
+                    elif type(base) is ast.Attribute:
+                        # Attribute on a call or subscript, e.g. get_base().Model
+                        bases.append(base.attr)
             
             # Extract methods (FULL INFO)
             methods = []
@@ -368,7 +1053,8 @@ class CodeParser:
                 if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     self.logger.debug(f"[DEBUG PARSER] Found method '{item.name}' in class '{node.name}'")
                     # Use the existing function extractor, passing the class name context
-                    func_info = self._extract_python_function(item, class_name=node.name)
+                    func_info = self._extract_python_function(item, class_name=node.name,
+                                                              complexities=complexities)
                     if func_info:
                         methods.append(func_info)
                     else:
@@ -378,13 +1064,8 @@ class CodeParser:
             if methods:
                 self.logger.debug(f"[DEBUG PARSER] Method type: {type(methods[0])} (Should be FunctionInfo)")
             
-            # Extract decorators
-            decorators = []
-            for dec in node.decorator_list:
-                if isinstance(dec, ast.Name):
-                    decorators.append(dec.id)
-                elif isinstance(dec, ast.Call) and isinstance(dec.func, ast.Name):
-                    decorators.append(dec.func.id)
+            # Extract decorators (most definitions have none)
+            decorators = _python_decorator_names(node.decorator_list) if node.decorator_list else []
             
             return ClassInfo(
                 name=node.name,
@@ -400,7 +1081,8 @@ class CodeParser:
             return None
     
     def _extract_python_function(self, node: ast.FunctionDef, 
-                                  class_name: Optional[str] = None) -> Optional[FunctionInfo]:
+                                  class_name: Optional[str] = None,
+                                  complexities: Optional[Dict[ast.AST, int]] = None) -> Optional[FunctionInfo]:
         """Extract function information from Python AST node"""
         try:
             # Skip if too long
@@ -408,7 +1090,7 @@ class CodeParser:
                 self.logger.debug(f"Skipping long function: {node.name}")
                 return None
             
-            docstring = ast.get_docstring(node)
+            docstring = _python_docstring(node)
             
             # Extract parameters
             parameters = []
@@ -416,29 +1098,27 @@ class CodeParser:
                 param_name = arg.arg
                 if arg.annotation:
                     # Try to get type annotation
-                    param_name += f": {ast.unparse(arg.annotation)}"
+                    param_name += f": {_annotation_to_str(arg.annotation)}"
                 parameters.append(param_name)
             
             # Extract return type
             return_type = None
             if node.returns:
                 try:
-                    return_type = ast.unparse(node.returns)
+                    return_type = _annotation_to_str(node.returns)
                 except Exception:
                     pass
             
-            # Extract decorators
-            decorators = []
-            for dec in node.decorator_list:
-                if isinstance(dec, ast.Name):
-                    decorators.append(dec.id)
-                elif isinstance(dec, ast.Call) and isinstance(dec.func, ast.Name):
-                    decorators.append(dec.func.id)
+            # Extract decorators (most definitions have none)
+            decorators = _python_decorator_names(node.decorator_list) if node.decorator_list else []
             
             # Calculate complexity
             complexity = 1
             if self.compute_complexity:
-                complexity = self._calculate_python_complexity(node)
+                if complexities is not None and node in complexities:
+                    complexity = complexities[node]
+                else:
+                    complexity = self._calculate_python_complexity(node)
             
             return FunctionInfo(
                 name=node.name,
@@ -461,28 +1141,27 @@ class CodeParser:
         """Calculate cyclomatic complexity for Python function"""
         complexity = 1
         
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, (ast.And, ast.Or)):
+        # Explicit-stack traversal with an exact-type set lookup per node,
+        # instead of ast.walk's deque plus a chain of tuple isinstance checks
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if type(current) in _PYTHON_BRANCH_NODE_TYPES:
                 complexity += 1
+            stack.extend(ast.iter_child_nodes(current))
         
         return complexity
     
     def _parse_javascript(self, file_path: str, content: str, language: str) -> Optional[FileParseResult]:
         """Parse JavaScript/TypeScript file using tree-sitter"""
-        from .tree_sitter_parser import TSParser
-        from tree_sitter import Query
-
         # Strip markdown code fences if present
         content = self._strip_markdown_code_fences(content)
 
         try:
-            # Initialize parser for JavaScript
-            ts_parser = TSParser(language='javascript')
-            tree = ts_parser.parse(content)
+            ts_parser = self._get_ts_parser('javascript')
+            # Encode once; the tree and every extractor below share the buffer
+            code_bytes = content.encode('utf-8')
+            tree = ts_parser.parse(code_bytes)
             if not tree:
                 return self._parse_generic(file_path, content, language)
 
@@ -495,22 +1174,19 @@ class CodeParser:
 
             # Extract module-level comment as docstring
             if self.extract_docstrings:
-                module_docstring = self._extract_js_module_docstring(content, root_node)
+                module_docstring = self._extract_js_module_docstring(root_node, code_bytes)
 
             # Extract imports
             if self.extract_imports:
-                imports = self._extract_js_imports(root_node, content)
+                imports = self._extract_js_imports(root_node, code_bytes, ts_parser)
 
             # Extract classes and functions
             self._extract_js_classes_and_functions(
-                root_node, content, classes, functions
+                root_node, content, code_bytes, classes, functions, ts_parser
             )
 
             # Count lines
-            lines = content.split("\n")
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("//", "/*", "*")))
-            comment_lines = sum(1 for line in lines if line.strip().startswith(("//", "/*", "*")))
+            total_lines, code_lines, comment_lines = _line_stats(content, c_style=True)
 
             return FileParseResult(
                 file_path=file_path,
@@ -527,108 +1203,163 @@ class CodeParser:
             self.logger.warning(f"Failed to parse {file_path} with tree-sitter: {e}")
             return self._parse_generic(file_path, content, language)
 
-    def _extract_js_module_docstring(self, content: str, root_node) -> Optional[str]:
+    def _extract_js_module_docstring(self, root_node, code_bytes: bytes) -> Optional[str]:
         """Extract module-level documentation from JavaScript file"""
         # Look for leading comment blocks
-        code_bytes = content.encode('utf-8')
         for child in root_node.children:
             if child.type == 'comment':
                 comment_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
                 # Clean up comment markers
-                if comment_text.startswith('//'):
-                    return comment_text[2:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
-                return comment_text
+                docstring = _strip_comment_markers(comment_text, _LEADING_COMMENT_MARKERS)
+                return comment_text if docstring is None else docstring
         return None
 
-    def _extract_js_imports(self, root_node, content: str) -> List[ImportInfo]:
+    def _run_ts_query(self, ts_parser, name: str, source_builder: Callable[[Any], str],
+                      root_node) -> Optional[List[Any]]:
+        """
+        Run a cached tree-sitter query over a syntax tree
+
+        Queries are compiled once per language and reused across files, so the
+        tree is matched in C instead of being walked node by node in Python.
+
+        Args:
+            ts_parser: TSParser that produced the tree
+            name: Query name, part of the cache key
+            source_builder: Builds the query source for a tree-sitter Language
+            root_node: Node to match under
+
+        Returns:
+            Captured nodes in document order (enclosing nodes first), or None
+            if the query is unavailable so the caller should walk the tree
+        """
+        cache_key = (ts_parser.current_language_name, name)
+        if cache_key in _TS_QUERY_CACHE:
+            query = _TS_QUERY_CACHE[cache_key]
+        else:
+            try:
+                from tree_sitter import Query
+                language = ts_parser.get_language()
+                query = Query(language, source_builder(language))
+            except Exception as e:
+                self.logger.debug(f"tree-sitter query '{name}' unavailable for {cache_key[0]}: {e}")
+                query = None
+            _TS_QUERY_CACHE[cache_key] = query
+        
+        if query is None:
+            return None
+        
+        try:
+            from tree_sitter import QueryCursor
+            captures = QueryCursor(query).captures(root_node)
+        except Exception as e:
+            self.logger.debug(f"tree-sitter query '{name}' failed: {e}")
+            return None
+        
+        # Older bindings return {capture_name: [nodes]}, newer ones (node, name) pairs
+        if isinstance(captures, dict):
+            nodes = [node for group in captures.values() for node in group]
+        else:
+            nodes = [node for node, _ in captures]
+        nodes.sort(key=lambda node: (node.start_byte, -node.end_byte))
+        return nodes
+
+    def _find_ts_nodes(self, ts_parser, name: str, node_types, root_node,
+                       descend_into_matches: bool = False) -> List[Any]:
+        """
+        Find nodes of the given types, through a cached query when possible
+
+        Args:
+            ts_parser: TSParser that produced the tree, or None to walk it
+            name: Query name, part of the cache key
+            node_types: Container of the node types to find
+            root_node: Node to search
+            descend_into_matches: Also return nodes nested in other matches
+
+        Returns:
+            Matching nodes in document order
+        """
+        nodes = None
+        if ts_parser is not None:
+            nodes = self._run_ts_query(ts_parser, name, partial(_node_types_query_source, tuple(node_types)),
+                                       root_node)
+            if nodes is not None and not descend_into_matches:
+                nodes = _outermost_ts_nodes(nodes)
+        if nodes is None:
+            nodes = _collect_ts_nodes(root_node, node_types, descend_into_matches)
+        return nodes
+
+    def _extract_js_imports(self, root_node, code_bytes: bytes, ts_parser=None) -> List[ImportInfo]:
         """Extract import statements from JavaScript AST"""
         imports = []
-        code_bytes = content.encode('utf-8')
 
-        def visit_node(node):
-            if node.type == 'import_statement':
-                # Extract import information
-                module_node = None
-                names = []
-
-                for child in node.children:
-                    if child.type == 'string':
-                        module_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
-                        module_node = module_text.strip('"\'')
-                    elif child.type == 'import_clause':
-                        # Extract imported names
-                        for subchild in child.children:
-                            if subchild.type == 'identifier':
-                                names.append(code_bytes[subchild.start_byte:subchild.end_byte].decode('utf-8'))
-                            elif subchild.type == 'named_imports':
-                                for spec in subchild.children:
-                                    if spec.type == 'import_specifier':
-                                        for id_node in spec.children:
-                                            if id_node.type == 'identifier':
-                                                names.append(code_bytes[id_node.start_byte:id_node.end_byte].decode('utf-8'))
-
-                if module_node:
-                    imports.append(ImportInfo(
-                        module=module_node,
-                        names=names if names else ['*'],
-                        is_from=True,
-                        line=node.start_point[0] + 1,
-                        level=0
-                    ))
+        import_nodes = self._find_ts_nodes(ts_parser, 'js_imports', ('import_statement',), root_node,
+                                           descend_into_matches=True)
+        for node in import_nodes:
+            # Extract import information
+            module_node = None
+            names = []
 
             for child in node.children:
-                visit_node(child)
+                if child.type == 'string':
+                    module_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
+                    module_node = module_text.strip('"\'')
+                elif child.type == 'import_clause':
+                    # Extract imported names
+                    for subchild in child.children:
+                        if subchild.type == 'identifier':
+                            names.append(code_bytes[subchild.start_byte:subchild.end_byte].decode('utf-8'))
+                        elif subchild.type == 'named_imports':
+                            for spec in subchild.children:
+                                if spec.type == 'import_specifier':
+                                    for id_node in spec.children:
+                                        if id_node.type == 'identifier':
+                                            names.append(code_bytes[id_node.start_byte:id_node.end_byte].decode('utf-8'))
+
+            if module_node:
+                imports.append(ImportInfo(
+                    module=module_node,
+                    names=names if names else ['*'],
+                    is_from=True,
+                    line=node.start_point[0] + 1,
+                    level=0
+                ))
 
-        visit_node(root_node)
         return imports
 
-    def _extract_js_classes_and_functions(self, root_node, content: str, classes: List, functions: List):
+    def _extract_js_classes_and_functions(self, root_node, content: str, code_bytes: bytes,
+                                          classes: List, functions: List, ts_parser=None):
         """Extract classes and functions from JavaScript AST"""
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node, current_class=None):
-            if node.type == 'class_declaration':
-                class_info = self._extract_js_class(node, content, code_bytes)
-                if class_info:
-                    classes.append(class_info)
-            elif node.type in ('function_declaration', 'arrow_function', 'function'):
-                # Only extract top-level functions or methods
-                func_info = self._extract_js_function(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            elif node.type == 'method_definition':
-                # This is a class method
-                func_info = self._extract_js_method(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            else:
-                # Recursively visit children
-                for child in node.children:
-                    if node.type == 'class_declaration':
-                        visit_node(child, node)
-                    else:
-                        visit_node(child, current_class)
-
-        visit_node(root_node)
+        # Only outermost definitions are extracted. They are not looked into,
+        # so no enclosing class is ever tracked here: class methods are
+        # collected by _extract_js_class.
+        handlers = self._definition_handlers['javascript']
+        definition_nodes = self._find_ts_nodes(ts_parser, 'js_definitions', handlers, root_node)
+        self._dispatch_definitions(definition_nodes, handlers, content, code_bytes, classes, functions)
+
+    def _dispatch_definitions(self, nodes: List[Any], handlers: Dict[str, Tuple[Callable, bool]],
+                              content: str, code_bytes: bytes, classes: List, functions: List):
+        """Run the extractor registered for each definition node's type"""
+        for node in nodes:
+            extract, is_class = handlers[node.type]
+            info = extract(node, content, code_bytes)
+            if info:
+                if is_class:
+                    classes.append(info)
+                else:
+                    functions.append(info)
 
     def _extract_js_class(self, node, content: str, code_bytes: bytes) -> Optional[ClassInfo]:
         """Extract class information from JavaScript AST node"""
         try:
             # Get class name
-            name_node = None
-            for child in node.children:
-                if child.type == 'identifier':
-                    name_node = child
-                    break
-
+            name_node = node.child_by_field_name('name')
             if not name_node:
                 return None
 
             class_name = code_bytes[name_node.start_byte:name_node.end_byte].decode('utf-8')
 
-            # Extract base class (extends)
+            # Extract base class (extends); class_heritage is not a named
+            # field in the grammar, so it is still found by type
             bases = []
             for child in node.children:
                 if child.type == 'class_heritage':
@@ -638,13 +1369,13 @@ class CodeParser:
 
             # Extract methods
             methods = []
-            for child in node.children:
-                if child.type == 'class_body':
-                    for method_node in child.children:
-                        if method_node.type == 'method_definition':
-                            method_info = self._extract_js_method(method_node, content, code_bytes, class_name)
-                            if method_info:
-                                methods.append(method_info)
+            body_node = node.child_by_field_name('body')
+            if body_node:
+                for method_node in body_node.children:
+                    if method_node.type == 'method_definition':
+                        method_info = self._extract_js_method(method_node, content, code_bytes, class_name)
+                        if method_info:
+                            methods.append(method_info)
 
             # Extract docstring (JSDoc comment before class)
             docstring = self._extract_js_docstring(node, content, code_bytes)
@@ -665,13 +1396,9 @@ class CodeParser:
     def _extract_js_function(self, node, content: str, code_bytes: bytes, class_name: Optional[str] = None) -> Optional[FunctionInfo]:
         """Extract function information from JavaScript AST node"""
         try:
-            # Get function name
-            name_node = None
-            for child in node.children:
-                if child.type == 'identifier':
-                    name_node = child
-                    break
-
+            # Get function name (anonymous functions and arrow functions
+            # have no name field)
+            name_node = node.child_by_field_name('name')
             if not name_node:
                 return None
 
@@ -679,18 +1406,18 @@ class CodeParser:
 
             # Extract parameters
             parameters = []
-            for child in node.children:
-                if child.type == 'formal_parameters':
-                    for param_node in child.children:
-                        if param_node.type in ('identifier', 'required_parameter', 'optional_parameter'):
-                            param_text = code_bytes[param_node.start_byte:param_node.end_byte].decode('utf-8')
-                            parameters.append(param_text)
+            params_node = node.child_by_field_name('parameters')
+            if params_node:
+                for param_node in params_node.children:
+                    if param_node.type in ('identifier', 'required_parameter', 'optional_parameter'):
+                        param_text = code_bytes[param_node.start_byte:param_node.end_byte].decode('utf-8')
+                        parameters.append(param_text)
 
             # Extract docstring
             docstring = self._extract_js_docstring(node, content, code_bytes)
 
             # Check if async
-            is_async = any(child.type == 'async' or child.text == b'async' for child in node.children)
+            is_async = _js_is_async(node)
 
             return FunctionInfo(
                 name=func_name,
@@ -712,32 +1439,27 @@ class CodeParser:
     def _extract_js_method(self, node, content: str, code_bytes: bytes, class_name: Optional[str]) -> Optional[FunctionInfo]:
         """Extract method information from JavaScript class"""
         try:
-            # Get method name
-            name_node = None
-            for child in node.children:
-                if child.type == 'property_identifier':
-                    name_node = child
-                    break
-
-            if not name_node:
+            # Get method name (computed, string and private names are skipped)
+            name_node = node.child_by_field_name('name')
+            if not name_node or name_node.type != 'property_identifier':
                 return None
 
             method_name = code_bytes[name_node.start_byte:name_node.end_byte].decode('utf-8')
 
             # Extract parameters
             parameters = []
-            for child in node.children:
-                if child.type == 'formal_parameters':
-                    for param_node in child.children:
-                        if param_node.type in ('identifier', 'required_parameter', 'optional_parameter'):
-                            param_text = code_bytes[param_node.start_byte:param_node.end_byte].decode('utf-8')
-                            parameters.append(param_text)
+            params_node = node.child_by_field_name('parameters')
+            if params_node:
+                for param_node in params_node.children:
+                    if param_node.type in ('identifier', 'required_parameter', 'optional_parameter'):
+                        param_text = code_bytes[param_node.start_byte:param_node.end_byte].decode('utf-8')
+                        parameters.append(param_text)
 
             # Extract docstring
             docstring = self._extract_js_docstring(node, content, code_bytes)
 
             # Check if async
-            is_async = any(child.type == 'async' or child.text == b'async' for child in node.children)
+            is_async = _js_is_async(node)
 
             return FunctionInfo(
                 name=method_name,
@@ -759,38 +1481,24 @@ class CodeParser:
     def _extract_js_docstring(self, node, content: str, code_bytes: bytes) -> Optional[str]:
         """Extract JSDoc comment before a node"""
         # Look for comment node immediately before this node
-        parent = node.parent
-        if parent:
-            prev_sibling = None
-            for i, child in enumerate(parent.children):
-                if child == node and i > 0:
-                    prev_sibling = parent.children[i - 1]
-                    break
-
-            if prev_sibling and prev_sibling.type == 'comment':
-                comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
-                # Clean up JSDoc comment markers
-                if comment_text.startswith('/**') and comment_text.endswith('*/'):
-                    return comment_text[3:-2].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
-                elif comment_text.startswith('//'):
-                    return comment_text[2:].strip()
+        prev_sibling = node.prev_sibling
+        if prev_sibling and prev_sibling.type == 'comment':
+            comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
+            # Clean up JSDoc comment markers
+            return _strip_comment_markers(comment_text, _JSDOC_MARKERS)
 
         return None
 
     def _parse_typescript(self, file_path: str, content: str, language: str) -> Optional[FileParseResult]:
         """Parse TypeScript file using tree-sitter"""
-        from .tree_sitter_parser import TSParser
-
         # Strip markdown code fences if present
         content = self._strip_markdown_code_fences(content)
 
         try:
-            # Initialize parser for TypeScript
             lang = 'tsx' if language == 'tsx' or file_path.endswith('.tsx') else 'typescript'
-            ts_parser = TSParser(language=lang)
-            tree = ts_parser.parse(content)
+            ts_parser = self._get_ts_parser(lang)
+            code_bytes = content.encode('utf-8')
+            tree = ts_parser.parse(code_bytes)
             if not tree:
                 return self._parse_generic(file_path, content, language)
 
@@ -803,22 +1511,19 @@ class CodeParser:
 
             # Extract module-level comment as docstring
             if self.extract_docstrings:
-                module_docstring = self._extract_js_module_docstring(content, root_node)
+                module_docstring = self._extract_js_module_docstring(root_node, code_bytes)
 
             # Extract imports (same as JS)
             if self.extract_imports:
-                imports = self._extract_js_imports(root_node, content)
+                imports = self._extract_js_imports(root_node, code_bytes, ts_parser)
 
             # Extract classes, functions, and TypeScript-specific constructs
             self._extract_ts_classes_and_functions(
-                root_node, content, classes, functions
+                root_node, content, code_bytes, classes, functions, ts_parser
             )
 
             # Count lines
-            lines = content.split("\n")
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("//", "/*", "*")))
-            comment_lines = sum(1 for line in lines if line.strip().startswith(("//", "/*", "*")))
+            total_lines, code_lines, comment_lines = _line_stats(content, c_style=True)
 
             return FileParseResult(
                 file_path=file_path,
@@ -835,34 +1540,13 @@ class CodeParser:
             self.logger.warning(f"Failed to parse {file_path} with tree-sitter: {e}")
             return self._parse_generic(file_path, content, language)
 
-    def _extract_ts_classes_and_functions(self, root_node, content: str, classes: List, functions: List):
+    def _extract_ts_classes_and_functions(self, root_node, content: str, code_bytes: bytes,
+                                          classes: List, functions: List, ts_parser=None):
         """Extract classes, interfaces, and functions from TypeScript AST"""
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node, current_class=None):
-            # TypeScript classes
-            if node.type in ('class_declaration', 'interface_declaration'):
-                class_info = self._extract_ts_class(node, content, code_bytes)
-                if class_info:
-                    classes.append(class_info)
-            # TypeScript functions
-            elif node.type in ('function_declaration', 'arrow_function', 'function'):
-                func_info = self._extract_js_function(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            elif node.type in ('method_definition', 'method_signature'):
-                func_info = self._extract_js_method(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            else:
-                # Recursively visit children
-                for child in node.children:
-                    if node.type in ('class_declaration', 'interface_declaration'):
-                        visit_node(child, node)
-                    else:
-                        visit_node(child, current_class)
-
-        visit_node(root_node)
+        # Classes and interfaces collect their own members
+        handlers = self._definition_handlers['typescript']
+        definition_nodes = self._find_ts_nodes(ts_parser, 'ts_definitions', handlers, root_node)
+        self._dispatch_definitions(definition_nodes, handlers, content, code_bytes, classes, functions)
 
     def _extract_ts_class(self, node, content: str, code_bytes: bytes) -> Optional[ClassInfo]:
         """Extract class/interface information from TypeScript AST node"""
@@ -915,16 +1599,15 @@ class CodeParser:
 
     def _parse_c_cpp(self, file_path: str, content: str, language: str) -> Optional[FileParseResult]:
         """Parse C/C++ file using tree-sitter"""
-        from .tree_sitter_parser import TSParser
-
         # Strip markdown code fences if present
         content = self._strip_markdown_code_fences(content)
 
         try:
-            # Initialize parser for C or C++
             lang = 'cpp' if language == 'cpp' else 'c'
-            ts_parser = TSParser(language=lang)
-            tree = ts_parser.parse(content)
+            ts_parser = self._get_ts_parser(lang)
+            # Encode once; the tree and every extractor below share the buffer
+            code_bytes = content.encode('utf-8')
+            tree = ts_parser.parse(code_bytes)
             if not tree:
                 return self._parse_generic(file_path, content, language)
 
@@ -937,22 +1620,19 @@ class CodeParser:
 
             # Extract module-level comment as docstring
             if self.extract_docstrings:
-                module_docstring = self._extract_c_module_docstring(content, root_node)
+                module_docstring = self._extract_c_module_docstring(root_node, code_bytes)
 
             # Extract includes
             if self.extract_imports:
-                imports = self._extract_c_includes(root_node, content)
+                imports = self._extract_c_includes(root_node, code_bytes, ts_parser)
 
             # Extract classes/structs and functions
             self._extract_c_classes_and_functions(
-                root_node, content, classes, functions, language
+                root_node, content, code_bytes, classes, functions, language, ts_parser
             )
 
             # Count lines
-            lines = content.split("\n")
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("//", "/*", "*")))
-            comment_lines = sum(1 for line in lines if line.strip().startswith(("//", "/*", "*")))
+            total_lines, code_lines, comment_lines = _line_stats(content, c_style=True)
 
             return FileParseResult(
                 file_path=file_path,
@@ -969,70 +1649,44 @@ class CodeParser:
             self.logger.warning(f"Failed to parse {file_path} with tree-sitter: {e}")
             return self._parse_generic(file_path, content, language)
 
-    def _extract_c_module_docstring(self, content: str, root_node) -> Optional[str]:
+    def _extract_c_module_docstring(self, root_node, code_bytes: bytes) -> Optional[str]:
         """Extract module-level documentation from C/C++ file"""
-        code_bytes = content.encode('utf-8')
         for child in root_node.children:
             if child.type == 'comment':
                 comment_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
                 # Clean up comment markers
-                if comment_text.startswith('//'):
-                    return comment_text[2:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
-                return comment_text
+                docstring = _strip_comment_markers(comment_text, _LEADING_COMMENT_MARKERS)
+                return comment_text if docstring is None else docstring
         return None
 
-    def _extract_c_includes(self, root_node, content: str) -> List[ImportInfo]:
+    def _extract_c_includes(self, root_node, code_bytes: bytes, ts_parser=None) -> List[ImportInfo]:
         """Extract #include statements from C/C++ AST"""
         imports = []
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node):
-            if node.type == 'preproc_include':
-                # Extract include path
-                for child in node.children:
-                    if child.type in ('string_literal', 'system_lib_string'):
-                        include_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
-                        include_text = include_text.strip('<>"')
-                        imports.append(ImportInfo(
-                            module=include_text,
-                            names=['*'],
-                            is_from=False,
-                            line=node.start_point[0] + 1,
-                            level=0
-                        ))
-
+        include_nodes = self._find_ts_nodes(ts_parser, 'c_includes', ('preproc_include',), root_node,
+                                            descend_into_matches=True)
+        for node in include_nodes:
+            # Extract include path
             for child in node.children:
-                visit_node(child)
+                if child.type in ('string_literal', 'system_lib_string'):
+                    include_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
+                    include_text = include_text.strip('<>"')
+                    imports.append(ImportInfo(
+                        module=include_text,
+                        names=['*'],
+                        is_from=False,
+                        line=node.start_point[0] + 1,
+                        level=0
+                    ))
 
-        visit_node(root_node)
         return imports
 
-    def _extract_c_classes_and_functions(self, root_node, content: str, classes: List, functions: List, language: str):
+    def _extract_c_classes_and_functions(self, root_node, content: str, code_bytes: bytes,
+                                         classes: List, functions: List, language: str, ts_parser=None):
         """Extract classes/structs and functions from C/C++ AST"""
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node, current_class=None):
-            # C++ classes or C structs
-            if node.type in ('class_specifier', 'struct_specifier'):
-                class_info = self._extract_c_class(node, content, code_bytes, language)
-                if class_info:
-                    classes.append(class_info)
-            # Functions
-            elif node.type == 'function_definition':
-                func_info = self._extract_c_function(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            else:
-                # Recursively visit children
-                for child in node.children:
-                    if node.type in ('class_specifier', 'struct_specifier'):
-                        visit_node(child, node)
-                    else:
-                        visit_node(child, current_class)
-
-        visit_node(root_node)
+        # C++ classes and C structs collect their own members
+        handlers = self._definition_handlers[language]
+        definition_nodes = self._find_ts_nodes(ts_parser, 'c_definitions', handlers, root_node)
+        self._dispatch_definitions(definition_nodes, handlers, content, code_bytes, classes, functions)
 
     def _extract_c_class(self, node, content: str, code_bytes: bytes, language: str) -> Optional[ClassInfo]:
         """Extract class/struct information from C/C++ AST node"""
@@ -1144,39 +1798,24 @@ class CodeParser:
 
     def _extract_c_docstring(self, node, content: str, code_bytes: bytes) -> Optional[str]:
         """Extract Doxygen/comment before a C/C++ node"""
-        parent = node.parent
-        if parent:
-            prev_sibling = None
-            for i, child in enumerate(parent.children):
-                if child == node and i > 0:
-                    prev_sibling = parent.children[i - 1]
-                    break
-
-            if prev_sibling and prev_sibling.type == 'comment':
-                comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
-                # Clean up Doxygen/regular comment markers
-                if comment_text.startswith('/**') and comment_text.endswith('*/'):
-                    return comment_text[3:-2].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
-                elif comment_text.startswith('///'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('//'):
-                    return comment_text[2:].strip()
+        prev_sibling = node.prev_sibling
+        if prev_sibling and prev_sibling.type == 'comment':
+            comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
+            # Clean up Doxygen/regular comment markers
+            return _strip_comment_markers(comment_text, _DOXYGEN_MARKERS)
 
         return None
 
     def _parse_rust(self, file_path: str, content: str) -> Optional[FileParseResult]:
         """Parse Rust file using tree-sitter"""
-        from .tree_sitter_parser import TSParser
-
         # Strip markdown code fences if present
         content = self._strip_markdown_code_fences(content)
 
         try:
-            # Initialize parser for Rust
-            ts_parser = TSParser(language='rust')
-            tree = ts_parser.parse(content)
+            ts_parser = self._get_ts_parser('rust')
+            # Encode once; the tree and every extractor below share the buffer
+            code_bytes = content.encode('utf-8')
+            tree = ts_parser.parse(code_bytes)
             if not tree:
                 return self._parse_generic(file_path, content, 'rust')
 
@@ -1189,22 +1828,19 @@ class CodeParser:
 
             # Extract module-level documentation
             if self.extract_docstrings:
-                module_docstring = self._extract_rust_module_docstring(content, root_node)
+                module_docstring = self._extract_rust_module_docstring(root_node, code_bytes)
 
             # Extract use statements
             if self.extract_imports:
-                imports = self._extract_rust_imports(root_node, content)
+                imports = self._extract_rust_imports(root_node, code_bytes, ts_parser)
 
             # Extract structs, traits, impls, and functions
             self._extract_rust_items(
-                root_node, content, classes, functions
+                root_node, content, code_bytes, classes, functions, ts_parser
             )
 
             # Count lines
-            lines = content.split("\n")
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("//", "/*", "*")))
-            comment_lines = sum(1 for line in lines if line.strip().startswith(("//", "/*", "*")))
+            total_lines, code_lines, comment_lines = _line_stats(content, c_style=True)
 
             return FileParseResult(
                 file_path=file_path,
@@ -1221,70 +1857,44 @@ class CodeParser:
             self.logger.warning(f"Failed to parse {file_path} with tree-sitter: {e}")
             return self._parse_generic(file_path, content, 'rust')
 
-    def _extract_rust_module_docstring(self, content: str, root_node) -> Optional[str]:
+    def _extract_rust_module_docstring(self, root_node, code_bytes: bytes) -> Optional[str]:
         """Extract module-level documentation from Rust file"""
-        code_bytes = content.encode('utf-8')
         for child in root_node.children:
             if child.type in ('line_comment', 'block_comment'):
                 comment_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
-                # Rust doc comments start with /// or //!
-                if comment_text.startswith('//!'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('///'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
+                # Rust doc comments start with /// or //!; plain comments are skipped
+                docstring = _strip_comment_markers(comment_text, _RUST_MODULE_DOC_MARKERS)
+                if docstring is not None:
+                    return docstring
         return None
 
-    def _extract_rust_imports(self, root_node, content: str) -> List[ImportInfo]:
+    def _extract_rust_imports(self, root_node, code_bytes: bytes, ts_parser=None) -> List[ImportInfo]:
         """Extract 'use' statements from Rust AST"""
         imports = []
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node):
-            if node.type == 'use_declaration':
-                # Extract use path
-                use_text = code_bytes[node.start_byte:node.end_byte].decode('utf-8')
-                # Simple extraction: get the full use statement
-                use_text = use_text.replace('use ', '').replace(';', '').strip()
-                imports.append(ImportInfo(
-                    module=use_text,
-                    names=['*'],
-                    is_from=True,
-                    line=node.start_point[0] + 1,
-                    level=0
-                ))
-
-            for child in node.children:
-                visit_node(child)
+        use_nodes = self._find_ts_nodes(ts_parser, 'rust_uses', ('use_declaration',), root_node,
+                                        descend_into_matches=True)
+        for node in use_nodes:
+            # Extract use path
+            use_text = code_bytes[node.start_byte:node.end_byte].decode('utf-8')
+            # Simple extraction: get the full use statement
+            use_text = use_text.replace('use ', '').replace(';', '').strip()
+            imports.append(ImportInfo(
+                module=use_text,
+                names=['*'],
+                is_from=True,
+                line=node.start_point[0] + 1,
+                level=0
+            ))
 
-        visit_node(root_node)
         return imports
 
-    def _extract_rust_items(self, root_node, content: str, classes: List, functions: List):
+    def _extract_rust_items(self, root_node, content: str, code_bytes: bytes, classes: List, functions: List,
+                           ts_parser=None):
         """Extract structs, traits, impls, and functions from Rust AST"""
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node, current_class=None):
-            # Rust structs, traits, impls
-            if node.type in ('struct_item', 'trait_item', 'impl_item'):
-                class_info = self._extract_rust_type(node, content, code_bytes)
-                if class_info:
-                    classes.append(class_info)
-            # Rust functions
-            elif node.type == 'function_item':
-                func_info = self._extract_rust_function(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            else:
-                # Recursively visit children
-                for child in node.children:
-                    if node.type in ('struct_item', 'trait_item', 'impl_item'):
-                        visit_node(child, node)
-                    else:
-                        visit_node(child, current_class)
-
-        visit_node(root_node)
+        # Structs, traits and impls collect their own methods
+        handlers = self._definition_handlers['rust']
+        item_nodes = self._find_ts_nodes(ts_parser, 'rust_items', handlers, root_node)
+        self._dispatch_definitions(item_nodes, handlers, content, code_bytes, classes, functions)
 
     def _extract_rust_type(self, node, content: str, code_bytes: bytes) -> Optional[ClassInfo]:
         """Extract struct/trait/impl information from Rust AST node"""
@@ -1386,39 +1996,24 @@ class CodeParser:
 
     def _extract_rust_docstring(self, node, content: str, code_bytes: bytes) -> Optional[str]:
         """Extract Rust doc comment before a node"""
-        parent = node.parent
-        if parent:
-            prev_sibling = None
-            for i, child in enumerate(parent.children):
-                if child == node and i > 0:
-                    prev_sibling = parent.children[i - 1]
-                    break
-
-            if prev_sibling and prev_sibling.type in ('line_comment', 'block_comment'):
-                comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
-                # Clean up Rust doc comment markers
-                if comment_text.startswith('///'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('//!'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
-                elif comment_text.startswith('//'):
-                    return comment_text[2:].strip()
+        prev_sibling = node.prev_sibling
+        if prev_sibling and prev_sibling.type in ('line_comment', 'block_comment'):
+            comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
+            # Clean up Rust doc comment markers
+            return _strip_comment_markers(comment_text, _RUST_DOC_MARKERS)
 
         return None
 
     def _parse_csharp(self, file_path: str, content: str) -> Optional[FileParseResult]:
         """Parse C# file using tree-sitter"""
-        from .tree_sitter_parser import TSParser
-
         # Strip markdown code fences if present
         content = self._strip_markdown_code_fences(content)
 
         try:
-            # Initialize parser for C#
-            ts_parser = TSParser(language='csharp')
-            tree = ts_parser.parse(content)
+            ts_parser = self._get_ts_parser('csharp')
+            # Encode once; the tree and every extractor below share the buffer
+            code_bytes = content.encode('utf-8')
+            tree = ts_parser.parse(code_bytes)
             if not tree:
                 return self._parse_generic(file_path, content, 'csharp')
 
@@ -1431,22 +2026,19 @@ class CodeParser:
 
             # Extract module-level documentation
             if self.extract_docstrings:
-                module_docstring = self._extract_csharp_module_docstring(content, root_node)
+                module_docstring = self._extract_csharp_module_docstring(root_node, code_bytes)
 
             # Extract using statements
             if self.extract_imports:
-                imports = self._extract_csharp_imports(root_node, content)
+                imports = self._extract_csharp_imports(root_node, code_bytes, ts_parser)
 
             # Extract classes, interfaces, and methods
             self._extract_csharp_items(
-                root_node, content, classes, functions
+                root_node, content, code_bytes, classes, functions, ts_parser
             )
 
             # Count lines
-            lines = content.split("\n")
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("//", "/*", "*")))
-            comment_lines = sum(1 for line in lines if line.strip().startswith(("//", "/*", "*")))
+            total_lines, code_lines, comment_lines = _line_stats(content, c_style=True)
 
             return FileParseResult(
                 file_path=file_path,
@@ -1463,69 +2055,43 @@ class CodeParser:
             self.logger.warning(f"Failed to parse {file_path} with tree-sitter: {e}")
             return self._parse_generic(file_path, content, 'csharp')
 
-    def _extract_csharp_module_docstring(self, content: str, root_node) -> Optional[str]:
+    def _extract_csharp_module_docstring(self, root_node, code_bytes: bytes) -> Optional[str]:
         """Extract module-level documentation from C# file"""
-        code_bytes = content.encode('utf-8')
         for child in root_node.children:
             if child.type == 'comment':
                 comment_text = code_bytes[child.start_byte:child.end_byte].decode('utf-8')
-                # Clean up comment markers
-                if comment_text.startswith('///'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('//'):
-                    return comment_text[2:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
+                # Clean up comment markers; unclosed block comments are skipped
+                docstring = _strip_comment_markers(comment_text, _CSHARP_DOC_MARKERS)
+                if docstring is not None:
+                    return docstring
         return None
 
-    def _extract_csharp_imports(self, root_node, content: str) -> List[ImportInfo]:
+    def _extract_csharp_imports(self, root_node, code_bytes: bytes, ts_parser=None) -> List[ImportInfo]:
         """Extract 'using' statements from C# AST"""
         imports = []
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node):
-            if node.type == 'using_directive':
-                # Extract using namespace
-                using_text = code_bytes[node.start_byte:node.end_byte].decode('utf-8')
-                using_text = using_text.replace('using ', '').replace(';', '').strip()
-                imports.append(ImportInfo(
-                    module=using_text,
-                    names=['*'],
-                    is_from=False,
-                    line=node.start_point[0] + 1,
-                    level=0
-                ))
+        using_nodes = self._find_ts_nodes(ts_parser, 'csharp_usings', ('using_directive',), root_node,
+                                          descend_into_matches=True)
+        for node in using_nodes:
+            # Extract using namespace
+            using_text = code_bytes[node.start_byte:node.end_byte].decode('utf-8')
+            using_text = using_text.replace('using ', '').replace(';', '').strip()
+            imports.append(ImportInfo(
+                module=using_text,
+                names=['*'],
+                is_from=False,
+                line=node.start_point[0] + 1,
+                level=0
+            ))
 
-            for child in node.children:
-                visit_node(child)
-
-        visit_node(root_node)
         return imports
 
-    def _extract_csharp_items(self, root_node, content: str, classes: List, functions: List):
+    def _extract_csharp_items(self, root_node, content: str, code_bytes: bytes, classes: List, functions: List,
+                             ts_parser=None):
         """Extract classes, interfaces, and methods from C# AST"""
-        code_bytes = content.encode('utf-8')
-
-        def visit_node(node, current_class=None):
-            # C# classes, interfaces, structs
-            if node.type in ('class_declaration', 'interface_declaration', 'struct_declaration'):
-                class_info = self._extract_csharp_class(node, content, code_bytes)
-                if class_info:
-                    classes.append(class_info)
-            # C# methods
-            elif node.type == 'method_declaration':
-                func_info = self._extract_csharp_method(node, content, code_bytes, current_class)
-                if func_info:
-                    functions.append(func_info)
-            else:
-                # Recursively visit children
-                for child in node.children:
-                    if node.type in ('class_declaration', 'interface_declaration', 'struct_declaration'):
-                        visit_node(child, node)
-                    else:
-                        visit_node(child, current_class)
-
-        visit_node(root_node)
+        # Classes, interfaces and structs collect their own members
+        handlers = self._definition_handlers['csharp']
+        item_nodes = self._find_ts_nodes(ts_parser, 'csharp_items', handlers, root_node)
+        self._dispatch_definitions(item_nodes, handlers, content, code_bytes, classes, functions)
 
     def _extract_csharp_class(self, node, content: str, code_bytes: bytes) -> Optional[ClassInfo]:
         """Extract class/interface/struct information from C# AST node"""
@@ -1646,23 +2212,11 @@ class CodeParser:
 
     def _extract_csharp_docstring(self, node, content: str, code_bytes: bytes) -> Optional[str]:
         """Extract XML doc comment before a C# node"""
-        parent = node.parent
-        if parent:
-            prev_sibling = None
-            for i, child in enumerate(parent.children):
-                if child == node and i > 0:
-                    prev_sibling = parent.children[i - 1]
-                    break
-
-            if prev_sibling and prev_sibling.type == 'comment':
-                comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
-                # Clean up XML doc comment markers
-                if comment_text.startswith('///'):
-                    return comment_text[3:].strip()
-                elif comment_text.startswith('//'):
-                    return comment_text[2:].strip()
-                elif comment_text.startswith('/*') and comment_text.endswith('*/'):
-                    return comment_text[2:-2].strip()
+        prev_sibling = node.prev_sibling
+        if prev_sibling and prev_sibling.type == 'comment':
+            comment_text = code_bytes[prev_sibling.start_byte:prev_sibling.end_byte].decode('utf-8')
+            # Clean up XML doc comment markers
+            return _strip_comment_markers(comment_text, _CSHARP_DOC_MARKERS)
 
         return None
 
@@ -4,11 +4,14 @@ Enhanced with LLM-processed query support
 """
 
 import os
+import mmap
 import pickle
 import logging
+import importlib.util
 from typing import List, Dict, Any, Set, Tuple, Optional, Union
 import numpy as np
-from rank_bm25 import BM25Okapi
+import bm25s
+import msgpack
 
 from .vector_store import VectorStore
 from .embedder import CodeEmbedder
@@ -16,10 +19,119 @@ from .graph_builder import CodeGraphBuilder
 from .indexer import CodeElement
 from .query_processor import ProcessedQuery
 from .repo_selector import RepositorySelector
-from .utils import ensure_dir
+from .utils import ensure_dir, msgpack_default
 from .iterative_agent import IterativeAgent
 
 
+# Merged multi-repository BM25 snapshot; the names can never collide with
+# per-repository "{repo}_bm25.msgpack" files
+MERGED_BM25_FILE = "merged.bm25.msgpack"
+MERGED_BM25_DIR = "merged.bm25s"
+
+# Use the numba JIT scorer when numba is installed; fall back to numpy otherwise
+BM25_BACKEND = "numba" if importlib.util.find_spec("numba") is not None else "numpy"
+
+
+def build_bm25_index(corpus: List[List[str]]) -> bm25s.BM25:
+    """
+    Build a BM25 index over pre-tokenized documents
+
+    Scores are computed eagerly at index time into a sparse matrix, so
+    query-time scoring is a sparse lookup instead of a per-document loop.
+
+    Args:
+        corpus: List of token lists, one per document
+
+    Returns:
+        Indexed bm25s.BM25 instance
+    """
+    index = bm25s.BM25(k1=1.5, b=0.75, backend=BM25_BACKEND)
+    index.index(corpus, show_progress=False)
+    return index
+
+
+def _load_mmap(path: str) -> Any:
+    """Decode a msgpack (or legacy pickle) file directly from a read-only memory mapping"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if path.endswith(".pkl"):
+                return pickle.loads(mm)
+            return msgpack.unpackb(mm, raw=False, strict_map_key=False)
+
+
+def _write_msgpack(path: str, data: Dict[str, Any]):
+    """Write a dict as a msgpack file"""
+    with open(path, 'wb') as f:
+        f.write(msgpack.packb(data, use_bin_type=True, default=msgpack_default))
+
+
+def bm25_file_path(persist_dir: str, name: str) -> str:
+    """
+    Get the BM25 file path for a name
+
+    Prefers the msgpack file and falls back to a legacy pickle file
+    written by older versions.
+    """
+    path = os.path.join(persist_dir, f"{name}_bm25.msgpack")
+    if not os.path.exists(path):
+        legacy_path = os.path.join(persist_dir, f"{name}_bm25.pkl")
+        if os.path.exists(legacy_path):
+            return legacy_path
+    return path
+
+
+def write_bm25_file(persist_dir: str, name: str, corpus: List[List[str]],
+                    elements: List[CodeElement]) -> str:
+    """
+    Write BM25 data in the format read by read_bm25_file
+
+    Args:
+        persist_dir: Directory holding the BM25 files
+        name: Name for the saved file ({name}_bm25.msgpack)
+        corpus: Tokenized corpus
+        elements: Code elements the corpus was built from
+
+    Returns:
+        Path of the written file
+    """
+    bm25_path = os.path.join(persist_dir, f"{name}_bm25.msgpack")
+    _write_msgpack(bm25_path, {
+        "bm25_corpus": corpus,
+        "bm25_columns": CodeElement.to_columns(elements),
+    })
+    
+    # Drop the legacy pickle so it cannot shadow stale data
+    legacy_path = os.path.join(persist_dir, f"{name}_bm25.pkl")
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+    
+    return bm25_path
+
+
+def read_bm25_file(bm25_path: str) -> Tuple[List[List[str]], List[CodeElement]]:
+    """
+    Read a BM25 file written by write_bm25_file (msgpack, or legacy pickle)
+
+    The file is memory-mapped and decoded straight from the mapping, so it
+    is not first copied into a bytes buffer.
+
+    Args:
+        bm25_path: Path returned by bm25_file_path
+
+    Returns:
+        Tuple of (tokenized corpus, code elements)
+    """
+    data = _load_mmap(bm25_path)
+    
+    if "bm25_columns" in data:
+        elements = CodeElement.from_columns(data["bm25_columns"])
+    else:
+        # Files written before columnar storage hold one dict per element
+        elements = [CodeElement(**elem_dict) for elem_dict in data["bm25_elements"]]
+    
+    return data["bm25_corpus"], elements
+
+
 class HybridRetriever:
     """Hybrid retrieval combining semantic search, keyword search, and graph traversal"""
     
@@ -64,6 +176,7 @@ class HybridRetriever:
         self.repo_overview_bm25 = None
         self.repo_overview_bm25_corpus = []
         self.repo_overview_names = []  # List of repo names corresponding to corpus
+        self._repo_overview_version = None  # Overview file version the index was built from
         
         # Filtered indexes (for actual retrieval after repo selection)
         self.filtered_bm25 = None
@@ -94,18 +207,17 @@ class HybridRetriever:
         # Track currently loaded repositories for filtering
         self.current_loaded_repos = None  # None means all repos loaded, List means specific repos
     
-    def index_for_bm25(self, elements: List[CodeElement]):
+    def tokenize_corpus(self, elements: List[CodeElement]) -> List[List[str]]:
         """
-        Build full BM25 index for keyword search (excludes repository overviews)
+        Tokenize code elements for BM25 indexing (skips repository overviews)
         
         Args:
-            elements: List of code elements (without repository_overview type)
+            elements: List of code elements
+            
+        Returns:
+            One token list per indexed element
         """
-        self.logger.info("Building full BM25 index for keyword search")
-        
-        self.full_bm25_elements = elements
-        self.full_bm25_corpus = []
-        
+        corpus = []
         for elem in elements:
             # Skip repository_overview elements if any (they should be in separate storage)
             if elem.type == "repository_overview":
@@ -133,18 +245,46 @@ class HybridRetriever:
                 text_parts.append(elem.code[:1000])  # First 1000 chars
             
             text = " ".join(text_parts)
-            # Tokenize (simple whitespace tokenization)
-            tokens = text.lower().split()
-            self.full_bm25_corpus.append(tokens)
+            # Tokenize (simple whitespace tokenization). str.split runs in C
+            # without backtracking, so it must stay in sync with the
+            # query-side split() rather than move to a regex tokenizer.
+            corpus.append(text.lower().split())
+        
+        return corpus
+    
+    def index_for_bm25(self, elements: List[CodeElement],
+                       corpus: Optional[List[List[str]]] = None):
+        """
+        Build full BM25 index for keyword search (excludes repository overviews)
+        
+        Args:
+            elements: List of code elements (without repository_overview type)
+            corpus: Optional token lists from tokenize_corpus(elements), reused
+                instead of tokenizing the elements again
+        """
+        self.logger.info("Building full BM25 index for keyword search")
         
-        self.full_bm25 = BM25Okapi(self.full_bm25_corpus)
+        self.full_bm25_elements = elements
+        self.full_bm25_corpus = corpus if corpus is not None else self.tokenize_corpus(elements)
+        
+        self.full_bm25 = build_bm25_index(self.full_bm25_corpus)
         self.logger.info(f"Built full BM25 index with {len(self.full_bm25_corpus)} documents")
     
-    def build_repo_overview_bm25(self):
+    def build_repo_overview_bm25(self, force: bool = False):
         """
         Build separate BM25 index for repository overviews
         Uses the separate repo overview storage from vector_store
+        
+        Args:
+            force: Rebuild even if the stored overviews have not changed
+                since the current index was built
         """
+        version = self.vector_store.get_repo_overviews_version()
+        if (not force and version is not None and self.repo_overview_bm25 is not None
+                and version == self._repo_overview_version):
+            self.logger.info("Repository overview BM25 index is up to date, skipping rebuild")
+            return
+        
         self.logger.info("Building BM25 index for repository overviews")
         
         # Load repo overviews from separate storage
@@ -178,7 +318,8 @@ class HybridRetriever:
             self.repo_overview_bm25_corpus.append(tokens)
             self.repo_overview_names.append(repo_name)
         
-        self.repo_overview_bm25 = BM25Okapi(self.repo_overview_bm25_corpus)
+        self.repo_overview_bm25 = build_bm25_index(self.repo_overview_bm25_corpus)
+        self._repo_overview_version = version
         self.logger.info(f"Built repo overview BM25 index with {len(self.repo_overview_bm25_corpus)} repositories")
     
     def retrieve(self, query: Union[str, ProcessedQuery], filters: Optional[Dict[str, Any]] = None,
@@ -432,7 +573,8 @@ class HybridRetriever:
                     query_tokens.extend(part.lower().split())
             else:
                 query_tokens = query.lower().split()
-            scores = self.repo_overview_bm25.get_scores(query_tokens)
+            # bm25s raises on an empty query instead of scoring everything 0
+            scores = self.repo_overview_bm25.get_scores(query_tokens) if query_tokens else []
             # Get repository overview results from separate index
             for idx, score in enumerate(scores):
                 if idx < len(self.repo_overview_names) and score > 0:
@@ -795,13 +937,19 @@ class HybridRetriever:
         
         # Tokenize query
         query_tokens = query.lower().split()
+        if not query_tokens:
+            # bm25s raises on an empty query; nothing could match anyway
+            return []
         
         # Get BM25 scores
         scores = bm25_index.get_scores(query_tokens)
         
         # Get top-k results with more candidates for filtering
-        search_limit = top_k * 3 if use_filter else top_k
-        top_indices = np.argsort(scores)[::-1][:min(search_limit, len(scores))]
+        search_limit = min(top_k * 3 if use_filter else top_k, len(scores))
+        if search_limit <= 0:
+            return []
+        top_indices = np.argpartition(-scores, search_limit - 1)[:search_limit]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
         
         results = []
         filtered_count = 0
@@ -1147,15 +1295,14 @@ class HybridRetriever:
             else:
                 self.filtered_vector_store.clear()
             
-            # Load each repository's vector index and merge into FILTERED store
-            loaded_count = 0
+            # Load the repositories' vector indexes and merge into FILTERED store in one batch
+            merged = self.filtered_vector_store.merge_many(repo_names)
             for repo_name in repo_names:
-                self.logger.info(f"Loading vector index for {repo_name}...")
-                if self.filtered_vector_store.merge_from_index(repo_name):
+                if repo_name in merged:
                     self.logger.info(f"Successfully loaded {repo_name} vector index")
-                    loaded_count += 1
                 else:
                     self.logger.warning(f"Failed to load vector index for {repo_name}")
+            loaded_count = len(merged)
             
             if loaded_count == 0:
                 self.logger.error("Failed to load any repository vector indexes")
@@ -1166,16 +1313,12 @@ class HybridRetriever:
             all_bm25_corpus = []
             
             for repo_name in repo_names:
-                bm25_path = os.path.join(self.persist_dir, f"{repo_name}_bm25.pkl")
+                bm25_path = bm25_file_path(self.persist_dir, repo_name)
                 if os.path.exists(bm25_path):
                     try:
-                        with open(bm25_path, 'rb') as f:
-                            data = pickle.load(f)
-                            all_bm25_corpus.extend(data["bm25_corpus"])
-                            
-                            # Reconstruct CodeElement objects
-                            for elem_dict in data["bm25_elements"]:
-                                all_bm25_elements.append(CodeElement(**elem_dict))
+                        corpus, elements = read_bm25_file(bm25_path)
+                        all_bm25_corpus.extend(corpus)
+                        all_bm25_elements.extend(elements)
                         
                         self.logger.info(f"Loaded BM25 index for {repo_name}")
                     except Exception as e:
@@ -1187,7 +1330,7 @@ class HybridRetriever:
             if all_bm25_elements and all_bm25_corpus:
                 self.filtered_bm25_elements = all_bm25_elements
                 self.filtered_bm25_corpus = all_bm25_corpus
-                self.filtered_bm25 = BM25Okapi(all_bm25_corpus)
+                self.filtered_bm25 = build_bm25_index(all_bm25_corpus)
                 self.logger.info(f"Rebuilt filtered BM25 index with {len(all_bm25_elements)} elements")
             else:
                 self.logger.warning("No BM25 data found for the specified repositories")
@@ -1226,6 +1369,24 @@ class HybridRetriever:
             self.logger.error(traceback.format_exc())
             return False
     
+    def warmup_bm25(self):
+        """
+        Run a single throwaway BM25 query so JIT compilation of the numba
+        scorer happens now instead of during the first user query
+        """
+        if BM25_BACKEND != "numba" or self.full_bm25 is None:
+            return
+        
+        warmup_tokens = next((tokens[:1] for tokens in self.full_bm25_corpus if tokens), None)
+        if not warmup_tokens:
+            return
+        
+        try:
+            self.full_bm25.get_scores(warmup_tokens)
+            self.logger.debug("Warmed up numba BM25 scorer")
+        except Exception as e:
+            self.logger.warning(f"BM25 warmup failed: {e}")
+    
     def save_bm25(self, name: str = "index"):
         """
         Save FULL BM25 index and elements to disk
@@ -1233,14 +1394,10 @@ class HybridRetriever:
         Args:
             name: Name for the saved files
         """
-        bm25_path = os.path.join(self.persist_dir, f"{name}_bm25.pkl")
-        
         try:
-            with open(bm25_path, 'wb') as f:
-                pickle.dump({
-                    "bm25_corpus": self.full_bm25_corpus,
-                    "bm25_elements": [elem.to_dict() for elem in self.full_bm25_elements],
-                }, f)
+            bm25_path = write_bm25_file(
+                self.persist_dir, name, self.full_bm25_corpus, self.full_bm25_elements
+            )
             
             self.logger.info(f"Saved full BM25 data to {bm25_path}")
             return True
@@ -1259,25 +1416,18 @@ class HybridRetriever:
         Returns:
             True if successful, False otherwise
         """
-        bm25_path = os.path.join(self.persist_dir, f"{name}_bm25.pkl")
+        bm25_path = bm25_file_path(self.persist_dir, name)
         
         if not os.path.exists(bm25_path):
             self.logger.warning(f"BM25 data not found: {bm25_path}")
             return False
         
         try:
-            with open(bm25_path, 'rb') as f:
-                data = pickle.load(f)
-                self.full_bm25_corpus = data["bm25_corpus"]
-                
-                # Reconstruct CodeElement objects
-                self.full_bm25_elements = []
-                for elem_dict in data["bm25_elements"]:
-                    self.full_bm25_elements.append(CodeElement(**elem_dict))
+            self.full_bm25_corpus, self.full_bm25_elements = read_bm25_file(bm25_path)
             
             # Rebuild FULL BM25 index from corpus
             if self.full_bm25_corpus:
-                self.full_bm25 = BM25Okapi(self.full_bm25_corpus)
+                self.full_bm25 = build_bm25_index(self.full_bm25_corpus)
                 self.logger.info(f"Loaded full BM25 data with {len(self.full_bm25_elements)} elements")
             else:
                 self.logger.warning("BM25 corpus is empty")
@@ -1288,6 +1438,88 @@ class HybridRetriever:
             self.logger.error(f"Failed to load BM25 data: {e}")
             return False
     
+    def _bm25_file_signature(self, repo_names: List[str]) -> Dict[str, Optional[int]]:
+        """Map each repository to the mtime of its BM25 file (None if missing)"""
+        signature = {}
+        for repo_name in repo_names:
+            try:
+                signature[repo_name] = os.stat(
+                    bm25_file_path(self.persist_dir, repo_name)
+                ).st_mtime_ns
+            except OSError:
+                signature[repo_name] = None
+        return signature
+    
+    def save_merged_bm25(self, repo_names: List[str]) -> bool:
+        """
+        Save the current FULL BM25 index as the merged index for a set of repositories
+        
+        Stores the corpus and elements together with the scored bm25s index,
+        so load_merged_bm25 can skip reading every per-repository file and
+        re-scoring the merged corpus.
+        
+        Args:
+            repo_names: Repositories whose BM25 data makes up the current index
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.full_bm25 is None:
+            return False
+        
+        snapshot_path = os.path.join(self.persist_dir, MERGED_BM25_FILE)
+        index_dir = os.path.join(self.persist_dir, MERGED_BM25_DIR)
+        
+        try:
+            self.full_bm25.save(index_dir)
+            _write_msgpack(snapshot_path, {
+                "repos": self._bm25_file_signature(repo_names),
+                "bm25_corpus": self.full_bm25_corpus,
+                "bm25_columns": CodeElement.to_columns(self.full_bm25_elements),
+            })
+            
+            self.logger.info(f"Saved merged BM25 index for {len(repo_names)} repositories")
+            return True
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to save merged BM25 index: {e}")
+            return False
+    
+    def load_merged_bm25(self, repo_names: List[str]) -> bool:
+        """
+        Load the merged FULL BM25 index saved for exactly these repositories
+        
+        The snapshot is only used while none of the repositories' BM25 files
+        changed since it was written.
+        
+        Args:
+            repo_names: Repositories to load
+        
+        Returns:
+            True if a current snapshot was loaded, False otherwise
+        """
+        snapshot_path = os.path.join(self.persist_dir, MERGED_BM25_FILE)
+        index_dir = os.path.join(self.persist_dir, MERGED_BM25_DIR)
+        
+        if not os.path.exists(snapshot_path) or not os.path.isdir(index_dir):
+            return False
+        
+        try:
+            data = _load_mmap(snapshot_path)
+            if data["repos"] != self._bm25_file_signature(repo_names):
+                return False
+            
+            self.full_bm25 = bm25s.BM25.load(index_dir, mmap=True)
+            self.full_bm25_corpus = data["bm25_corpus"]
+            self.full_bm25_elements = CodeElement.from_columns(data["bm25_columns"])
+            
+            self.logger.info(f"Loaded merged BM25 index with {len(self.full_bm25_elements)} elements")
+            return True
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to load merged BM25 index: {e}")
+            return False
+    
     def _initialize_agents(self, repo_root: str) -> bool:
         """
         Initialize agents for agency mode
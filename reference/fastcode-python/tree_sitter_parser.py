@@ -5,7 +5,7 @@ Provides a simple interface for parsing code with tree-sitter
 
 import tree_sitter
 from tree_sitter import Language, Parser
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 import logging
 
 
@@ -115,12 +115,13 @@ class TSParser:
             self.logger.error(f"Failed to switch language to {language_name}: {e}")
             raise
 
-    def parse(self, code: str, language: Optional[str] = None) -> Optional[tree_sitter.Tree]:
+    def parse(self, code: Union[str, bytes], language: Optional[str] = None) -> Optional[tree_sitter.Tree]:
         """
         Parse code string into a tree-sitter syntax tree
 
         Args:
-            code: Source code string to parse
+            code: Source code string to parse, or its UTF-8 bytes when the
+                caller already holds them for slicing node text
             language: Optional language override (will switch parser if different)
 
         Returns:
@@ -134,13 +135,13 @@ class TSParser:
             self.logger.error("Parser not properly initialized")
             return None
 
-        if code is None or not isinstance(code, str):
+        if code is None or not isinstance(code, (str, bytes)):
             self.logger.warning("Invalid code input: code must be a string")
             return None
 
         try:
             # Convert code to bytes for tree-sitter
-            code_bytes = code.encode('utf-8')
+            code_bytes = code.encode('utf-8') if isinstance(code, str) else code
 
             # Parse the code
             tree = self.parser.parse(code_bytes)
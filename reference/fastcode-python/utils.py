@@ -6,7 +6,7 @@ import os
 import hashlib
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import yaml
 import tiktoken
 
@@ -45,14 +45,34 @@ def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
+# path -> (mtime_ns, size, digest) for files hashed by this process
+_file_hash_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
 def compute_file_hash(file_path: str) -> str:
-    """Compute MD5 hash of a file"""
-    hash_md5 = hashlib.md5()
+    """
+    Compute MD5 hash of a file
+
+    Digests are cached per path and reused while the file's mtime and size
+    are unchanged, so re-checking an unmodified tree only costs a stat.
+    """
     try:
+        st = os.stat(file_path)
+        cached = _file_hash_cache.get(file_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                digest = hashlib.file_digest(f, "md5").hexdigest()
+            else:
+                hash_md5 = hashlib.md5()
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hash_md5.update(chunk)
+                digest = hash_md5.hexdigest()
+
+        _file_hash_cache[file_path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
     except Exception:
         return ""
 
@@ -250,6 +270,31 @@ def ensure_dir(directory: str):
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
+def get_dir_size(directory: str) -> int:
+    """
+    Total size in bytes of all files under a directory (symlinks not followed)
+
+    Walks with os.scandir so each entry's type comes from the directory
+    listing and only one stat per file is needed.
+    """
+    total = 0
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
 def get_repo_name_from_url(url: str) -> str:
     """Extract repository name from URL"""
     # Handle GitHub URLs
@@ -286,3 +331,9 @@ def clean_docstring(docstring: str) -> str:
     
     return "\n".join(lines).strip()
 
+
+def msgpack_default(obj: Any) -> Any:
+    """Convert numpy values (and anything else unknown) for msgpack"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
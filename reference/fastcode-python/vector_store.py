@@ -9,8 +9,9 @@ from re import X
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import faiss
+import msgpack
 
-from .utils import ensure_dir
+from .utils import ensure_dir, msgpack_default
 
 
 class VectorStore:
@@ -35,7 +36,17 @@ class VectorStore:
         
         self.persist_dir = self.vector_config.get("persist_directory", "./data/vector_store")
         self.distance_metric = self.vector_config.get("distance_metric", "cosine")
-        self.index_type = self.vector_config.get("index_type", "HNSW")
+        # Exact inner-product search over normalized float32 vectors by default;
+        # HNSW remains available for very large corpora
+        self.index_type = self.vector_config.get("index_type", "Flat")
+        
+        # Scalar quantization of stored vectors ("none" or "int8")
+        self.quantize = self.vector_config.get("quantize", "none")
+        self.quantize_train_size = self.vector_config.get("quantize_train_size", 100000)
+        
+        # Memory-map saved indexes on load so pages are only read when touched
+        self.mmap_load = self.vector_config.get("mmap_load", True)
+        self._mmap_index_path: Optional[str] = None  # Set while self.index is a read-only mapping
         
         # HNSW parameters
         self.m = self.vector_config.get("m", 16)
@@ -46,6 +57,8 @@ class VectorStore:
         self._index_scan_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
         self._index_scan_cache_ttl = self.vector_config.get("index_scan_cache_ttl", 30.0)
         self._index_scan_sample_size = self.vector_config.get("index_scan_sample_size", 100)
+        # (persist_dir mtime_ns, repo names) for get_available_repos
+        self._available_repos_cache: Optional[Tuple[int, List[str]]] = None
         
         if not self.in_memory:
             ensure_dir(self.persist_dir)
@@ -60,30 +73,39 @@ class VectorStore:
             dimension: Dimension of embedding vectors
         """
         self.dimension = dimension
+        self._mmap_index_path = None
         self.logger.info(f"Initializing vector store with dimension {dimension}")
         
+        # Use inner product for cosine with normalized vectors
+        metric = faiss.METRIC_INNER_PRODUCT if self.distance_metric == "cosine" else faiss.METRIC_L2
+        use_int8 = self.quantize == "int8"
+        
         if self.index_type == "HNSW":
             # HNSW index for fast approximate search
-            if self.distance_metric == "cosine":
-                # Use inner product for cosine with normalized vectors
-                index = faiss.IndexHNSWFlat(dimension, self.m, faiss.METRIC_INNER_PRODUCT)
+            if use_int8:
+                index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_8bit, self.m, metric)
             else:
-                # L2 distance
-                index = faiss.IndexHNSWFlat(dimension, self.m, faiss.METRIC_L2)
+                index = faiss.IndexHNSWFlat(dimension, self.m, metric)
             
             index.hnsw.efConstruction = self.ef_construction
             index.hnsw.efSearch = self.ef_search
             self.index = index
             
+        elif use_int8:
+            # Exact search over int8-quantized vectors (4x smaller than float32)
+            self.index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, metric)
+            
         else:
-            # Flat index for exact search (slower but more accurate)
+            # Flat index for exact search: with L2-normalized float32 vectors,
+            # cosine similarity is a single inner-product matrix multiply
             if self.distance_metric == "cosine":
                 self.index = faiss.IndexFlatIP(dimension)  # Inner product
             else:
                 self.index = faiss.IndexFlatL2(dimension)  # L2 distance
         
         self.metadata = []
-        self.logger.info(f"Initialized {self.index_type} index with {self.distance_metric} distance")
+        quantize_note = " (int8 quantized)" if use_int8 else ""
+        self.logger.info(f"Initialized {self.index_type} index{quantize_note} with {self.distance_metric} distance")
     
     def add_vectors(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]):
         """
@@ -96,16 +118,22 @@ class VectorStore:
         if self.index is None:
             raise RuntimeError("Vector store not initialized")
         
+        self._ensure_writable()
+        
         if len(vectors) != len(metadata):
             raise ValueError("Number of vectors must match number of metadata entries")
         
-        # Ensure vectors are float32
-        vectors = vectors.astype(np.float32)
+        # Ensure vectors are contiguous float32 (no copy if they already are)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
         
         # Normalize if using cosine similarity
         if self.distance_metric == "cosine":
             faiss.normalize_L2(vectors)
         
+        # Quantized indexes learn per-dimension ranges from the first batch
+        if not self.index.is_trained:
+            self.index.train(vectors[:self.quantize_train_size])
+        
         # Add to index
         self.index.add(vectors)
         self.metadata.extend(metadata)
@@ -268,6 +296,22 @@ class VectorStore:
             self.logger.error(f"Failed to delete repository overview for {repo_name}: {e}")
             return False
 
+    def get_repo_overviews_version(self) -> Optional[int]:
+        """
+        Get a version stamp for the stored repository overviews
+        
+        Returns:
+            mtime (ns) of the overview file, or None when it is missing or
+            overviews are kept in memory
+        """
+        if self.in_memory:
+            return None
+        
+        try:
+            return os.stat(os.path.join(self.persist_dir, "repo_overviews.pkl")).st_mtime_ns
+        except OSError:
+            return None
+    
     def load_repo_overviews(self) -> Dict[str, Dict[str, Any]]:
         """
         Load all repository overviews from storage
@@ -442,6 +486,72 @@ class VectorStore:
                 indices.append(i)
         return indices
     
+    def _metadata_path(self, name: str) -> str:
+        """
+        Get the metadata file path for an index
+
+        Prefers the msgpack file and falls back to a legacy pickle file
+        written by older versions.
+        """
+        path = os.path.join(self.persist_dir, f"{name}_metadata.msgpack")
+        if not os.path.exists(path):
+            legacy_path = os.path.join(self.persist_dir, f"{name}_metadata.pkl")
+            if os.path.exists(legacy_path):
+                return legacy_path
+        return path
+
+    def _read_metadata_file(self, metadata_path: str) -> Dict[str, Any]:
+        """Read an index metadata file (msgpack, or legacy pickle)"""
+        with open(metadata_path, 'rb') as f:
+            if metadata_path.endswith(".pkl"):
+                return pickle.load(f)
+            return msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+
+    def _read_index(self, index_path: str, mmap: bool = False):
+        """
+        Read a FAISS index from disk
+        
+        Args:
+            index_path: Path to the .faiss file
+            mmap: Memory-map the index read-only instead of reading it into RAM
+        
+        Returns:
+            Tuple of (index, whether it is memory-mapped)
+        """
+        if mmap:
+            # IO_FLAG_MMAP_IFC maps the codes of flat-code indexes (Flat, SQ,
+            # HNSW storage) and IVF lists; the older IO_FLAG_MMAP only maps
+            # IVF inverted lists and reads everything else into RAM
+            mmap_ifc = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+            if mmap_ifc is not None:
+                flags = mmap_ifc
+                mapped_types = (faiss.IndexFlatCodes, faiss.IndexHNSW, faiss.IndexIVF)
+            else:
+                flags = faiss.IO_FLAG_MMAP
+                mapped_types = (faiss.IndexIVF,)
+            try:
+                index = faiss.read_index(index_path, flags | faiss.IO_FLAG_READ_ONLY)
+                # Only a mapped index needs _ensure_writable before mutation
+                return index, isinstance(index, mapped_types)
+            except Exception as e:
+                # Not every index type / FAISS build supports mmap
+                self.logger.debug(f"mmap load of {index_path} failed, reading into memory: {e}")
+        return faiss.read_index(index_path), False
+
+    def _ensure_writable(self):
+        """Replace a read-only memory-mapped index with an in-memory copy before mutating it"""
+        if self._mmap_index_path is not None:
+            self.logger.info("Loading memory-mapped index into memory for writing")
+            self.index = faiss.read_index(self._mmap_index_path)
+            if self.index_type == "HNSW" and hasattr(self.index, 'hnsw'):
+                self.index.hnsw.efSearch = self.ef_search
+            self._mmap_index_path = None
+
+    def has_index(self, name: str) -> bool:
+        """Check whether both the index and metadata files exist for a name"""
+        index_path = os.path.join(self.persist_dir, f"{name}.faiss")
+        return os.path.exists(index_path) and os.path.exists(self._metadata_path(name))
+
     def save(self, name: str = "index"):
         """
         Save index and metadata to disk
@@ -458,19 +568,27 @@ class VectorStore:
             return
         
         index_path = os.path.join(self.persist_dir, f"{name}.faiss")
-        metadata_path = os.path.join(self.persist_dir, f"{name}_metadata.pkl")
+        metadata_path = os.path.join(self.persist_dir, f"{name}_metadata.msgpack")
+        
+        # Never truncate the file backing a memory-mapped index while it is in use
+        self._ensure_writable()
         
         # Save FAISS index
         faiss.write_index(self.index, index_path)
         
         # Save metadata
         with open(metadata_path, 'wb') as f:
-            pickle.dump({
+            f.write(msgpack.packb({
                 "metadata": self.metadata,
                 "dimension": self.dimension,
                 "distance_metric": self.distance_metric,
                 "index_type": self.index_type,
-            }, f)
+            }, use_bin_type=True, default=msgpack_default))
+        
+        # Drop the legacy pickle so it cannot shadow stale data
+        legacy_path = os.path.join(self.persist_dir, f"{name}_metadata.pkl")
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
         
         # Invalidate cache since we just modified the indexes
         self.invalidate_scan_cache()
@@ -492,7 +610,7 @@ class VectorStore:
             return False
         
         index_path = os.path.join(self.persist_dir, f"{name}.faiss")
-        metadata_path = os.path.join(self.persist_dir, f"{name}_metadata.pkl")
+        metadata_path = self._metadata_path(name)
         
         if not os.path.exists(index_path) or not os.path.exists(metadata_path):
             self.logger.warning(f"Index files not found in {self.persist_dir}")
@@ -500,15 +618,15 @@ class VectorStore:
         
         try:
             # Load FAISS index
-            self.index = faiss.read_index(index_path)
+            self.index, mmapped = self._read_index(index_path, mmap=self.mmap_load)
+            self._mmap_index_path = index_path if mmapped else None
             
             # Load metadata
-            with open(metadata_path, 'rb') as f:
-                data = pickle.load(f)
-                self.metadata = data["metadata"]
-                self.dimension = data["dimension"]
-                self.distance_metric = data.get("distance_metric", "cosine")
-                self.index_type = data.get("index_type", "HNSW")
+            data = self._read_metadata_file(metadata_path)
+            self.metadata = data["metadata"]
+            self.dimension = data["dimension"]
+            self.distance_metric = data.get("distance_metric", "cosine")
+            self.index_type = data.get("index_type", "HNSW")
             
             # Set search parameters for HNSW
             if self.index_type == "HNSW" and hasattr(self.index, 'hnsw'):
@@ -543,69 +661,92 @@ class VectorStore:
         Returns:
             True if successful, False otherwise
         """
-        if self.in_memory:
-            self.logger.info("Skipping merge_from_index (in-memory mode enabled)")
-            return False
+        return index_name in self.merge_many([index_name])
+    
+    def merge_many(self, index_names: List[str]) -> List[str]:
+        """
+        Merge several saved indexes into this store in one batch
         
-        index_path = os.path.join(self.persist_dir, f"{index_name}.faiss")
-        metadata_path = os.path.join(self.persist_dir, f"{index_name}_metadata.pkl")
+        Flat indexes of the same type are concatenated natively with FAISS
+        merge_from; other index types are reconstructed with one
+        reconstruct_n call each and added in a single add_vectors call.
         
-        if not os.path.exists(index_path) or not os.path.exists(metadata_path):
-            self.logger.warning(f"Index files not found for {index_name}")
-            return False
+        Args:
+            index_names: Names of the indexes to merge from
         
-        try:
-            # Load the other index
-            other_index = faiss.read_index(index_path)
-            
-            # Load metadata
-            with open(metadata_path, 'rb') as f:
-                data = pickle.load(f)
-                other_metadata = data["metadata"]
-                other_dimension = data["dimension"]
-
-
-
-            
-            # Verify dimensions match
-            if self.dimension and self.dimension != other_dimension:
-                self.logger.error(f"Dimension mismatch: {self.dimension} vs {other_dimension}")
-                return False
-            
-            # Initialize if needed
-            if self.index is None:
-                self.initialize(other_dimension)
-            
-            # Reconstruct vectors from the FAISS index
-            # For flat indices, we can access vectors directly
-            # For HNSW, we need to reconstruct
-            n_vectors = other_index.ntotal
+        Returns:
+            Names of the indexes that were merged
+        """
+        if self.in_memory:
+            self.logger.info("Skipping merge_many (in-memory mode enabled)")
+            return []
+        
+        merged = []
+        # Reconstructed vectors waiting for the single add_vectors call
+        pending_names = []
+        pending_vectors = []
+        pending_metadata = []
+        
+        for index_name in index_names:
+            index_path = os.path.join(self.persist_dir, f"{index_name}.faiss")
+            metadata_path = self._metadata_path(index_name)
             
-            if n_vectors == 0:
-                self.logger.warning(f"No vectors in {index_name}")
-                return False
+            if not os.path.exists(index_path) or not os.path.exists(metadata_path):
+                self.logger.warning(f"Index files not found for {index_name}")
+                continue
             
-            # Try to reconstruct all vectors efficiently
             try:
-                # Reconstruct vectors - do it in batches for better performance
-                vectors = np.zeros((n_vectors, other_dimension), dtype=np.float32)
+                # Load the other index into memory: merge_from empties its
+                # source, which aborts FAISS on a read-only mapped index, and
+                # every vector is copied into this store anyway
+                other_index, _ = self._read_index(index_path, mmap=False)
+                
+                # Load metadata
+                data = self._read_metadata_file(metadata_path)
+                other_metadata = data["metadata"]
+                other_dimension = data["dimension"]
+                
+                # Verify dimensions match
+                if self.dimension and self.dimension != other_dimension:
+                    self.logger.error(f"Dimension mismatch: {self.dimension} vs {other_dimension}")
+                    continue
                 
-                # Reconstruct all vectors at once
-                for i in range(n_vectors):
-                    other_index.reconstruct(int(i), vectors[i])
+                # Initialize if needed
+                if self.index is None:
+                    self.initialize(other_dimension)
                 
-                # Add to our index in one batch operation
-                self.add_vectors(vectors, other_metadata)
+                n_vectors = other_index.ntotal
+                if n_vectors == 0:
+                    self.logger.warning(f"No vectors in {index_name}")
+                    continue
+                
+                # Same flat index type: concatenate the stored codes in C++
+                if (not pending_vectors and isinstance(self.index, faiss.IndexFlat)
+                        and type(other_index) is type(self.index)):
+                    self._ensure_writable()
+                    self.index.merge_from(other_index)
+                    self.metadata.extend(other_metadata)
+                else:
+                    pending_vectors.append(other_index.reconstruct_n(0, n_vectors))
+                    pending_metadata.extend(other_metadata)
+                    pending_names.append(index_name)
+                
+                merged.append(index_name)
                 self.logger.info(f"Merged {n_vectors} vectors from {index_name}")
-                return True
                 
             except Exception as e:
-                self.logger.error(f"Failed to reconstruct vectors from {index_name}: {e}")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Failed to merge from {index_name}: {e}")
-            return False
+                self.logger.error(f"Failed to merge from {index_name}: {e}")
+                continue
+        
+        # Add all reconstructed vectors in one batch operation
+        if pending_vectors:
+            try:
+                self.add_vectors(np.concatenate(pending_vectors), pending_metadata)
+            except Exception as e:
+                self.logger.error(f"Failed to add reconstructed vectors: {e}")
+                return [name for name in merged if name not in pending_names]
+        
+        return merged
     
     def delete_by_filter(self, filter_func) -> int:
         """
@@ -678,7 +819,7 @@ class VectorStore:
         for file in os.listdir(self.persist_dir):
             if file.endswith('.faiss'):
                 repo_name = file.replace('.faiss', '')
-                metadata_file = os.path.join(self.persist_dir, f"{repo_name}_metadata.pkl")
+                metadata_file = self._metadata_path(repo_name)
                 
                 if os.path.exists(metadata_file):
                     try:
@@ -694,33 +835,32 @@ class VectorStore:
                         file_count = 0
                         repo_url = "N/A"
                         
-                        with open(metadata_file, 'rb') as f:
-                            try:
-                                data = pickle.load(f)
-                                metadata_list = data.get("metadata", [])
-                                element_count = len(metadata_list)
-                                
-                                # Sample first few entries to get URL and estimate file count
-                                # (much faster than iterating through all)
-                                sample_size = min(self._index_scan_sample_size, len(metadata_list))
-                                seen_files = set()
-                                
-                                for i in range(sample_size):
-                                    meta = metadata_list[i]
-                                    file_path = meta.get("file_path")
-                                    if file_path:
-                                        seen_files.add(file_path)
-                                    if not repo_url or repo_url == "N/A":
-                                        repo_url = meta.get("repo_url", "N/A")
+                        try:
+                            data = self._read_metadata_file(metadata_file)
+                            metadata_list = data.get("metadata", [])
+                            element_count = len(metadata_list)
+                            
+                            # Sample first few entries to get URL and estimate file count
+                            # (much faster than iterating through all)
+                            sample_size = min(self._index_scan_sample_size, len(metadata_list))
+                            seen_files = set()
+                            
+                            for i in range(sample_size):
+                                meta = metadata_list[i]
+                                file_path = meta.get("file_path")
+                                if file_path:
+                                    seen_files.add(file_path)
+                                if not repo_url or repo_url == "N/A":
+                                    repo_url = meta.get("repo_url", "N/A")
+                            
+                            # Estimate total file count based on sample
+                            if sample_size > 0 and sample_size < len(metadata_list):
+                                file_count = int(len(seen_files) * (len(metadata_list) / sample_size))
+                            else:
+                                file_count = len(seen_files)
                                 
-                                # Estimate total file count based on sample
-                                if sample_size > 0 and sample_size < len(metadata_list):
-                                    file_count = int(len(seen_files) * (len(metadata_list) / sample_size))
-                                else:
-                                    file_count = len(seen_files)
-                                    
-                            except Exception as load_error:
-                                self.logger.warning(f"Failed to parse metadata for {repo_name}: {load_error}")
+                        except Exception as load_error:
+                            self.logger.warning(f"Failed to parse metadata for {repo_name}: {load_error}")
                         
                         available_repos.append({
                             'name': repo_name,
@@ -748,8 +888,45 @@ class VectorStore:
         
         return results
     
+    def get_available_repos(self) -> List[str]:
+        """
+        Get names of repositories that have a saved index and metadata file
+        
+        Uses a single directory listing; the result is cached until the
+        persist directory's mtime changes (files added, removed or renamed).
+        
+        Returns:
+            Sorted list of repository names
+        """
+        if self.in_memory:
+            return []
+        
+        try:
+            dir_mtime = os.stat(self.persist_dir).st_mtime_ns
+        except OSError:
+            return []
+        
+        if self._available_repos_cache is not None and self._available_repos_cache[0] == dir_mtime:
+            return list(self._available_repos_cache[1])
+        
+        with os.scandir(self.persist_dir) as entries:
+            file_names = {entry.name for entry in entries}
+        
+        repos = []
+        for file_name in file_names:
+            if file_name.endswith('.faiss'):
+                repo_name = file_name[:-len('.faiss')]
+                if (f"{repo_name}_metadata.msgpack" in file_names
+                        or f"{repo_name}_metadata.pkl" in file_names):
+                    repos.append(repo_name)
+        repos.sort()
+        
+        self._available_repos_cache = (dir_mtime, repos)
+        return list(repos)
+    
     def invalidate_scan_cache(self):
         """Invalidate the scan cache (call this when indexes change)"""
         self._index_scan_cache = None
+        self._available_repos_cache = None
         self.logger.debug("Invalidated index scan cache")
 
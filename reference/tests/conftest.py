@@ -0,0 +1,24 @@
+"""
+Shared test setup for the fastcode-python reference package
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "fastcode-python"
+
+
+def load_fastcode_module(name: str):
+    """
+    Import a fastcode submodule without running the package __init__
+
+    The directory name is not importable and the package __init__ pulls in
+    the whole pipeline, so a bare package is registered around the sources.
+    """
+    if "fastcode" not in sys.modules:
+        package = types.ModuleType("fastcode")
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["fastcode"] = package
+    return importlib.import_module(f"fastcode.{name}")
@@ -0,0 +1,48 @@
+"""
+Tests for the CodeEmbedder embedding reuse cache
+"""
+
+import numpy as np
+import pytest
+
+from conftest import load_fastcode_module
+
+
+def _embedder(**embedding_config):
+    CodeEmbedder = load_fastcode_module("embedder").CodeEmbedder
+    return CodeEmbedder({"embedding": {"model": "test-model", **embedding_config}})
+
+
+def _save_cache(path, **embedding_config):
+    embedder = _embedder(**embedding_config)
+    embedder._reuse_cache = {bytes(16): np.ones(4, dtype=np.float32)}
+    embedder.save_reuse_cache(str(path))
+
+
+def test_reuse_cache_round_trip(tmp_path):
+    path = tmp_path / "reuse.npz"
+    _save_cache(path)
+
+    assert _embedder().load_reuse_cache(str(path)) == 1
+
+
+@pytest.mark.parametrize("changed", [
+    {"model": "other-model"},
+    {"normalize_embeddings": False},
+    {"max_seq_length": 256},
+])
+def test_reuse_cache_dropped_when_settings_differ(tmp_path, changed):
+    path = tmp_path / "reuse.npz"
+    _save_cache(path)
+
+    embedder = _embedder(**changed)
+    assert embedder.load_reuse_cache(str(path)) == 0
+    assert embedder._reuse_cache == {}
+
+
+def test_reuse_cache_without_settings_is_dropped(tmp_path):
+    path = tmp_path / "reuse.npz"
+    np.savez(path, keys=np.array([bytes(16)], dtype="S16"),
+             vectors=np.ones((1, 4), dtype=np.float32), model=np.array("test-model"))
+
+    assert _embedder().load_reuse_cache(str(path)) == 0
@@ -0,0 +1,50 @@
+"""
+Tests for RepositoryLoader repository metadata
+"""
+
+import subprocess
+
+import pytest
+
+from conftest import load_fastcode_module
+
+pytest.importorskip("tiktoken")
+pytest.importorskip("yaml")
+pytest.importorskip("pathspec")
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def parent_checkout(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@example.com",
+         "commit", "-q", "--allow-empty", "-m", "init")
+    return tmp_path
+
+
+def _repository_info(path):
+    loader = load_fastcode_module("loader").RepositoryLoader({})
+    loader.load_from_path(str(path))
+    return loader.get_repository_info()
+
+
+def test_git_info_for_repository_root(parent_checkout):
+    info = _repository_info(parent_checkout)
+
+    assert info["branch"] == "main"
+    assert len(info["commit"]) == 8
+
+
+def test_plain_directory_inside_checkout_has_no_git_info(parent_checkout):
+    plain = parent_checkout / "repos" / "x"
+    plain.mkdir(parents=True)
+    (plain / "main.py").write_text("print('hi')\n")
+
+    info = _repository_info(plain)
+
+    assert "branch" not in info
+    assert "commit" not in info
+    assert "remote_url" not in info
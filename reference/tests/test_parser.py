@@ -0,0 +1,79 @@
+"""
+Tests for CodeParser's JavaScript/TypeScript async detection
+"""
+
+import pytest
+
+from conftest import load_fastcode_module
+
+pytest.importorskip("tiktoken")
+pytest.importorskip("yaml")
+pytest.importorskip("tree_sitter_javascript")
+pytest.importorskip("tree_sitter_typescript")
+
+
+@pytest.fixture(scope="module")
+def code_parser():
+    return load_fastcode_module("parser").CodeParser({"parser": {"parse_cache_size": 0}})
+
+
+def _async_flags(result):
+    flags = {method.name: method.is_async for cls in result.classes for method in cls.methods}
+    flags.update((func.name, func.is_async) for func in result.functions)
+    return flags
+
+
+TS_SOURCE = """
+class Connection extends Base {
+  protected async onMessage(message: string) {}
+  private static async create() {}
+  override async dispose() {}
+  public async evaluate() {}
+  @bound async decorated() {}
+  static async *stream() {}
+  public async() {}
+  send(message: string) {}
+}
+
+export async function connect(url: string) {}
+function async(value: number) {}
+"""
+
+
+def test_typescript_async_after_modifiers(code_parser):
+    flags = _async_flags(code_parser.parse_file("connection.ts", TS_SOURCE))
+
+    assert flags["onMessage"] is True
+    assert flags["create"] is True
+    assert flags["dispose"] is True
+    assert flags["evaluate"] is True
+    assert flags["decorated"] is True
+    assert flags["stream"] is True
+    assert flags["connect"] is True
+
+
+def test_typescript_async_names_are_not_async(code_parser):
+    result = code_parser.parse_file("connection.ts", TS_SOURCE)
+    methods = {method.name: method.is_async for cls in result.classes for method in cls.methods}
+    functions = {func.name: func.is_async for func in result.functions}
+
+    assert methods["async"] is False
+    assert methods["send"] is False
+    assert functions["async"] is False
+
+
+def test_javascript_async(code_parser):
+    source = """
+class Client {
+  static async create() {}
+  async() {}
+  send() {}
+}
+export async function connect(url) {}
+"""
+    flags = _async_flags(code_parser.parse_file("client.js", source))
+
+    assert flags["create"] is True
+    assert flags["async"] is False
+    assert flags["send"] is False
+    assert flags["connect"] is True
@@ -0,0 +1,57 @@
+"""
+Tests for VectorStore persistence and merging
+"""
+
+import numpy as np
+import pytest
+
+from conftest import load_fastcode_module
+
+pytest.importorskip("tiktoken")
+pytest.importorskip("yaml")
+pytest.importorskip("faiss")
+pytest.importorskip("msgpack")
+
+DIMENSION = 16
+
+
+def _make_store(persist_dir):
+    # Default vector store settings: Flat index, memory-mapped loading
+    VectorStore = load_fastcode_module("vector_store").VectorStore
+    return VectorStore({"vector_store": {"persist_directory": str(persist_dir)}})
+
+
+def _save_index(persist_dir, name, count, seed):
+    store = _make_store(persist_dir)
+    store.initialize(DIMENSION)
+    vectors = np.random.default_rng(seed).random((count, DIMENSION), dtype=np.float32)
+    store.add_vectors(vectors, [{"repo_name": name, "i": i} for i in range(count)])
+    store.save(name)
+
+
+def test_merge_many_flat_indexes_with_default_config(tmp_path):
+    _save_index(tmp_path, "ra", 5, seed=0)
+    _save_index(tmp_path, "rb", 7, seed=1)
+
+    store = _make_store(tmp_path)
+    assert store.merge_many(["ra", "rb"]) == ["ra", "rb"]
+    assert store.index.ntotal == 12
+    assert [m["repo_name"] for m in store.metadata] == ["ra"] * 5 + ["rb"] * 7
+
+    # The merged store is still writable and the sources are untouched
+    store.add_vectors(np.ones((1, DIMENSION), dtype=np.float32), [{"repo_name": "extra"}])
+    assert store.index.ntotal == 13
+    reloaded = _make_store(tmp_path)
+    assert reloaded.load("rb")
+    assert reloaded.index.ntotal == 7
+
+
+def test_merge_from_index_into_loaded_store(tmp_path):
+    _save_index(tmp_path, "ra", 5, seed=0)
+    _save_index(tmp_path, "rb", 7, seed=1)
+
+    store = _make_store(tmp_path)
+    assert store.load("ra")
+    assert store.merge_from_index("rb")
+    assert store.index.ntotal == 12
+    assert len(store.metadata) == 12